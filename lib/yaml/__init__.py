@@ -8,6 +8,9 @@ from .nodes import *
 
 from .loader import *
 from .dumper import *
+from .parallel import *
+from .index import *
+from .selector import *
 
 __version__ = '5.4.1'
 try:
@@ -77,6 +80,17 @@ def parse(stream, Loader=Loader):
     finally:
         loader.dispose()
 
+def handle_events(stream, handler, Loader=Loader):
+    """
+    Parse a YAML stream and pass the parsing events to the methods
+    of a handler (see EventHandler).
+    """
+    loader = Loader(stream)
+    try:
+        loader.handle_events(handler)
+    finally:
+        loader.dispose()
+
 def compose(stream, Loader=Loader):
     """
     Parse the first YAML document in a stream
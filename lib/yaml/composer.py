@@ -51,8 +51,15 @@ class Composer(object):
         # Drop the DOCUMENT-START event.
         self.get_event()
 
-        # Compose the root node.
-        node = self.compose_node(None, None)
+        # Compose the root node.  Unless the methods composing collections
+        # are overridden, an explicit stack is used instead of recursion.
+        cls = self.__class__
+        if cls.compose_node == Composer.compose_node  \
+                and cls.compose_sequence_node == Composer.compose_sequence_node    \
+                and cls.compose_mapping_node == Composer.compose_mapping_node:
+            node = self.compose_nodes(None, None)
+        else:
+            node = self.compose_node(None, None)
 
         # Drop the DOCUMENT-END event.
         self.get_event()
@@ -85,6 +92,94 @@ class Composer(object):
         self.ascend_resolver()
         return node
 
+    def skip_node(self):
+        # Drop the events of the next node without composing it.  Anchored
+        # nodes inside are still composed, so later aliases to them resolve.
+        depth = 0
+        while True:
+            event = self.peek_event()
+            if not isinstance(event, (AliasEvent, CollectionEndEvent))  \
+                    and event.anchor is not None:
+                self.compose_node(None, None)
+            else:
+                event = self.get_event()
+                if isinstance(event, CollectionStartEvent):
+                    depth += 1
+                elif isinstance(event, CollectionEndEvent):
+                    depth -= 1
+            if not depth:
+                return
+
+    def compose_nodes(self, parent, index):
+        # Same as `compose_node`, but the collections being composed are kept
+        # on a stack, so the depth of the document is not limited by the
+        # recursion limit.  A stack entry is a collection node and, for
+        # a mapping, the key node waiting for its value.
+        stack = []
+        while True:
+            if self.check_event(AliasEvent):
+                event = self.get_event()
+                anchor = event.anchor
+                if anchor not in self.anchors:
+                    raise ComposerError(None, None, "found undefined alias %r"
+                            % anchor.encode('utf-8'), event.start_mark)
+                node = self.anchors[anchor]
+            else:
+                event = self.peek_event()
+                anchor = event.anchor
+                if anchor is not None:
+                    if anchor in self.anchors:
+                        raise ComposerError("found duplicate anchor %r; first occurrence"
+                                % anchor.encode('utf-8'), self.anchors[anchor].start_mark,
+                                "second occurrence", event.start_mark)
+                self.descend_resolver(parent, index)
+                if self.check_event(ScalarEvent):
+                    node = self.compose_scalar_node(anchor)
+                    self.ascend_resolver()
+                else:
+                    start_event = self.get_event()
+                    if isinstance(start_event, SequenceStartEvent):
+                        kind = SequenceNode
+                    else:
+                        kind = MappingNode
+                    tag = start_event.tag
+                    if tag is None or tag == u'!':
+                        tag = self.resolve(kind, None, start_event.implicit)
+                    node = kind(tag, [],
+                            start_event.start_mark, None,
+                            flow_style=start_event.flow_style)
+                    if anchor is not None:
+                        self.anchors[anchor] = node
+                    stack.append([node, None])
+                    node = None
+            while True:
+                if not stack:
+                    return node
+                entry = stack[-1]
+                parent = entry[0]
+                if node is not None:
+                    if isinstance(parent, SequenceNode):
+                        parent.value.append(node)
+                    elif entry[1] is None:
+                        entry[1] = node
+                    else:
+                        parent.value.append((entry[1], node))
+                        entry[1] = None
+                    node = None
+                if entry[1] is not None:
+                    index = entry[1]
+                    break
+                if not self.check_event(CollectionEndEvent):
+                    if isinstance(parent, SequenceNode):
+                        index = len(parent.value)
+                    else:
+                        index = None
+                    break
+                end_event = self.get_event()
+                parent.end_mark = end_event.end_mark
+                self.ascend_resolver()
+                node = stack.pop()[0]
+
     def compose_scalar_node(self, anchor):
         event = self.get_event()
         tag = event.tag
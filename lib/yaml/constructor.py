@@ -2,12 +2,16 @@
 __all__ = [
     'BaseConstructor',
     'SafeConstructor',
+    'LazyConstructor',
+    'LazyMapping',
+    'LazySequence',
     'FullConstructor',
     'UnsafeConstructor',
     'Constructor',
     'ConstructorError'
 ]
 
+import collections
 import datetime
 import base64
 import binascii
@@ -17,7 +21,9 @@ import sys
 
 from . import common
 from .error import *
+from .events import *
 from .nodes import *
+from .composer import Composer, ComposerError
 
 if common.PY3:
    import collections.abc
@@ -65,6 +71,9 @@ class BaseConstructor(object):
         self.recursive_objects = {}
         self.state_generators = []
         self.deep_construct = False
+        self.deep_generators = []
+        self.deep_pending = {}
+        self.base_construct = False
 
     def check_data(self):
         # If there are more documents available?
@@ -91,24 +100,39 @@ class BaseConstructor(object):
         return None
 
     def construct_document(self, node):
+        self.base_construct = True
         data = self.construct_object(node)
+        self.base_construct = False
+        self.run_state_generators()
+        self.constructed_objects = {}
+        self.recursive_objects = {}
+        self.deep_construct = False
+        self.deep_generators = []
+        self.deep_pending = {}
+        return data
+
+    def run_state_generators(self):
         while self.state_generators:
             state_generators = self.state_generators
             self.state_generators = []
             for generator in state_generators:
                 for dummy in generator:
                     pass
-        self.constructed_objects = {}
-        self.recursive_objects = {}
-        self.deep_construct = False
-        return data
 
     def construct_object(self, node, deep=False):
         if node in self.constructed_objects:
             return self.constructed_objects[node]
+        if node in self.deep_pending:
+            # The node is queued by a deep construction, but it is needed
+            # now, so its generator is run ahead of the queue.
+            mark = len(self.deep_generators)
+            self.deep_generators.append(self.deep_pending[node])
+            self.run_deep_generators(mark)
+            return self.constructed_objects[node]
         if deep:
             old_deep = self.deep_construct
             self.deep_construct = True
+            mark = len(self.deep_generators)
         if node in self.recursive_objects:
             raise ConstructorError(None, None,
                     "found unconstructable recursive node", node.start_mark)
@@ -118,12 +142,8 @@ class BaseConstructor(object):
         if node.tag in self.yaml_constructors:
             constructor = self.yaml_constructors[node.tag]
         else:
-            for tag_prefix in self.yaml_multi_constructors:
-                if tag_prefix is not None and node.tag.startswith(tag_prefix):
-                    tag_suffix = node.tag[len(tag_prefix):]
-                    constructor = self.yaml_multi_constructors[tag_prefix]
-                    break
-            else:
+            constructor, tag_suffix = self.get_multi_constructor(node.tag)
+            if constructor is None:
                 if None in self.yaml_multi_constructors:
                     tag_suffix = node.tag
                     constructor = self.yaml_multi_constructors[None]
@@ -133,26 +153,62 @@ class BaseConstructor(object):
                     constructor = self.__class__.construct_scalar
                 elif isinstance(node, SequenceNode):
                     constructor = self.__class__.construct_sequence
+                    if self.base_construct  \
+                            and constructor == BaseConstructor.construct_sequence:
+                        constructor = BaseConstructor.construct_base_sequence
                 elif isinstance(node, MappingNode):
                     constructor = self.__class__.construct_mapping
+                    if self.base_construct  \
+                            and constructor == BaseConstructor.construct_mapping:
+                        constructor = BaseConstructor.construct_base_mapping
+        # Constructors expect the children they construct to be complete.
+        base_construct = self.base_construct
+        self.base_construct = False
         if tag_suffix is None:
             data = constructor(self, node)
         else:
             data = constructor(self, tag_suffix, node)
+        self.base_construct = base_construct
         if isinstance(data, types.GeneratorType):
             generator = data
             data = common.next(generator)
             if self.deep_construct:
-                for dummy in generator:
-                    pass
+                # The generator is finished by the deep `construct_object`
+                # call on the stack.  Until then the node stays in
+                # `recursive_objects`.
+                record = (generator, node, data)
+                self.deep_pending[node] = record
+                self.deep_generators.append(record)
             else:
                 self.state_generators.append(generator)
-        self.constructed_objects[node] = data
-        del self.recursive_objects[node]
+                self.constructed_objects[node] = data
+                del self.recursive_objects[node]
+        else:
+            self.constructed_objects[node] = data
+            del self.recursive_objects[node]
         if deep:
+            self.run_deep_generators(mark)
             self.deep_construct = old_deep
         return data
 
+    def run_deep_generators(self, mark):
+        # Finish the generators queued by a deep construction above `mark`.
+        # The generators are run from the top of the stack, so the nested
+        # collections are completed without recursion.  A node is registered
+        # as constructed when the records queued by its generator are done.
+        stack = self.deep_generators
+        while len(stack) > mark:
+            generator, node, data = stack.pop()
+            if generator is None:
+                self.constructed_objects[node] = data
+                del self.recursive_objects[node]
+            elif node in self.deep_pending:
+                del self.deep_pending[node]
+                index = len(stack)
+                for dummy in generator:
+                    pass
+                stack.insert(index, (None, node, data))
+
     def construct_scalar(self, node):
         if not isinstance(node, ScalarNode):
             raise ConstructorError(None, None,
@@ -189,6 +245,28 @@ class BaseConstructor(object):
             mapping[key] = value
         return mapping
 
+    # The collections without a constructor are filled after they are
+    # returned, like the ones of `SafeConstructor`, so that the children are
+    # not constructed recursively.  They are only used for the document and
+    # the children of these collections; a constructor that calls
+    # `construct_sequence` or `construct_mapping` gets complete children.
+
+    def construct_base_sequence(self, node):
+        data = []
+        yield data
+        base_construct = self.base_construct
+        self.base_construct = True
+        data.extend(self.construct_sequence(node))
+        self.base_construct = base_construct
+
+    def construct_base_mapping(self, node):
+        data = {}
+        yield data
+        base_construct = self.base_construct
+        self.base_construct = True
+        data.update(self.construct_mapping(node))
+        self.base_construct = base_construct
+
     def construct_pairs(self, node, deep=False):
         if not isinstance(node, MappingNode):
             raise ConstructorError(None, None,
@@ -211,8 +289,39 @@ class BaseConstructor(object):
         if not 'yaml_multi_constructors' in cls.__dict__:
             cls.yaml_multi_constructors = cls.yaml_multi_constructors.copy()
         cls.yaml_multi_constructors[tag_prefix] = multi_constructor
+        # The subclasses may share the dictionary, so their resolved
+        # constructors are dropped as well.
+        classes = [cls]
+        while classes:
+            klass = classes.pop()
+            if 'yaml_multi_constructor_cache' in klass.__dict__:
+                del klass.yaml_multi_constructor_cache
+            classes.extend(klass.__subclasses__())
     add_multi_constructor = classmethod(add_multi_constructor)
 
+    # The number of tags which multi-constructors are remembered by a class.
+    MULTI_CONSTRUCTOR_CACHE_SIZE = 1000
+
+    def get_multi_constructor(cls, tag):
+        # Return the multi-constructor for a tag and the tag suffix passed to
+        # it, or `(None, None)` if no prefix matches the tag.  The result is
+        # remembered by the class until `add_multi_constructor` is called.
+        cache = cls.__dict__.get('yaml_multi_constructor_cache')
+        if cache is None:
+            cache = cls.yaml_multi_constructor_cache = {}
+        elif tag in cache:
+            return cache[tag]
+        result = (None, None)
+        for tag_prefix in cls.yaml_multi_constructors:
+            if tag_prefix is not None and tag.startswith(tag_prefix):
+                result = (cls.yaml_multi_constructors[tag_prefix], tag[len(tag_prefix):])
+                break
+        if len(cache) >= cls.MULTI_CONSTRUCTOR_CACHE_SIZE:
+            cache.clear()
+        cache[tag] = result
+        return result
+    get_multi_constructor = classmethod(get_multi_constructor)
+
 class SafeConstructor(BaseConstructor):
 
     def construct_scalar(self, node):
@@ -223,45 +332,300 @@ class SafeConstructor(BaseConstructor):
         return BaseConstructor.construct_scalar(self, node)
 
     def flatten_mapping(self, node):
-        merge = []
-        index = 0
-        while index < len(node.value):
-            key_node, value_node = node.value[index]
+        merged = []
+        value = []
+        for key_node, value_node in node.value:
             if key_node.tag == u'tag:yaml.org,2002:merge':
-                del node.value[index]
-                if isinstance(value_node, MappingNode):
-                    self.flatten_mapping(value_node)
-                    merge.extend(value_node.value)
-                elif isinstance(value_node, SequenceNode):
-                    submerge = []
-                    for subnode in value_node.value:
-                        if not isinstance(subnode, MappingNode):
-                            raise ConstructorError("while constructing a mapping",
-                                    node.start_mark,
-                                    "expected a mapping for merging, but found %s"
-                                    % subnode.id, subnode.start_mark)
-                        self.flatten_mapping(subnode)
-                        submerge.append(subnode.value)
-                    submerge.reverse()
-                    for value in submerge:
-                        merge.extend(value)
-                else:
-                    raise ConstructorError("while constructing a mapping", node.start_mark,
-                            "expected a mapping or list of mappings for merging, but found %s"
-                            % value_node.id, value_node.start_mark)
-            elif key_node.tag == u'tag:yaml.org,2002:value':
-                key_node.tag = u'tag:yaml.org,2002:str'
-                index += 1
+                merged.append(value_node)
             else:
-                index += 1
-        if merge:
-            node.value = merge + node.value
+                if key_node.tag == u'tag:yaml.org,2002:value':
+                    key_node.tag = u'tag:yaml.org,2002:str'
+                value.append((key_node, value_node))
+        if not merged:
+            return
+        # The merge keys are dropped before the merged mappings are
+        # flattened, so a mapping that merges itself, directly or through
+        # another mapping, is not flattened again.
+        node.value = value
+        merge = []
+        for value_node in merged:
+            for subnode in self.get_merged_nodes(node.start_mark, value_node):
+                self.flatten_mapping(subnode)
+                merge.extend(subnode.value)
+        node.value = merge + value
+
+    def get_merged_nodes(self, mark, value_node):
+        # Return the mappings merged by the value of a merge key in the order
+        # their pairs are applied, so that the first mapping of a list wins.
+        if isinstance(value_node, MappingNode):
+            return [value_node]
+        elif isinstance(value_node, SequenceNode):
+            for subnode in value_node.value:
+                if not isinstance(subnode, MappingNode):
+                    raise ConstructorError("while constructing a mapping", mark,
+                            "expected a mapping for merging, but found %s"
+                            % subnode.id, subnode.start_mark)
+            return value_node.value[::-1]
+        else:
+            raise ConstructorError("while constructing a mapping", mark,
+                    "expected a mapping or list of mappings for merging, but found %s"
+                    % value_node.id, value_node.start_mark)
+
+    def construct_merged_pairs(self, node):
+        # Construct the flattened pairs of a merged mapping as a dict.  It is
+        # kept with the constructed objects, so a mapping merged into many
+        # others is flattened and constructed once per document.
+        cache_key = (node, u'tag:yaml.org,2002:merge')
+        if cache_key in self.constructed_objects:
+            return self.constructed_objects[cache_key]
+        self.flatten_mapping(node)
+        pairs = {}
+        for key_node, value_node in node.value:
+            key = self.construct_object(key_node)
+            self.check_mapping_key(key, node.start_mark, key_node.start_mark)
+            pairs[key] = self.construct_object(value_node)
+        self.constructed_objects[cache_key] = pairs
+        return pairs
 
     def construct_mapping(self, node, deep=False):
         if isinstance(node, MappingNode):
             self.flatten_mapping(node)
         return BaseConstructor.construct_mapping(self, node, deep=deep)
 
+    def get_data(self):
+        # Construct and return the next document.
+        if not self.check_direct_construction():
+            return BaseConstructor.get_data(self)
+        if self.check_node():
+            return self.build_document()[0]
+
+    def get_single_data(self):
+        # Ensure that the stream contains a single document and construct it.
+        if not self.check_direct_construction():
+            return BaseConstructor.get_single_data(self)
+
+        # Drop the STREAM-START event.
+        self.get_event()
+
+        # Construct a document if the stream is not empty.
+        data = start_mark = None
+        if not self.check_event(StreamEndEvent):
+            data, start_mark = self.build_document(single=True)
+
+        # Ensure that the stream contains no more documents.
+        if not self.check_event(StreamEndEvent):
+            event = self.get_event()
+            raise ComposerError("expected a single document in the stream",
+                    start_mark, "but found another document",
+                    event.start_mark)
+
+        # Drop the STREAM-END event.
+        self.get_event()
+
+        return data
+
+    # The methods which direct construction skips or calls differently.
+    direct_construction_methods = ['construct_document', 'construct_object',
+            'construct_scalar', 'construct_sequence', 'construct_mapping',
+            'flatten_mapping', 'construct_yaml_str', 'construct_yaml_seq',
+            'construct_yaml_map', 'construct_undefined']
+
+    def check_direct_construction(self):
+        # Documents may be built straight from the parser events unless the
+        # loader composes nodes differently, uses path resolvers, or
+        # constructs scalars or plain collections in its own way.
+        cls = self.__class__
+        for name in ['get_node', 'get_single_node', 'compose_document',
+                'compose_node', 'compose_scalar_node', 'compose_sequence_node',
+                'compose_mapping_node']:
+            if getattr(cls, name, None) != getattr(Composer, name):
+                return False
+        for name in self.direct_construction_methods:
+            if getattr(cls, name) != getattr(SafeConstructor, name):
+                return False
+        return not getattr(cls, 'yaml_path_resolvers', None)    \
+                and cls.yaml_constructors.get(u'tag:yaml.org,2002:seq')   \
+                        == SafeConstructor.construct_yaml_seq  \
+                and cls.yaml_constructors.get(u'tag:yaml.org,2002:map')   \
+                        == SafeConstructor.construct_yaml_map
+
+    def check_mapping_key(self, key, mark, key_mark):
+        if common.PY2:
+            try:
+                hash(key)
+            except TypeError as exc:
+                raise ConstructorError("while constructing a mapping", mark,
+                        "found unacceptable key (%s)" % exc, key_mark)
+        elif not isinstance(key, collections.abc.Hashable):
+            raise ConstructorError("while constructing a mapping", mark,
+                    "found unhashable key", key_mark)
+
+    def build_document(self, single=False):
+        # Build the next document straight from the parser events and return
+        # it with the start mark of its root.  Scalars and untagged lists and
+        # dicts are constructed without composing nodes.  Anchored and tagged
+        # collections and merged values are composed and constructed as
+        # usual, and aliases refer to the anchored nodes.
+
+        # Drop the DOCUMENT-START event.
+        self.get_event()
+
+        start_mark = self.peek_event().start_mark
+        stack = []
+        try:
+            data = self.build_nodes(stack)
+        except ConstructorError as exc:
+            # A composed document is only constructed once it is complete,
+            # so errors found in the rest of the document take precedence,
+            # and so does an unhashable key of an enclosing dict.
+            error = exc
+            for entry in stack:
+                if entry[4] is not None:
+                    error = entry[4]
+                    break
+            while stack:
+                if self.check_event(CollectionEndEvent):
+                    self.get_event()
+                    stack.pop()
+                else:
+                    self.compose_nodes(None, None)
+            self.get_event()
+            if single and not self.check_event(StreamEndEvent):
+                event = self.get_event()
+                raise ComposerError("expected a single document in the stream",
+                        start_mark, "but found another document",
+                        event.start_mark)
+            raise error
+
+        # Drop the DOCUMENT-END event.
+        self.get_event()
+
+        self.run_state_generators()
+        self.constructed_objects = {}
+        self.recursive_objects = {}
+        self.anchors = {}
+        return data, start_mark
+
+    def build_nodes(self, stack):
+        # Build the root of the document.  A stack entry is a list or a dict
+        # being filled, its start mark and, for a dict, the key waiting for
+        # its value, the dicts of merged pairs and the error for an
+        # unhashable key, which is raised at the end of the mapping after the
+        # merge keys are checked.
+        constructors = self.yaml_constructors
+        while True:
+            if stack and stack[-1][2] is None and self.check_event(CollectionEndEvent):
+                self.get_event()
+                collection, start_mark, key, merge, error = stack.pop()
+                if error is not None:
+                    raise error
+                if merge:
+                    merged = {}
+                    for pairs in merge:
+                        merged.update(pairs)
+                    merged.update(collection)
+                    collection.clear()
+                    collection.update(merged)
+                if not stack:
+                    return collection
+                continue
+            entry = None
+            event = self.peek_event()
+            if isinstance(event, AliasEvent):
+                self.get_event()
+                anchor = event.anchor
+                if anchor not in self.anchors:
+                    raise ComposerError(None, None, "found undefined alias %r"
+                            % anchor.encode('utf-8'), event.start_mark)
+                node = self.anchors[anchor]
+                if stack and isinstance(stack[-1][0], dict) and stack[-1][2] is None \
+                        and node.tag == u'tag:yaml.org,2002:merge':
+                    self.build_merge(stack[-1], node)
+                    continue
+                data = self.construct_object(node)
+                mark = node.start_mark
+            elif event.anchor is None and isinstance(event, ScalarEvent):
+                self.get_event()
+                tag = event.tag
+                if tag is None or tag == u'!':
+                    tag = self.resolve(ScalarNode, event.value, event.implicit)
+                node = ScalarNode(tag, event.value,
+                        event.start_mark, event.end_mark, style=event.style)
+                mark = event.start_mark
+                if stack and isinstance(stack[-1][0], dict) and stack[-1][2] is None:
+                    if tag == u'tag:yaml.org,2002:merge':
+                        self.build_merge(stack[-1], node)
+                        continue
+                    elif tag == u'tag:yaml.org,2002:value':
+                        node.tag = u'tag:yaml.org,2002:str'
+                constructor = constructors.get(node.tag)
+                if constructor is None:
+                    data = self.construct_object(node)
+                    self.run_state_generators()
+                else:
+                    data = constructor(self, node)
+                    if isinstance(data, types.GeneratorType):
+                        generator = data
+                        data = common.next(generator)
+                        self.state_generators.append(generator)
+            else:
+                data = None
+                if event.anchor is None and not isinstance(event, ScalarEvent):
+                    tag = event.tag
+                    if isinstance(event, SequenceStartEvent):
+                        if tag is None or tag == u'!':
+                            tag = self.resolve(SequenceNode, None, event.implicit)
+                        if tag == u'tag:yaml.org,2002:seq':
+                            data = []
+                    else:
+                        if tag is None or tag == u'!':
+                            tag = self.resolve(MappingNode, None, event.implicit)
+                        if tag == u'tag:yaml.org,2002:map':
+                            data = {}
+                if data is not None:
+                    self.get_event()
+                    mark = event.start_mark
+                    entry = [data, mark, None, [], None]
+                else:
+                    node = self.compose_nodes(None, None)
+                    if stack and isinstance(stack[-1][0], dict) and stack[-1][2] is None \
+                            and node.tag == u'tag:yaml.org,2002:merge':
+                        self.build_merge(stack[-1], node)
+                        continue
+                    data = self.construct_object(node)
+                    self.run_state_generators()
+                    mark = node.start_mark
+            if stack:
+                parent = stack[-1]
+            else:
+                parent = None
+            if entry is not None:
+                stack.append(entry)
+            if parent is None:
+                if not stack:
+                    return data
+            elif isinstance(parent[0], list):
+                parent[0].append(data)
+            elif parent[2] is None:
+                try:
+                    self.check_mapping_key(data, parent[1], mark)
+                except ConstructorError as exc:
+                    if parent[4] is None:
+                        parent[4] = exc
+                parent[2] = (data,)
+            else:
+                if parent[4] is None:
+                    parent[0][parent[2][0]] = data
+                parent[2] = None
+
+    def build_merge(self, entry, key_node):
+        # Compose the value of a merge key in the dict being built and add
+        # the constructed pairs of the merged mappings to the entry.
+        value_node = self.compose_nodes(None, None)
+        for node in self.get_merged_nodes(entry[1], value_node):
+            entry[3].append(self.construct_merged_pairs(node))
+        self.run_state_generators()
+
     def construct_yaml_null(self, node):
         self.construct_scalar(node)
         return None
@@ -279,8 +643,17 @@ class SafeConstructor(BaseConstructor):
         value = self.construct_scalar(node)
         return self.bool_values[value.lower()]
 
+    # The decimal forms which `int()` and `float()` convert the same way as
+    # `construct_yaml_int` and `construct_yaml_float` do.
+    decimal_int_regexp = re.compile(u'[-+]?(?:0|[1-9][0-9]*)$')
+    decimal_float_regexp = re.compile(
+            u'[-+]?(?:[0-9]+(?:\\.[0-9]*)?|\\.[0-9]+)(?:[eE][-+]?[0-9]+)?$')
+
     def construct_yaml_int(self, node):
-        value = str(self.construct_scalar(node))
+        value = self.construct_scalar(node)
+        if self.decimal_int_regexp.match(value):
+            return int(value)
+        value = str(value)
         value = value.replace('_', '')
         sign = +1
         if value[0] == '-':
@@ -313,7 +686,10 @@ class SafeConstructor(BaseConstructor):
     nan_value = -inf_value/inf_value   # Trying to make a quiet NaN (like C99).
 
     def construct_yaml_float(self, node):
-        value = str(self.construct_scalar(node))
+        value = self.construct_scalar(node)
+        if self.decimal_float_regexp.match(value):
+            return float(value)
+        value = str(value)
         value = value.replace('_', '').lower()
         sign = +1
         if value[0] == '-':
@@ -336,16 +712,48 @@ class SafeConstructor(BaseConstructor):
         else:
             return sign*float(value)
 
+    # Longer base64 scalars are decoded by pieces of this size, so that no
+    # encoded copy of the whole scalar is made.
+    binary_chunk_size = 1024*1024
+
+    # The bytes which are not base64 characters.
+    base64_junk = bytes(bytearray(ch for ch in range(256)
+            if not (48 <= ch < 58 or 65 <= ch < 91 or 97 <= ch < 123 or ch in (43, 47, 61))))
+
     def construct_yaml_binary(self, node):
         value = self.construct_scalar(node)
         try:
             if common.PY3:
+                if len(value) > self.binary_chunk_size:
+                    return self.decode_base64_chunks(value)
                 return base64.b64decode(common.ensure_binary(value))
             return str(value).decode('base64')
         except (binascii.Error, UnicodeEncodeError) as exc:
             raise ConstructorError(None, None,
                     "failed to decode base64 data: %s" % exc, node.start_mark)
 
+    def decode_base64_chunks(self, value):
+        # Decode the base64 characters of a scalar in pieces that end on
+        # a quad boundary, where the state of the decoder is reset, so the
+        # result is the same as of `b64decode`.  The padding stops decoding,
+        # so the rest of the scalar from the first `=` on is decoded at once.
+        output = common.BytesIO()
+        size = self.binary_chunk_size
+        rest = b''
+        for start in range(0, len(value), size):
+            chunk = rest+value[start:start+size].encode('ascii', 'ignore')  \
+                    .translate(None, self.base64_junk)
+            if b'=' in chunk:
+                rest = chunk+value[start+size:].encode('ascii', 'ignore')   \
+                        .translate(None, self.base64_junk)
+                break
+            end = len(chunk)-len(chunk)%4
+            output.write(binascii.a2b_base64(memoryview(chunk)[:end]))
+            rest = chunk[end:]
+        if rest:
+            output.write(binascii.a2b_base64(rest))
+        return output.getvalue()
+
     timestamp_regexp = re.compile(
             r'''^(?P<year>[0-9][0-9][0-9][0-9])
                 -(?P<month>[0-9][0-9]?)
@@ -358,8 +766,40 @@ class SafeConstructor(BaseConstructor):
                 (?:[ \t]*(?P<tz>Z|(?P<tz_sign>[-+])(?P<tz_hour>[0-9][0-9]?)
                 (?::(?P<tz_minute>[0-9][0-9]))?))?)?$''', re.X)
 
+    # The common ISO 8601 forms, which `fromisoformat` converts the same way
+    # as `construct_yaml_timestamp` does.
+    iso_timestamp_regexp = re.compile(
+            r'''[0-9]{4}-[0-9]{2}-[0-9]{2}
+                (?:(T)[0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]{3}(?:[0-9]{3})?)?
+                (Z|[-+][0-9]{2}:[0-9]{2})?)?\Z''', re.X)
+
+    # The `timezone` instances shared by the timestamps, by their offsets.
+    timezones = {}
+
+    def get_timezone(self, offset):
+        # Return the timezone for an offset written as `Z` or `+HH:MM`.
+        tzinfo = self.timezones.get(offset)
+        if tzinfo is None:
+            delta = datetime.timedelta(0)
+            if offset != u'Z':
+                delta = datetime.timedelta(hours=int(offset[1:-3]), minutes=int(offset[-2:]))
+                if offset[0] == u'-':
+                    delta = -delta
+            tzinfo = self.timezones[offset] = timezone(delta)
+        return tzinfo
+
     def construct_yaml_timestamp(self, node):
         value = self.construct_scalar(node)
+        if hasattr(datetime.datetime, 'fromisoformat'):
+            match = self.iso_timestamp_regexp.match(value)
+            if match is not None:
+                if not match.group(1):
+                    return datetime.date.fromisoformat(value)
+                offset = match.group(2)
+                if offset is None:
+                    return datetime.datetime.fromisoformat(value)
+                return datetime.datetime.fromisoformat(value[:match.start(2)])  \
+                        .replace(tzinfo=self.get_timezone(offset))
         match = self.timestamp_regexp.match(node.value)
         values = match.groupdict()
         year = int(values['year'])
@@ -373,19 +813,12 @@ class SafeConstructor(BaseConstructor):
         fraction = 0
         tzinfo = None
         if values['fraction']:
-            fraction = values['fraction'][:6]
-            while len(fraction) < 6:
-                fraction += '0'
-            fraction = int(fraction)
+            fraction = int(values['fraction'][:6].ljust(6, '0'))
         if values['tz_sign']:
-            tz_hour = int(values['tz_hour'])
-            tz_minute = int(values['tz_minute'] or 0)
-            delta = datetime.timedelta(hours=tz_hour, minutes=tz_minute)
-            if values['tz_sign'] == '-':
-                delta = -delta
-            tzinfo = timezone(delta)
+            tzinfo = self.get_timezone(u'%s%02d:%02d' % (values['tz_sign'],
+                    int(values['tz_hour']), int(values['tz_minute'] or 0)))
         elif values['tz']:
-            tzinfo = timezone(datetime.timedelta(0))
+            tzinfo = self.get_timezone(u'Z')
         return datetime.datetime(year, month, day, hour, minute, second, fraction,
                                  tzinfo=tzinfo)
 
@@ -524,6 +957,187 @@ SafeConstructor.add_constructor(
 SafeConstructor.add_constructor(None,
         SafeConstructor.construct_undefined)
 
+class LazyMapping(common.moves.collections_abc.Mapping):
+    # A mapping constructing its keys on first access and each of its values
+    # when it is first looked up.
+
+    def __init__(self, constructor, node):
+        self._constructor = constructor
+        self._objects = constructor.constructed_objects
+        self._node = node
+        self._nodes = None
+        self._values = {}
+
+    def _load_keys(self):
+        if self._nodes is None:
+            self._nodes = self._constructor.construct_lazy_keys(self._node, self._objects)
+        return self._nodes
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        node = self._load_keys()[key]
+        value = self._values[key] = self._constructor.construct_lazy_object(node, self._objects)
+        return value
+
+    def __iter__(self):
+        return iter(self._load_keys())
+
+    def __len__(self):
+        return len(self._load_keys())
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, dict(self.items()))
+
+    def materialize(self):
+        return materialize(self)
+
+class LazySequence(common.moves.collections_abc.Sequence):
+    # A sequence constructing each of its items when it is first accessed.
+
+    def __init__(self, constructor, node):
+        self._constructor = constructor
+        self._objects = constructor.constructed_objects
+        self._node = node
+        self._items = {}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._node.value)
+        if not 0 <= index < len(self._node.value):
+            raise IndexError("list index out of range")
+        if index in self._items:
+            return self._items[index]
+        node = self._node.value[index]
+        item = self._items[index] = self._constructor.construct_lazy_object(node, self._objects)
+        return item
+
+    def __iter__(self):
+        for index in range(len(self._node.value)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self._node.value)
+
+    def __eq__(self, other):
+        if isinstance(other, LazySequence):
+            other = list(other)
+        if not isinstance(other, list):
+            return NotImplemented
+        return list(self) == other
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, list(self))
+
+    def materialize(self):
+        return materialize(self)
+
+def materialize(data, memo=None):
+    # Replace the lazy collections in the data with dicts and lists.  Shared
+    # and recursive collections stay shared and recursive.
+    if memo is None:
+        memo = {}
+    if id(data) in memo:
+        return memo[id(data)]
+    if isinstance(data, (LazyMapping, dict)):
+        result = memo[id(data)] = {}
+        for key in data:
+            result[materialize(key, memo)] = materialize(data[key], memo)
+    elif isinstance(data, (LazySequence, list)):
+        result = memo[id(data)] = []
+        for item in data:
+            result.append(materialize(item, memo))
+    elif type(data) is tuple:
+        result = memo[id(data)] = tuple([materialize(item, memo) for item in data])
+    else:
+        result = data
+    return result
+
+class LazyConstructor(SafeConstructor):
+    # Plain mappings and sequences are returned as `LazyMapping` and
+    # `LazySequence` proxies constructing their children on first access.
+    # The whole document is still parsed and composed into nodes before the
+    # root is returned, and composing the nodes costs more than the direct
+    # construction of `SafeConstructor` from the parser events.  So loading
+    # a document is not faster than with `SafeLoader` or `CSafeLoader`, and
+    # is usually slower.  The proxies only save the work of the constructors
+    # of the children that are never read, which pays off when these
+    # constructors are expensive, e.g. custom ones added to a subclass.
+
+    def __init__(self):
+        SafeConstructor.__init__(self)
+        self.constructed_objects = collections.OrderedDict()
+
+    def construct_document(self, node):
+        data = SafeConstructor.construct_document(self, node)
+        # The objects of a document are kept in order, so the ones left
+        # over by a failed construction of a child may be dropped.
+        self.constructed_objects = collections.OrderedDict()
+        return data
+
+    def construct_lazy_keys(self, node, objects):
+        # Construct the keys of a mapping and return them with their value
+        # nodes.  Like in `construct_mapping`, merged keys come first and the
+        # last one of equal keys wins.
+        self.flatten_mapping(node)
+        nodes = {}
+        for key_node, value_node in node.value:
+            key = self.construct_lazy_object(key_node, objects)
+            self.check_mapping_key(key, node.start_mark, key_node.start_mark)
+            nodes[key] = value_node
+        return nodes
+
+    def construct_lazy_object(self, node, objects):
+        # Construct a child of a lazy collection after its document is done,
+        # sharing the constructed objects of the document.
+        constructed_objects = self.constructed_objects
+        self.constructed_objects = objects
+        size = len(objects)
+        try:
+            data = self.construct_object(node)
+            self.run_state_generators()
+        except:
+            for node in list(objects)[size:]:
+                del objects[node]
+            raise
+        finally:
+            self.constructed_objects = constructed_objects
+            self.recursive_objects = {}
+            self.state_generators = []
+        return data
+
+    def construct_lazy_seq(self, node):
+        if not isinstance(node, SequenceNode):
+            raise ConstructorError(None, None,
+                    "expected a sequence node, but found %s" % node.id,
+                    node.start_mark)
+        return LazySequence(self, node)
+
+    def construct_lazy_map(self, node):
+        if not isinstance(node, MappingNode):
+            raise ConstructorError(None, None,
+                    "expected a mapping node, but found %s" % node.id,
+                    node.start_mark)
+        return LazyMapping(self, node)
+
+LazyConstructor.add_constructor(
+        u'tag:yaml.org,2002:seq',
+        LazyConstructor.construct_lazy_seq)
+
+LazyConstructor.add_constructor(
+        u'tag:yaml.org,2002:map',
+        LazyConstructor.construct_lazy_map)
+
 class FullConstructor(SafeConstructor):
     # 'extend' is blacklisted because it is used by
     # construct_python_object_apply to add `listitems` to a newly generate
@@ -1,6 +1,6 @@
 
 __all__ = [
-    'CBaseLoader', 'CSafeLoader', 'CFullLoader', 'CUnsafeLoader', 'CLoader',
+    'CBaseLoader', 'CSafeLoader', 'CLazyLoader', 'CFullLoader', 'CUnsafeLoader', 'CLoader',
     'CBaseDumper', 'CSafeDumper', 'CDumper'
 ]
 
@@ -15,36 +15,43 @@ from .resolver import *
 
 class CBaseLoader(CParser, BaseConstructor, BaseResolver):
 
-    def __init__(self, stream):
-        CParser.__init__(self, stream)
+    def __init__(self, stream, marks=True):
+        CParser.__init__(self, stream, marks)
         BaseConstructor.__init__(self)
         BaseResolver.__init__(self)
 
 class CSafeLoader(CParser, SafeConstructor, Resolver):
 
-    def __init__(self, stream):
-        CParser.__init__(self, stream)
+    def __init__(self, stream, marks=True):
+        CParser.__init__(self, stream, marks)
         SafeConstructor.__init__(self)
         Resolver.__init__(self)
 
+class CLazyLoader(CParser, LazyConstructor, Resolver):
+
+    def __init__(self, stream, marks=True):
+        CParser.__init__(self, stream, marks)
+        LazyConstructor.__init__(self)
+        Resolver.__init__(self)
+
 class CFullLoader(CParser, FullConstructor, Resolver):
 
-    def __init__(self, stream):
-        CParser.__init__(self, stream)
+    def __init__(self, stream, marks=True):
+        CParser.__init__(self, stream, marks)
         FullConstructor.__init__(self)
         Resolver.__init__(self)
 
 class CUnsafeLoader(CParser, UnsafeConstructor, Resolver):
 
-    def __init__(self, stream):
-        CParser.__init__(self, stream)
+    def __init__(self, stream, marks=True):
+        CParser.__init__(self, stream, marks)
         UnsafeConstructor.__init__(self)
         Resolver.__init__(self)
 
 class CLoader(CParser, Constructor, Resolver):
 
-    def __init__(self, stream):
-        CParser.__init__(self, stream)
+    def __init__(self, stream, marks=True):
+        CParser.__init__(self, stream, marks)
         Constructor.__init__(self)
         Resolver.__init__(self)
 
@@ -2,8 +2,13 @@
 __all__ = ['Mark', 'YAMLError', 'MarkedYAMLError']
 
 from . import common
+
+import bisect, re
+
 class Mark(object):
 
+    __slots__ = ('name', 'index', 'line', 'column', 'buffer', 'pointer')
+
     def __init__(self, name, index, line, column, buffer, pointer):
         self.name = name
         self.index = index
@@ -12,6 +17,11 @@ class Mark(object):
         self.buffer = buffer
         self.pointer = pointer
 
+    def __reduce__(self):
+        # Slotted objects can not be pickled with the protocols 0 and 1.
+        return (self.__class__, (self.name, self.index, self.line,
+            self.column, self.buffer, self.pointer))
+
     def get_snippet(self, indent=4, max_length=75):
         if self.buffer is None:
             return None
@@ -43,6 +53,61 @@ class Mark(object):
             where += ":\n"+snippet
         return where
 
+class LineIndex(object):
+    # The start offsets of the lines of a text, computed on first use and
+    # shared by all lazy marks pointing into it.
+
+    BREAK = re.compile(u'\r\n|[\r\n\x85\u2028\u2029]')
+
+    def __init__(self, name, buffer):
+        self.name = name
+        self.buffer = buffer
+        self.starts = None
+
+    def get_position(self, index):
+        if self.starts is None:
+            self.starts = [0]+[match.end()
+                    for match in self.BREAK.finditer(self.buffer)]
+        line = bisect.bisect_right(self.starts, index)-1
+        start = self.starts[line]
+        column = index-start-self.buffer.count(u'\uFEFF', start, index)
+        return line, column
+
+class LazyMark(Mark):
+    # A mark that only stores the offset of a character in the buffer of
+    # a `LineIndex`.  The line and the column are computed when requested.
+
+    __slots__ = ('source',)
+
+    def __init__(self, source, index):
+        self.source = source
+        self.index = index
+
+    @property
+    def name(self):
+        return self.source.name
+
+    @property
+    def line(self):
+        return self.source.get_position(self.index)[0]
+
+    @property
+    def column(self):
+        return self.source.get_position(self.index)[1]
+
+    @property
+    def buffer(self):
+        return self.source.buffer
+
+    @property
+    def pointer(self):
+        return self.index
+
+    def __reduce__(self):
+        # The properties can not be set, so a copy is an eager mark.
+        return (Mark, (self.name, self.index, self.line, self.column,
+            self.buffer, self.pointer))
+
 class YAMLError(Exception):
     pass
 
@@ -2,6 +2,7 @@
 # Abstract classes.
 
 class Event(object):
+    __slots__ = ('start_mark', 'end_mark')
     def __init__(self, start_mark=None, end_mark=None):
         self.start_mark = start_mark
         self.end_mark = end_mark
@@ -13,12 +14,14 @@ class Event(object):
         return '%s(%s)' % (self.__class__.__name__, arguments)
 
 class NodeEvent(Event):
+    __slots__ = ('anchor',)
     def __init__(self, anchor, start_mark=None, end_mark=None):
         self.anchor = anchor
         self.start_mark = start_mark
         self.end_mark = end_mark
 
 class CollectionStartEvent(NodeEvent):
+    __slots__ = ('tag', 'implicit', 'flow_style')
     def __init__(self, anchor, tag, implicit, start_mark=None, end_mark=None,
             flow_style=None):
         self.anchor = anchor
@@ -29,20 +32,22 @@ class CollectionStartEvent(NodeEvent):
         self.flow_style = flow_style
 
 class CollectionEndEvent(Event):
-    pass
+    __slots__ = ()
 
 # Implementations.
 
 class StreamStartEvent(Event):
+    __slots__ = ('encoding',)
     def __init__(self, start_mark=None, end_mark=None, encoding=None):
         self.start_mark = start_mark
         self.end_mark = end_mark
         self.encoding = encoding
 
 class StreamEndEvent(Event):
-    pass
+    __slots__ = ()
 
 class DocumentStartEvent(Event):
+    __slots__ = ('explicit', 'version', 'tags')
     def __init__(self, start_mark=None, end_mark=None,
             explicit=None, version=None, tags=None):
         self.start_mark = start_mark
@@ -52,6 +57,7 @@ class DocumentStartEvent(Event):
         self.tags = tags
 
 class DocumentEndEvent(Event):
+    __slots__ = ('explicit',)
     def __init__(self, start_mark=None, end_mark=None,
             explicit=None):
         self.start_mark = start_mark
@@ -59,9 +65,10 @@ class DocumentEndEvent(Event):
         self.explicit = explicit
 
 class AliasEvent(NodeEvent):
-    pass
+    __slots__ = ()
 
 class ScalarEvent(NodeEvent):
+    __slots__ = ('tag', 'implicit', 'value', 'style')
     def __init__(self, anchor, tag, implicit, value,
             start_mark=None, end_mark=None, style=None):
         self.anchor = anchor
@@ -73,14 +80,68 @@ class ScalarEvent(NodeEvent):
         self.style = style
 
 class SequenceStartEvent(CollectionStartEvent):
-    pass
+    __slots__ = ()
 
 class SequenceEndEvent(CollectionEndEvent):
-    pass
+    __slots__ = ()
 
 class MappingStartEvent(CollectionStartEvent):
-    pass
+    __slots__ = ()
 
 class MappingEndEvent(CollectionEndEvent):
-    pass
+    __slots__ = ()
+
+# Event handlers.
+
+class EventHandler(object):
+    # The base class of the handlers passed to `handle_events`.  Its methods
+    # take the attributes of the events, except for the marks, in place of
+    # Event objects.  The events for the methods that a handler does not
+    # define, or inherits from this class, are dropped.
+
+    METHODS = ['start_stream', 'end_stream', 'start_document', 'end_document',
+            'alias', 'scalar', 'start_sequence', 'end_sequence',
+            'start_mapping', 'end_mapping']
+
+    def start_stream(self, encoding):
+        pass
+
+    def end_stream(self):
+        pass
+
+    def start_document(self, explicit, version, tags):
+        pass
+
+    def end_document(self, explicit):
+        pass
+
+    def alias(self, anchor):
+        pass
+
+    def scalar(self, value, tag, anchor, style, implicit):
+        pass
+
+    def start_sequence(self, tag, anchor, flow_style, implicit):
+        pass
+
+    def end_sequence(self):
+        pass
+
+    def start_mapping(self, tag, anchor, flow_style, implicit):
+        pass
+
+    def end_mapping(self):
+        pass
+
+    def get_methods(cls, handler):
+        # Return the bound methods of a handler in the order of `METHODS`,
+        # or `None` for the events to drop.
+        methods = []
+        for name in cls.METHODS:
+            method = getattr(handler, name, None)
+            if getattr(handler.__class__, name, None) == getattr(EventHandler, name):
+                method = None
+            methods.append(method)
+        return methods
+    get_methods = classmethod(get_methods)
 
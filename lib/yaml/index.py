@@ -0,0 +1,151 @@
+# This module builds an index of the documents of a YAML file, so that a
+# single document can be loaded without scanning the documents before it.
+#
+# The file is split by a DocumentSplitter at every document boundary it may
+# cut at (see yaml.splitter for the handling of directives, '...' markers
+# and block scalars).  For every chunk the index records its byte offset,
+# the index of its first character, the line it starts on and the number of
+# its first document.  The index is saved in a text file next to the YAML
+# file:
+#
+#   yaml-index 2 <encoding> <size> <mtime> <documents>
+#   <offset> <index> <line> <document>
+#   ...
+
+__all__ = ['DocumentIndex', 'DocumentIndexError', 'build_index', 'load_document']
+
+from .error import YAMLError
+from .splitter import DocumentSplitter
+from .parallel import load_chunk
+
+import bisect, os
+
+class DocumentIndexError(YAMLError):
+    pass
+
+def _get_mtime(stat):
+    # The modification time in nanoseconds, so that a file rewritten within
+    # the same second is noticed.
+    mtime = getattr(stat, 'st_mtime_ns', None)
+    if mtime is None:
+        mtime = int(stat.st_mtime*1000000000)
+    return mtime
+
+class DocumentIndex(object):
+
+    # The first word of an index file and the version of the format.
+    SIGNATURE = 'yaml-index'
+    VERSION = 2
+
+    # The suffix of the index file saved next to a YAML file.
+    SUFFIX = '.idx'
+
+    def __init__(self, encoding, size, mtime, documents=0):
+        self.encoding = encoding
+        self.size = size
+        self.mtime = mtime
+        self.documents = documents
+        self.offsets = []
+        self.indexes = []
+        self.lines = []
+        self.numbers = []
+
+    def add(self, offset, index, line, number):
+        self.offsets.append(offset)
+        self.indexes.append(index)
+        self.lines.append(line)
+        self.numbers.append(number)
+
+    def check(self, path):
+        stat = os.stat(path)
+        return self.size == stat.st_size and self.mtime == _get_mtime(stat)
+
+    def locate(self, number):
+        # Return the byte offsets of the chunk containing a document, the
+        # index and the line of its first character and the number of its
+        # first document.
+        if not 0 <= number < self.documents:
+            raise DocumentIndexError("document %d is not found, the stream has %d documents"
+                    % (number, self.documents))
+        position = bisect.bisect_right(self.numbers, number)-1
+        if position+1 < len(self.offsets):
+            end = self.offsets[position+1]
+        else:
+            end = self.size
+        return (self.offsets[position], end, self.indexes[position],
+                self.lines[position], self.numbers[position])
+
+    def save(self, filename):
+        with open(filename, 'w') as file:
+            file.write('%s %d %s %d %d %d\n' % (self.SIGNATURE, self.VERSION,
+                    self.encoding, self.size, self.mtime, self.documents))
+            for entry in zip(self.offsets, self.indexes, self.lines, self.numbers):
+                file.write('%d %d %d %d\n' % entry)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'r') as file:
+            header = file.readline().split()
+            if len(header) != 6 or header[0] != cls.SIGNATURE   \
+                    or header[1] != str(cls.VERSION):
+                raise DocumentIndexError("%s is not a YAML document index" % filename)
+            index = cls(header[2], int(header[3]), int(header[4]), int(header[5]))
+            for line in file:
+                index.add(*[int(value) for value in line.split()])
+        return index
+
+def build_index(path, filename=None):
+    """
+    Scan the document boundaries of a YAML file, save their positions
+    in an index file (next to the YAML file by default) and return the index.
+    """
+    with open(path, 'rb') as file:
+        stat = os.fstat(file.fileno())
+        splitter = DocumentSplitter(file, 0)
+        index = DocumentIndex(splitter.reader.encoding, stat.st_size, _get_mtime(stat))
+        offset = 0
+        for text, start, line, number in splitter:
+            index.add(offset, start, line, number)
+            offset += len(text.encode(index.encoding))
+        index.documents = splitter.documents
+    if filename is None:
+        filename = '%s%s' % (path, DocumentIndex.SUFFIX)
+    index.save(filename)
+    return index
+
+def load_document(path, number, Loader, index=None):
+    """
+    Parse the document of a YAML file with the given number (starting
+    from 0) and produce the corresponding Python object.  The index is
+    a DocumentIndex or the name of its file.  By default the index next
+    to the YAML file is used and it is rebuilt if it is missing or out of date.
+    """
+    if index is None:
+        filename = '%s%s' % (path, DocumentIndex.SUFFIX)
+        if os.path.exists(filename):
+            try:
+                index = DocumentIndex.load(filename)
+            except DocumentIndexError:
+                # An index saved in an older format is rebuilt.
+                index = None
+            if index is not None and not index.check(path):
+                index = None
+        if index is None:
+            index = build_index(path, filename)
+    else:
+        if not isinstance(index, DocumentIndex):
+            index = DocumentIndex.load(index)
+        if not index.check(path):
+            raise DocumentIndexError("the index of %s is out of date" % path)
+    offset, end, start, line, first = index.locate(number)
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        text = file.read(end-offset).decode(index.encoding)
+    documents, error = load_chunk(Loader, path, text, start, line)
+    if number-first < len(documents):
+        return documents[number-first]
+    if error is None:
+        error = DocumentIndexError("document %d is not found in the chunk at offset %d of %s"
+                % (number, offset, path))
+    raise error
+
@@ -1,5 +1,5 @@
 
-__all__ = ['BaseLoader', 'FullLoader', 'SafeLoader', 'Loader', 'UnsafeLoader']
+__all__ = ['BaseLoader', 'FullLoader', 'SafeLoader', 'LazyLoader', 'Loader', 'UnsafeLoader']
 
 from .reader import *
 from .scanner import *
@@ -10,8 +10,8 @@ from .resolver import *
 
 class BaseLoader(Reader, Scanner, Parser, Composer, BaseConstructor, BaseResolver):
 
-    def __init__(self, stream):
-        Reader.__init__(self, stream)
+    def __init__(self, stream, marks=True):
+        Reader.__init__(self, stream, marks)
         Scanner.__init__(self)
         Parser.__init__(self)
         Composer.__init__(self)
@@ -20,8 +20,8 @@ class BaseLoader(Reader, Scanner, Parser, Composer, BaseConstructor, BaseResolve
 
 class FullLoader(Reader, Scanner, Parser, Composer, FullConstructor, Resolver):
 
-    def __init__(self, stream):
-        Reader.__init__(self, stream)
+    def __init__(self, stream, marks=True):
+        Reader.__init__(self, stream, marks)
         Scanner.__init__(self)
         Parser.__init__(self)
         Composer.__init__(self)
@@ -30,18 +30,28 @@ class FullLoader(Reader, Scanner, Parser, Composer, FullConstructor, Resolver):
 
 class SafeLoader(Reader, Scanner, Parser, Composer, SafeConstructor, Resolver):
 
-    def __init__(self, stream):
-        Reader.__init__(self, stream)
+    def __init__(self, stream, marks=True):
+        Reader.__init__(self, stream, marks)
         Scanner.__init__(self)
         Parser.__init__(self)
         Composer.__init__(self)
         SafeConstructor.__init__(self)
         Resolver.__init__(self)
 
+class LazyLoader(Reader, Scanner, Parser, Composer, LazyConstructor, Resolver):
+
+    def __init__(self, stream, marks=True):
+        Reader.__init__(self, stream, marks)
+        Scanner.__init__(self)
+        Parser.__init__(self)
+        Composer.__init__(self)
+        LazyConstructor.__init__(self)
+        Resolver.__init__(self)
+
 class Loader(Reader, Scanner, Parser, Composer, Constructor, Resolver):
 
-    def __init__(self, stream):
-        Reader.__init__(self, stream)
+    def __init__(self, stream, marks=True):
+        Reader.__init__(self, stream, marks)
         Scanner.__init__(self)
         Parser.__init__(self)
         Composer.__init__(self)
@@ -54,8 +64,8 @@ class Loader(Reader, Scanner, Parser, Composer, Constructor, Resolver):
 # to ensure backwards compatibility.
 class UnsafeLoader(Reader, Scanner, Parser, Composer, Constructor, Resolver):
 
-    def __init__(self, stream):
-        Reader.__init__(self, stream)
+    def __init__(self, stream, marks=True):
+        Reader.__init__(self, stream, marks)
         Scanner.__init__(self)
         Parser.__init__(self)
         Composer.__init__(self)
@@ -0,0 +1,67 @@
+__all__ = ['parallel_load_all']
+
+from .error import *
+from .splitter import DocumentSplitter
+
+import collections, multiprocessing
+
+def load_chunk(Loader, name, text, index, line):
+    # Construct the documents of a chunk in a worker process.  An error is
+    # returned along with the documents preceding it, and its marks are
+    # moved to the position of the chunk in the stream.
+    documents = []
+    loader = Loader(text)
+    try:
+        while loader.check_data():
+            documents.append(loader.get_data())
+    except MarkedYAMLError as exc:
+        # The marks are also replaced in the arguments of the exception,
+        # which are passed to its class when it is unpickled.
+        for attribute in ['context_mark', 'problem_mark']:
+            mark = getattr(exc, attribute)
+            if mark is not None:
+                moved = Mark(name, mark.index+index, mark.line+line,
+                        mark.column, mark.buffer, mark.pointer)
+                setattr(exc, attribute, moved)
+                exc.args = tuple([moved if arg is mark else arg for arg in exc.args])
+        return documents, exc
+    except Exception as exc:
+        return documents, exc
+    finally:
+        loader.dispose()
+    return documents, None
+
+def parallel_load_all(stream, Loader, workers=None, chunk_size=None):
+    """
+    Parse all YAML documents in a stream in a pool of worker processes
+    and produce corresponding Python objects in the order of the stream.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    splitter = DocumentSplitter(stream, chunk_size)
+    executor = ProcessPoolExecutor(workers)
+    # Chunks are read ahead only while a few of them per worker are waiting.
+    pending = collections.deque()
+    try:
+        for text, index, line, document in splitter:
+            pending.append(executor.submit(load_chunk, Loader, splitter.name,
+                    text, index, line))
+            if len(pending) > 2*workers:
+                for data in get_documents(pending.popleft()):
+                    yield data
+        while pending:
+            for data in get_documents(pending.popleft()):
+                yield data
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown()
+
+def get_documents(future):
+    documents, error = future.result()
+    for data in documents:
+        yield data
+    if error is not None:
+        raise error
+
@@ -120,6 +120,52 @@ class Parser(object):
         self.current_event = None
         return value
 
+    def handle_events(self, handler):
+        # Pass the remaining events to the methods of a handler (see
+        # `EventHandler`).
+        (start_stream, end_stream, start_document, end_document, alias, scalar,
+                start_sequence, end_sequence, start_mapping, end_mapping)  \
+                        = EventHandler.get_methods(handler)
+        while True:
+            # Run the states directly rather than through `get_event`.
+            event = self.current_event
+            self.current_event = None
+            if event is None:
+                if not self.state:
+                    break
+                event = self.state()
+            event_class = event.__class__
+            if event_class is ScalarEvent:
+                if scalar is not None:
+                    scalar(event.value, event.tag, event.anchor, event.style, event.implicit)
+            elif event_class is MappingStartEvent:
+                if start_mapping is not None:
+                    start_mapping(event.tag, event.anchor, event.flow_style, event.implicit)
+            elif event_class is MappingEndEvent:
+                if end_mapping is not None:
+                    end_mapping()
+            elif event_class is SequenceStartEvent:
+                if start_sequence is not None:
+                    start_sequence(event.tag, event.anchor, event.flow_style, event.implicit)
+            elif event_class is SequenceEndEvent:
+                if end_sequence is not None:
+                    end_sequence()
+            elif event_class is AliasEvent:
+                if alias is not None:
+                    alias(event.anchor)
+            elif event_class is DocumentStartEvent:
+                if start_document is not None:
+                    start_document(event.explicit, event.version, event.tags)
+            elif event_class is DocumentEndEvent:
+                if end_document is not None:
+                    end_document(event.explicit)
+            elif event_class is StreamStartEvent:
+                if start_stream is not None:
+                    start_stream(event.encoding)
+            elif event_class is StreamEndEvent:
+                if end_stream is not None:
+                    end_stream()
+
     # stream    ::= STREAM-START implicit_document? explicit_document* STREAM-END
     # implicit_document ::= block_node DOCUMENT-END*
     # explicit_document ::= DIRECTIVE* DOCUMENT-START block_node? DOCUMENT-END*
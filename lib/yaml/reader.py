@@ -12,19 +12,22 @@
 # Reader provides the following methods and attributes:
 #   reader.peek(length=1) - return the next `length` characters
 #   reader.forward(length=1) - move the current position to `length` characters.
+#   reader.prefix_match(regexp) - return the longest run matching `regexp`.
 #   reader.index - the number of the current character.
 #   reader.line, stream.column - the line and the column of the current character.
 
 __all__ = ['Reader', 'ReaderError']
 
 from . import common
-from .error import YAMLError, Mark
+from .error import YAMLError, Mark, LazyMark, LineIndex
 
-import codecs, re, sys
+import codecs, mmap, os, re, sys
 
 if common.PY3:
     import io
 
+PathLike = getattr(os, 'PathLike', None)
+
 has_ucs4 = sys.maxunicode > 0xffff
 
 class ReaderError(YAMLError):
@@ -58,11 +61,17 @@ class Reader(object):
     #  - a `str` object,
     #  - a `unicode` object,
     #  - a file-like object with its `read` method returning `str`,
-    #  - a file-like object with its `read` method returning `unicode`.
+    #  - a file-like object with its `read` method returning `unicode`,
+    #  - an `mmap` or `memoryview` object, or a path to a file that is
+    #    mapped into memory and decoded window by window.
 
     # Yeah, it's ugly and slow.
 
-    def __init__(self, stream):
+    # With `marks=False`, no marks are built at all: tokens, events and
+    # nodes get `None` marks and errors carry no position.
+
+    def __init__(self, stream, marks=True):
+        self.use_marks = marks
         self.name = None
         self.stream = None
         self.stream_pointer = 0
@@ -72,6 +81,9 @@ class Reader(object):
         self.raw_buffer = None
         self.raw_decode = None
         self.encoding = None
+        self.mapped = False
+        self.mapped_owner = False
+        self.line_index = None
         self.index = 0
         self.line = 0
         self.column = 0
@@ -83,6 +95,23 @@ class Reader(object):
             self.name = "<string>"
             self.raw_buffer = stream
             self.determine_encoding()
+        elif isinstance(stream, (mmap.mmap, memoryview))  \
+                or (PathLike is not None and isinstance(stream, PathLike)):
+            if isinstance(stream, mmap.mmap):
+                self.name = "<mmap>"
+            elif isinstance(stream, memoryview):
+                self.name = "<memoryview>"
+                if stream.format != 'B':
+                    stream = stream.cast('B')
+            else:
+                self.name = os.fspath(stream)
+                stream = self.map_file(self.name)
+                self.mapped_owner = isinstance(stream, mmap.mmap)
+            self.stream = stream
+            self.mapped = True
+            self.eof = False
+            self.raw_buffer = b''
+            self.determine_encoding()
         elif common.PY3 and not isinstance(stream, codecs.StreamReaderWriter) and (
                 isinstance(stream, common.BytesIO)
                 or (not isinstance(stream, io.TextIOBase)) and 'b' in getattr(stream, 'mode', '')):
@@ -114,10 +143,28 @@ class Reader(object):
             self.update(length)
         return self.buffer[self.pointer:self.pointer+length]
 
+    def prefix_match(self, regexp):
+        # Return the text matched by `regexp` at the current position.  The
+        # pattern must always match (possibly the empty string) and must not
+        # match '\0'.  More data is read while the match reaches the end of
+        # the buffer, so the run is complete and the character that follows
+        # it is loaded.  The patterns of the scanner cannot be resumed in the
+        # middle of a run, so the run is matched again from its start, but
+        # every refill at least doubles the buffered text, which keeps the
+        # total work linear in the length of the run.
+        match = regexp.match(self.buffer, self.pointer)
+        while self.raw_buffer is not None and match.end()+1 >= len(self.buffer):
+            self.update(max(2*(len(self.buffer)-self.pointer), self.READ_SIZE))
+            match = regexp.match(self.buffer, self.pointer)
+        return match.group()
+
+    # Characters that affect the line and column computation.
+    BREAKS_OR_BOM = re.compile(u'[\r\n\x85\u2028\u2029\uFEFF]')
+
     def forward(self, length=1):
         if self.pointer+length+1 >= len(self.buffer):
             self.update(length+1)
-        while length:
+        if length == 1:
             ch = self.buffer[self.pointer]
             self.pointer += 1
             self.index += 1
@@ -127,12 +174,41 @@ class Reader(object):
                 self.column = 0
             elif ch != u'\uFEFF':
                 self.column += 1
-            length -= 1
+            return
+        start = self.pointer
+        end = start+length
+        self.pointer = end
+        self.index += length
+        buffer = self.buffer
+        if self.BREAKS_OR_BOM.search(buffer, start, end) is None:
+            self.column += length
+            return
+        # '\r\n' is a single line break; a '\r' at the end of the slice
+        # followed by '\n' is counted when the '\n' is consumed.
+        chunk = buffer[start:end]
+        stop = length
+        if chunk[-1] == u'\r' and buffer[end] == u'\n':
+            stop -= 1
+        breaks = (chunk.count(u'\n')+chunk.count(u'\r', 0, stop)-chunk.count(u'\r\n')
+                + chunk.count(u'\x85')+chunk.count(u'\u2028')+chunk.count(u'\u2029'))
+        if breaks:
+            self.line += breaks
+            last = max(chunk.rfind(u'\n'), chunk.rfind(u'\r', 0, stop),
+                    chunk.rfind(u'\x85'), chunk.rfind(u'\u2028'),
+                    chunk.rfind(u'\u2029'))
+            chunk = chunk[last+1:]
+            self.column = 0
+        self.column += len(chunk)-chunk.count(u'\uFEFF')
 
     def get_mark(self):
+        if not self.use_marks:
+            return None
         if self.stream is None:
-            return Mark(self.name, self.index, self.line, self.column,
-                    self.buffer, self.pointer)
+            # The buffer holds the whole input, so the line and the column
+            # can be recovered from the index when they are needed.
+            if self.line_index is None or self.line_index.buffer is not self.buffer:
+                self.line_index = LineIndex(self.name, self.buffer)
+            return LazyMark(self.line_index, self.pointer)
         else:
             return Mark(self.name, self.index, self.line, self.column,
                     None, None)
@@ -161,20 +237,27 @@ class Reader(object):
         # Need to use eval here due to the above Jython issue
         NON_PRINTABLE = eval(r"u'[^\x09\x0A\x0D\x20-\x7E\x85\xA0-\uFFFD]|(?:^|[^\uD800-\uDBFF])[\uDC00-\uDFFF]|[\uD800-\uDBFF](?:[^\uDC00-\uDFFF]|$)'")
     NON_PRINTABLE = re.compile(NON_PRINTABLE)
-    def check_printable(self, data):
+    def check_printable(self, data, offset=0):
         match = self.NON_PRINTABLE.search(data)
         if match:
             character = match.group()
-            position = self.index+(len(self.buffer)-self.pointer)+match.start()
+            position = self.index+(len(self.buffer)-self.pointer)+offset+match.start()
             raise ReaderError(self.name, position, ord(character),
                     'unicode', "special characters are not allowed")
 
+    # The number of bytes (or characters) requested from the stream at once.
+    READ_SIZE = 65536
+
     def update(self, length):
         if self.raw_buffer is None:
             return
         self.buffer = self.buffer[self.pointer:]
         self.pointer = 0
-        while len(self.buffer) < length:
+        # Collect the decoded pieces and join them once, so that a refill
+        # costs time proportional to the amount of data read.
+        chunks = [self.buffer]
+        size = len(self.buffer)
+        while size < length:
             if not self.eof:
                 self.update_raw()
             if self.raw_decode is not None:
@@ -192,18 +275,38 @@ class Reader(object):
             else:
                 data = self.raw_buffer
                 converted = len(data)
-            self.check_printable(data)
-            self.buffer += data
+            self.check_printable(data, size-len(self.buffer))
+            chunks.append(data)
+            size += len(data)
             self.raw_buffer = self.raw_buffer[converted:]
             if self.eof:
-                self.buffer += u'\0'
+                chunks.append(u'\0')
                 self.raw_buffer = None
                 break
+        if len(chunks) > 1:
+            self.buffer = u''.join(chunks)
 
-    def update_raw(self, size=1024):
-        data = self.stream.read(size)
+    def update_raw(self, size=None):
+        if size is None:
+            size = self.READ_SIZE
+        if self.mapped:
+            data = self.stream[self.stream_pointer:self.stream_pointer+size]
+            if isinstance(data, memoryview):
+                data = data.tobytes()
+        else:
+            data = self.stream.read(size)
         if data:
             self.raw_buffer += data
             self.stream_pointer += len(data)
         else:
             self.eof = True
+            if self.mapped_owner:
+                self.stream.close()
+
+    def map_file(self, path):
+        with open(path, 'rb') as file:
+            try:
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                return memoryview(b'')
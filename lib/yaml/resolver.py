@@ -19,6 +19,21 @@ class BaseResolver(object):
     yaml_implicit_resolvers = {}
     yaml_path_resolvers = {}
 
+    # Plain scalars tend to repeat, so the tags that the implicit resolvers
+    # assign to them are remembered.  Each class keeps its own cache, which
+    # is dropped whenever an implicit resolver is added.  Code that changes
+    # `yaml_implicit_resolvers` in place instead of calling
+    # `add_implicit_resolver` must call `clear_implicit_cache` afterwards.
+    # Values longer than `IMPLICIT_CACHE_VALUE_LENGTH` are resolved every
+    # time, so the cache stays small; the standard resolvers only match
+    # short values anyway.
+    IMPLICIT_CACHE_SIZE = 10000
+    IMPLICIT_CACHE_VALUE_LENGTH = 64
+
+    # A global inline flag such as `(?i)` would apply to every resolver in
+    # the joined pattern, so such patterns are never joined.
+    global_flags_regexp = re.compile(r'\(\?[aiLmsux]+\)')
+
     def __init__(self):
         self.resolver_exact_paths = []
         self.resolver_prefix_paths = []
@@ -33,8 +48,75 @@ class BaseResolver(object):
             first = [None]
         for ch in first:
             cls.yaml_implicit_resolvers.setdefault(ch, []).append((tag, regexp))
+        cls.clear_implicit_cache()
     add_implicit_resolver = classmethod(add_implicit_resolver)
 
+    def get_implicit_cache(cls):
+        cache = cls.__dict__.get('yaml_implicit_cache')
+        if cache is None:
+            cache = cls.yaml_implicit_cache = {}
+        return cache
+    get_implicit_cache = classmethod(get_implicit_cache)
+
+    def get_implicit_matchers(cls):
+        matchers = cls.__dict__.get('yaml_implicit_matchers')
+        if matchers is None:
+            matchers = cls.yaml_implicit_matchers = {}
+        return matchers
+    get_implicit_matchers = classmethod(get_implicit_matchers)
+
+    def clear_implicit_cache(cls):
+        # Subclasses may share the resolvers of `cls`, so their caches are
+        # dropped as well.
+        classes = [cls]
+        while classes:
+            klass = classes.pop()
+            for name in ['yaml_implicit_cache', 'yaml_implicit_matchers']:
+                if name in klass.__dict__:
+                    delattr(klass, name)
+            classes.extend(klass.__subclasses__())
+    clear_implicit_cache = classmethod(clear_implicit_cache)
+
+    def compile_implicit_resolvers(cls, ch):
+        # Join the resolvers for the first character `ch` and the wildcard
+        # resolvers into a single regular expression.  Each pattern becomes
+        # a named group and the alternatives are tried in the order of
+        # registration, so the first matching resolver still wins.  Return
+        # the pattern and the tags of the groups, or `None` and the list of
+        # resolvers if they can not be joined.
+        resolvers = []
+        if ch is not None:
+            resolvers.extend(cls.yaml_implicit_resolvers.get(ch, []))
+        resolvers.extend(cls.yaml_implicit_resolvers.get(None, []))
+        if common.PY2 or not resolvers:
+            return None, resolvers
+        alternatives = []
+        tags = {}
+        for index, (tag, regexp) in enumerate(resolvers):
+            pattern = getattr(regexp, 'pattern', None)
+            if not isinstance(pattern, str) or regexp.groups    \
+                    or regexp.flags & re.ASCII  \
+                    or cls.global_flags_regexp.match(pattern):
+                return None, resolvers
+            flags = ''
+            for flag, letter in [(re.I, 'i'), (re.M, 'm'), (re.S, 's'), (re.X, 'x')]:
+                if regexp.flags & flag:
+                    flags += letter
+            if 'x' in flags:
+                # A comment may run up to the end of the pattern.
+                pattern += '\n'
+            if flags:
+                pattern = '(?%s:%s)' % (flags, pattern)
+            name = '_%d' % index
+            alternatives.append('(?P<%s>%s)' % (name, pattern))
+            tags[name] = tag
+        try:
+            combined = re.compile('|'.join(alternatives))
+        except re.error:
+            return None, resolvers
+        return combined, tags
+    compile_implicit_resolvers = classmethod(compile_implicit_resolvers)
+
     def add_path_resolver(cls, tag, path, kind=None):
         # Note: `add_path_resolver` is experimental.  The API could be changed.
         # `new_path` is a pattern that is matched against the path from the
@@ -50,6 +132,22 @@ class BaseResolver(object):
         # against a sequence value with the index equal to `index_check`.
         if not 'yaml_path_resolvers' in cls.__dict__:
             cls.yaml_path_resolvers = cls.yaml_path_resolvers.copy()
+        new_path = cls.normalize_path(path)
+        if kind is str:
+            kind = ScalarNode
+        elif kind is list:
+            kind = SequenceNode
+        elif kind is dict:
+            kind = MappingNode
+        elif kind not in [ScalarNode, SequenceNode, MappingNode]    \
+                and kind is not None:
+            raise ResolverError("Invalid node kind: %s" % kind)
+        cls.yaml_path_resolvers[new_path, kind] = tag
+    add_path_resolver = classmethod(add_path_resolver)
+
+    def normalize_path(cls, path):
+        # Convert the elements of a path to `(node_check, index_check)`
+        # tuples (see `add_path_resolver`).
         new_path = []
         for element in path:
             if isinstance(element, (list, tuple)):
@@ -77,17 +175,8 @@ class BaseResolver(object):
                     and index_check is not None):
                 raise ResolverError("Invalid index checker: %s" % index_check)
             new_path.append((node_check, index_check))
-        if kind is str:
-            kind = ScalarNode
-        elif kind is list:
-            kind = SequenceNode
-        elif kind is dict:
-            kind = MappingNode
-        elif kind not in [ScalarNode, SequenceNode, MappingNode]    \
-                and kind is not None:
-            raise ResolverError("Invalid node kind: %s" % kind)
-        cls.yaml_path_resolvers[tuple(new_path), kind] = tag
-    add_path_resolver = classmethod(add_path_resolver)
+        return tuple(new_path)
+    normalize_path = classmethod(normalize_path)
 
     def descend_resolver(self, current_node, current_index):
         if not self.yaml_path_resolvers:
@@ -141,16 +230,44 @@ class BaseResolver(object):
                 return
         return True
 
+    def resolve_implicit(self, value):
+        # Return the tag of the first implicit resolver matching `value`
+        # or `None`.
+        if value == u'':
+            ch = u''
+        else:
+            ch = value[0]
+        if ch not in self.yaml_implicit_resolvers:
+            ch = None
+        matchers = self.get_implicit_matchers()
+        try:
+            combined, tags = matchers[ch]
+        except KeyError:
+            combined, tags = matchers[ch] = self.compile_implicit_resolvers(ch)
+        if combined is not None:
+            match = combined.match(value)
+            if match is not None:
+                return tags[match.lastgroup]
+        else:
+            for tag, regexp in tags:
+                if regexp.match(value):
+                    return tag
+
     def resolve(self, kind, value, implicit):
         if kind is ScalarNode and implicit[0]:
-            if value == u'':
-                resolvers = self.yaml_implicit_resolvers.get(u'', [])
+            if len(value) > self.IMPLICIT_CACHE_VALUE_LENGTH:
+                tag = self.resolve_implicit(value)
             else:
-                resolvers = self.yaml_implicit_resolvers.get(value[0], [])
-            wildcard_resolvers = self.yaml_implicit_resolvers.get(None, [])
-            for tag, regexp in resolvers + wildcard_resolvers:
-                if regexp.match(value):
-                    return tag
+                cache = self.get_implicit_cache()
+                try:
+                    tag = cache[value]
+                except KeyError:
+                    tag = self.resolve_implicit(value)
+                    if len(cache) >= self.IMPLICIT_CACHE_SIZE:
+                        cache.clear()
+                    cache[value] = tag
+            if tag is not None:
+                return tag
             implicit = implicit[1]
         if self.yaml_path_resolvers:
             exact_paths = self.resolver_exact_paths[-1]
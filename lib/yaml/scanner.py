@@ -30,6 +30,8 @@ from . import common
 from .error import MarkedYAMLError
 from .tokens import *
 
+import re
+
 class ScannerError(MarkedYAMLError):
     pass
 
@@ -56,6 +58,7 @@ class Scanner(object):
         #   self.peek(i=0)       # peek the next i-th character
         #   self.prefix(l=1)     # peek the next l characters
         #   self.forward(l=1)    # read the next l characters and move the pointer.
+        #   self.prefix_match(r) # peek the longest run of characters matching r.
 
         # Had we reached the end of the stream?
         self.done = False
@@ -109,6 +112,16 @@ class Scanner(object):
         # '[', or '{' tokens.
         self.possible_simple_keys = {}
 
+        # The fetcher methods of the scanner class, keyed by the first
+        # character of a token. See `TOKEN_FETCHERS` below. They are taken
+        # from the class, not bound to the scanner, so that the table does
+        # not make a reference cycle with it.
+        self.token_fetchers = {}
+        cls = self.__class__
+        for ch, fetchers in self.TOKEN_FETCHERS.items():
+            self.token_fetchers[ch] = [(check and getattr(cls, check),
+                    getattr(cls, fetch)) for check, fetch in fetchers]
+
     # Public methods.
 
     def check_token(self, *choices):
@@ -166,90 +179,11 @@ class Scanner(object):
         # and decrease the current indentation level.
         self.unwind_indent(self.column)
 
-        # Peek the next character.
+        # Peek the next character and try the fetchers for it.
         ch = self.peek()
-
-        # Is it the end of stream?
-        if ch == u'\0':
-            return self.fetch_stream_end()
-
-        # Is it a directive?
-        if ch == u'%' and self.check_directive():
-            return self.fetch_directive()
-
-        # Is it the document start?
-        if ch == u'-' and self.check_document_start():
-            return self.fetch_document_start()
-
-        # Is it the document end?
-        if ch == u'.' and self.check_document_end():
-            return self.fetch_document_end()
-
-        # TODO: support for BOM within a stream.
-        #if ch == u'\uFEFF':
-        #    return self.fetch_bom()    <-- issue BOMToken
-
-        # Note: the order of the following checks is NOT significant.
-
-        # Is it the flow sequence start indicator?
-        if ch == u'[':
-            return self.fetch_flow_sequence_start()
-
-        # Is it the flow mapping start indicator?
-        if ch == u'{':
-            return self.fetch_flow_mapping_start()
-
-        # Is it the flow sequence end indicator?
-        if ch == u']':
-            return self.fetch_flow_sequence_end()
-
-        # Is it the flow mapping end indicator?
-        if ch == u'}':
-            return self.fetch_flow_mapping_end()
-
-        # Is it the flow entry indicator?
-        if ch == u',':
-            return self.fetch_flow_entry()
-
-        # Is it the block entry indicator?
-        if ch == u'-' and self.check_block_entry():
-            return self.fetch_block_entry()
-
-        # Is it the key indicator?
-        if ch == u'?' and self.check_key():
-            return self.fetch_key()
-
-        # Is it the value indicator?
-        if ch == u':' and self.check_value():
-            return self.fetch_value()
-
-        # Is it an alias?
-        if ch == u'*':
-            return self.fetch_alias()
-
-        # Is it an anchor?
-        if ch == u'&':
-            return self.fetch_anchor()
-
-        # Is it a tag?
-        if ch == u'!':
-            return self.fetch_tag()
-
-        # Is it a literal scalar?
-        if ch == u'|' and not self.flow_level:
-            return self.fetch_literal()
-
-        # Is it a folded scalar?
-        if ch == u'>' and not self.flow_level:
-            return self.fetch_folded()
-
-        # Is it a single quoted scalar?
-        if ch == u'\'':
-            return self.fetch_single()
-
-        # Is it a double quoted scalar?
-        if ch == u'\"':
-            return self.fetch_double()
+        for check, fetch in self.token_fetchers.get(ch, ()):
+            if check is None or check(self):
+                return fetch(self)
 
         # It must be a plain scalar then.
         if self.check_plain():
@@ -260,6 +194,42 @@ class Scanner(object):
                 "found character %r that cannot start any token"
                 % ch.encode('utf-8'), self.get_mark())
 
+    # The fetchers to try for the first character of a token, as pairs of
+    # the names of the check and the fetch methods. A check of `None` always
+    # succeeds. If no fetcher applies, the token must be a plain scalar.
+    TOKEN_FETCHERS = {
+        # Is it the end of stream?
+        u'\0':  [(None, 'fetch_stream_end')],
+        # Is it a directive?
+        u'%':   [('check_directive', 'fetch_directive')],
+        # Is it the document start or the block entry indicator?
+        u'-':   [('check_document_start', 'fetch_document_start'),
+                 ('check_block_entry', 'fetch_block_entry')],
+        # Is it the document end?
+        u'.':   [('check_document_end', 'fetch_document_end')],
+        # TODO: support for BOM within a stream.
+        #u'\uFEFF': [(None, 'fetch_bom')],    <-- issue BOMToken
+        # Is it a flow collection indicator?
+        u'[':   [(None, 'fetch_flow_sequence_start')],
+        u'{':   [(None, 'fetch_flow_mapping_start')],
+        u']':   [(None, 'fetch_flow_sequence_end')],
+        u'}':   [(None, 'fetch_flow_mapping_end')],
+        u',':   [(None, 'fetch_flow_entry')],
+        # Is it the key or the value indicator?
+        u'?':   [('check_key', 'fetch_key')],
+        u':':   [('check_value', 'fetch_value')],
+        # Is it an alias, an anchor or a tag?
+        u'*':   [(None, 'fetch_alias')],
+        u'&':   [(None, 'fetch_anchor')],
+        u'!':   [(None, 'fetch_tag')],
+        # Is it a literal or a folded scalar?
+        u'|':   [('check_block_scalar', 'fetch_literal')],
+        u'>':   [('check_block_scalar', 'fetch_folded')],
+        # Is it a single or a double quoted scalar?
+        u'\'':  [(None, 'fetch_single')],
+        u'\"':  [(None, 'fetch_double')],
+    }
+
     # Simple keys treatment.
 
     def next_possible_simple_key(self):
@@ -729,6 +699,11 @@ class Scanner(object):
         else:
             return self.peek(1) in u'\0 \t\r\n\x85\u2028\u2029'
 
+    def check_block_scalar(self):
+
+        # BLOCK-SCALAR:     ('|'|'>') (block context)
+        return not self.flow_level
+
     def check_plain(self):
 
         # A plain scalar may start with any non-space character except:
@@ -1002,25 +977,41 @@ class Scanner(object):
             breaks, end_mark = self.scan_block_scalar_breaks(indent)
         line_break = u''
 
-        # Scan the inner part of the block scalar.
-        while self.column == indent and self.peek() != u'\0':
+        # Scan the inner part of the block scalar.  The whole region, from
+        # the first line of content to the indentation of the line that
+        # ends the scalar, is matched at once and then split into lines.
+        if self.column == indent and self.peek() != u'\0':
+            region = self.prefix_match(self.get_block_scalar_region(indent))
+            lines = self.LINE_BREAK.split(region)
             chunks.extend(breaks)
-            leading_non_space = self.peek() not in u' \t'
-            length = 0
-            while self.peek(length) not in u'\0\r\n\x85\u2028\u2029':
-                length += 1
-            chunks.append(self.prefix(length))
-            self.forward(length)
-            line_break = self.scan_line_break()
-            breaks, end_mark = self.scan_block_scalar_breaks(indent)
-            if self.column == indent and self.peek() != u'\0':
+            content = lines[0]
+            chunks.append(content)
+            leading_non_space = content[0] not in u' \t'
+            tail = None
+            index = 1
+            while index < len(lines):
+                line_break = lines[index]
+                if line_break not in u'\u2028\u2029':
+                    line_break = u'\n'
+                index += 1
+                breaks = []
+                while index+1 < len(lines) and len(lines[index]) <= indent:
+                    ch = lines[index+1]
+                    if ch not in u'\u2028\u2029':
+                        ch = u'\n'
+                    breaks.append(ch)
+                    index += 2
+                if len(lines[index]) <= indent:
+                    tail = lines[index]
+                    break
+                content = lines[index][indent:]
 
                 # Unfortunately, folding rules are ambiguous.
                 #
                 # This is the folding according to the specification:
 
                 if folded and line_break == u'\n'   \
-                        and leading_non_space and self.peek() not in u' \t':
+                        and leading_non_space and content[0] not in u' \t':
                     if not breaks:
                         chunks.append(u' ')
                 else:
@@ -1031,14 +1022,27 @@ class Scanner(object):
                 #
                 #if folded and line_break == u'\n':
                 #    if not breaks:
-                #        if self.peek() not in ' \t':
+                #        if content[0] not in ' \t':
                 #            chunks.append(u' ')
                 #        else:
                 #            chunks.append(line_break)
                 #else:
                 #    chunks.append(line_break)
+
+                chunks.extend(breaks)
+                chunks.append(content)
+                leading_non_space = content[0] not in u' \t'
+                index += 1
+            if tail is None:
+                # The scalar ends with the stream.
+                self.forward(len(region))
+                line_break = u''
+                breaks = []
+                end_mark = self.get_mark()
             else:
-                break
+                self.forward(len(region)-len(tail))
+                end_mark = self.get_mark()
+                self.forward(len(tail))
 
         # Chomp the tail.
         if chomping is not False:
@@ -1050,6 +1054,34 @@ class Scanner(object):
         return ScalarToken(u''.join(chunks), False, start_mark, end_mark,
                 style)
 
+    LINE_BREAK = re.compile(u'(\r\n|[\r\n\x85\u2028\u2029])')
+
+    # Compiled patterns for the regions of block scalars by indentation.
+    # The cache is cleared when it grows over `BLOCK_SCALAR_REGIONS_SIZE`
+    # patterns, so input with many indentations does not fill it up.
+    BLOCK_SCALAR_REGIONS = {}
+    BLOCK_SCALAR_REGIONS_SIZE = 100
+
+    def get_block_scalar_region(self, indent):
+        # The content of the first line, the following lines that are
+        # either empty or indented by at least `indent` spaces, and the
+        # line breaks and the indentation (up to `indent` spaces) that end
+        # the scalar.
+        regexp = self.BLOCK_SCALAR_REGIONS.get(indent)
+        if regexp is None:
+            regexp = re.compile(
+                    u'[^\0\r\n\x85\u2028\u2029]*'
+                    u'(?:(?:\r\n|[\r\n\x85\u2028\u2029])'
+                    u'(?: {0,%d}(?:\r\n|[\r\n\x85\u2028\u2029]))*'
+                    u' {%d}(?![\0\r\n\x85\u2028\u2029])[^\0\r\n\x85\u2028\u2029]*)*'
+                    u'(?:(?:\r\n|[\r\n\x85\u2028\u2029])'
+                    u'(?: {0,%d}(?:\r\n|[\r\n\x85\u2028\u2029]))*'
+                    u' {0,%d})?' % (indent, indent, indent, indent))
+            if len(self.BLOCK_SCALAR_REGIONS) >= self.BLOCK_SCALAR_REGIONS_SIZE:
+                self.BLOCK_SCALAR_REGIONS.clear()
+            self.BLOCK_SCALAR_REGIONS[indent] = regexp
+        return regexp
+
     def scan_block_scalar_indicators(self, start_mark):
         # See the specification for details.
         chomping = None
@@ -1147,6 +1179,19 @@ class Scanner(object):
         start_mark = self.get_mark()
         quote = self.peek()
         self.forward()
+        # Most quoted scalars fit on a single line and have no escapes; such
+        # a scalar is taken in one slice.  Anything else goes through the
+        # full scanner below.
+        if double:
+            run = self.prefix_match(self.DOUBLE_QUOTED_RUN)
+        else:
+            run = self.prefix_match(self.SINGLE_QUOTED_RUN)
+        length = len(run)
+        if self.peek(length) == quote   \
+                and (double or self.peek(length+1) != u'\''):
+            self.forward(length+1)
+            end_mark = self.get_mark()
+            return ScalarToken(run, False, start_mark, end_mark, style)
         chunks.extend(self.scan_flow_scalar_non_spaces(double, start_mark))
         while self.peek() != quote:
             chunks.extend(self.scan_flow_scalar_spaces(double, start_mark))
@@ -1156,6 +1201,10 @@ class Scanner(object):
         return ScalarToken(u''.join(chunks), False, start_mark, end_mark,
                 style)
 
+    # Quoted scalar text without quotes, escapes and line breaks.
+    SINGLE_QUOTED_RUN = re.compile(u'[^\'\0\r\n\x85\u2028\u2029]*')
+    DOUBLE_QUOTED_RUN = re.compile(u'[^\"\\\\\0\r\n\x85\u2028\u2029]*')
+
     ESCAPE_REPLACEMENTS = {
         u'0':   u'\0',
         u'a':   u'\x07',
@@ -1268,6 +1317,18 @@ class Scanner(object):
             else:
                 return chunks
 
+    # A run of plain scalar characters on a single line: words separated by
+    # spaces, stopping before ' #', ': ' and, in the flow context, before
+    # ',', '?', '[', ']', '{', '}' and ':' followed by any of them.
+    PLAIN_BLOCK_RUN = re.compile(u'(?:(?:[^\0 \t\r\n\x85\u2028\u2029:]'
+            u'|:(?![\0 \t\r\n\x85\u2028\u2029]))+'
+            u'(?: +(?!#)(?:[^\0 \t\r\n\x85\u2028\u2029:]'
+            u'|:(?![\0 \t\r\n\x85\u2028\u2029]))+)*)?')
+    PLAIN_FLOW_RUN = re.compile(u'(?:(?:[^\0 \t\r\n\x85\u2028\u2029:,?\\[\\]{}]'
+            u'|:(?![\0 \t\r\n\x85\u2028\u2029,\\[\\]{}]))+'
+            u'(?: +(?!#)(?:[^\0 \t\r\n\x85\u2028\u2029:,?\\[\\]{}]'
+            u'|:(?![\0 \t\r\n\x85\u2028\u2029,\\[\\]{}]))+)*)?')
+
     def scan_plain(self):
         # See the specification for details.
         # We add an additional restriction for the flow context:
@@ -1283,25 +1344,20 @@ class Scanner(object):
         #if indent == 0:
         #    indent = 1
         spaces = []
+        if self.flow_level:
+            run_regexp = self.PLAIN_FLOW_RUN
+        else:
+            run_regexp = self.PLAIN_BLOCK_RUN
         while True:
-            length = 0
             if self.peek() == u'#':
                 break
-            while True:
-                ch = self.peek(length)
-                if ch in u'\0 \t\r\n\x85\u2028\u2029'   \
-                        or (ch == u':' and
-                                self.peek(length+1) in u'\0 \t\r\n\x85\u2028\u2029'
-                                      + (u',[]{}' if self.flow_level else u''))\
-                        or (self.flow_level and ch in u',?[]{}'):
-                    break
-                length += 1
-            if length == 0:
+            run = self.prefix_match(run_regexp)
+            if not run:
                 break
             self.allow_simple_key = False
             chunks.extend(spaces)
-            chunks.append(self.prefix(length))
-            self.forward(length)
+            chunks.append(run)
+            self.forward(len(run))
             end_mark = self.get_mark()
             spaces = self.scan_plain_spaces(indent, start_mark)
             if not spaces or self.peek() == u'#' \
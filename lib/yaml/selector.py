@@ -0,0 +1,221 @@
+# This module extracts the values at a few paths from the documents of
+# a stream.  The events of the subtrees that no path may match are dropped
+# without composing them, only the matched nodes are composed and
+# constructed.
+#
+# A path is a string of mapping keys separated by dots and sequence indices
+# in brackets, e.g. 'spec.containers[*].image', where '*' matches any key or
+# index.  A path may also be given as a list of `(node_check, index_check)`
+# elements as accepted by `BaseResolver.add_path_resolver`.  A collection
+# with an anchor is composed as a whole, so that aliases to it resolve, and
+# merge keys are not expanded.
+
+__all__ = ['select']
+
+from . import common
+from .error import *
+from .events import *
+from .nodes import *
+from .loader import SafeLoader
+
+import re
+
+class SelectorError(YAMLError):
+    pass
+
+class Selector(object):
+
+    # A path element: a mapping key, or a sequence index in brackets.
+    ELEMENT = re.compile(u'(\\.)?(?:([^.\\[\\]]+)|\\[(\\*|[0-9]+)\\])')
+
+    def __init__(self, loader, paths):
+        self.loader = loader
+        self.paths = []
+        for path in paths:
+            if isinstance(path, common.string_types):
+                elements = self.parse_path(path)
+            else:
+                path = tuple(path)
+                elements = loader.normalize_path(path)
+            self.paths.append((path, elements))
+
+    def parse_path(self, path):
+        elements = []
+        position = 0
+        while position < len(path):
+            match = self.ELEMENT.match(path, position)
+            if match is not None:
+                dot, key, index = match.groups()
+                # Keys but the first one follow a dot, indices do not.
+                if key is not None and (dot is not None) == (position > 0):
+                    if key == u'*':
+                        key = None
+                    elements.append((MappingNode, key))
+                elif index is not None and dot is None:
+                    if index == u'*':
+                        index = None
+                    else:
+                        index = int(index)
+                    elements.append((SequenceNode, index))
+                else:
+                    match = None
+            if match is None:
+                raise SelectorError("invalid path %r at position %d" % (path, position))
+            position = match.end()
+        return tuple(elements)
+
+    def select_documents(self):
+        # Produce a dictionary of the values found at each path for every
+        # document of the stream.
+        loader = self.loader
+        loader.get_event()
+        while not loader.check_event(StreamEndEvent):
+            loader.get_event()
+            found = {}
+            for path, elements in self.paths:
+                found[path] = []
+            self.select_node(self.paths, 0, found)
+            loader.get_event()
+            loader.anchors = {}
+            yield found
+        loader.get_event()
+
+    def select_node(self, candidates, depth, found):
+        # Find the values of the paths matching the next node up to `depth`.
+        loader = self.loader
+        event = loader.peek_event()
+        complete = False
+        for path, elements in candidates:
+            if len(elements) == depth:
+                complete = True
+        if complete or isinstance(event, AliasEvent)    \
+                or (event.anchor is not None and not isinstance(event, ScalarEvent)):
+            self.select_composed_node(loader.compose_node(None, None),
+                    candidates, depth, found)
+            return
+        if isinstance(event, ScalarEvent):
+            loader.skip_node()
+            return
+        if isinstance(event, SequenceStartEvent):
+            kind = SequenceNode
+            end = SequenceEndEvent
+        else:
+            kind = MappingNode
+            end = MappingEndEvent
+        tag = event.tag
+        if tag is None or tag == u'!':
+            tag = loader.resolve(kind, None, event.implicit)
+        loader.get_event()
+        index = 0
+        if kind is MappingNode:
+            keys, named, other = self.match_mapping(candidates, depth, tag)
+        while not loader.check_event(end):
+            if kind is MappingNode:
+                # Plain keys are matched by their events.
+                event = loader.peek_event()
+                if not keys and isinstance(event, ScalarEvent) and event.anchor is None:
+                    index = loader.get_event()
+                else:
+                    index = loader.compose_node(None, None)
+                    if keys:
+                        self.select_composed_node(index, keys, depth+1, found)
+                matched = other
+                if isinstance(index, (ScalarNode, ScalarEvent)) and index.value in named:
+                    matched = named[index.value]+other
+            else:
+                matched = self.match(candidates, depth, kind, tag, index)
+            if matched:
+                self.select_node(matched, depth+1, found)
+            else:
+                loader.skip_node()
+            if kind is SequenceNode:
+                index += 1
+        loader.get_event()
+
+    def select_composed_node(self, node, candidates, depth, found):
+        # Same as `select_node` for a node that is already composed.
+        data = None
+        constructed = False
+        for path, elements in candidates:
+            if len(elements) == depth:
+                if not constructed:
+                    data = self.loader.construct_document(node)
+                    constructed = True
+                found[path].append(data)
+        if isinstance(node, SequenceNode):
+            for index, item_node in enumerate(node.value):
+                matched = self.match(candidates, depth, SequenceNode, node.tag, index)
+                if matched:
+                    self.select_composed_node(item_node, matched, depth+1, found)
+        elif isinstance(node, MappingNode):
+            for key_node, value_node in node.value:
+                for index, child in [(None, key_node), (key_node, value_node)]:
+                    matched = self.match(candidates, depth, MappingNode, node.tag, index)
+                    if matched:
+                        self.select_composed_node(child, matched, depth+1, found)
+
+    def match_mapping(self, candidates, depth, tag):
+        # Sort out the paths which element at `depth` may match a child of
+        # a mapping: the ones matching its keys, the ones matching the value
+        # of a key by its name, and the ones matching any value.
+        keys = []
+        named = {}
+        other = []
+        for path, elements in candidates:
+            if len(elements) <= depth:
+                continue
+            node_check, index_check = elements[depth]
+            if isinstance(node_check, common.string_types):
+                if tag != node_check:
+                    continue
+            elif node_check is not None and node_check is not MappingNode:
+                continue
+            if index_check is True:
+                keys.append((path, elements))
+            elif isinstance(index_check, common.string_types):
+                named.setdefault(index_check, []).append((path, elements))
+            elif index_check is None or index_check is False:
+                other.append((path, elements))
+        return keys, named, other
+
+    def match(self, candidates, depth, kind, tag, index):
+        # Return the paths which element at `depth` matches a child of
+        # a collection.  Like in `BaseResolver.check_resolver_prefix`, the
+        # index of a key is `None` and the index of a mapping value is its
+        # key node.
+        matched = []
+        for path, elements in candidates:
+            if len(elements) <= depth:
+                continue
+            node_check, index_check = elements[depth]
+            if isinstance(node_check, common.string_types):
+                if tag != node_check:
+                    continue
+            elif node_check is not None and node_check is not kind:
+                continue
+            if index_check is True:
+                if index is not None:
+                    continue
+            elif index is None:
+                continue
+            elif isinstance(index_check, common.string_types):
+                if not (isinstance(index, ScalarNode) and index_check == index.value):
+                    continue
+            elif isinstance(index_check, int) and not isinstance(index_check, bool):
+                if index_check != index:
+                    continue
+            matched.append((path, elements))
+        return matched
+
+def select(stream, paths, Loader=SafeLoader):
+    """
+    Scan all YAML documents in a stream and produce for each of them
+    a dictionary mapping every path to the list of values found at it.
+    Subtrees that no path may match are skipped without constructing them.
+    """
+    loader = Loader(stream)
+    try:
+        for found in Selector(loader, paths).select_documents():
+            yield found
+    finally:
+        loader.dispose()
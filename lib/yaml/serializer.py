@@ -50,8 +50,16 @@ class Serializer(object):
             raise SerializerError("serializer is closed")
         self.emit(DocumentStartEvent(explicit=self.use_explicit_start,
             version=self.use_version, tags=self.use_tags))
-        self.anchor_node(node)
-        self.serialize_node(node, None, None)
+        # Unless the methods walking the node graph are overridden, explicit
+        # stacks are used instead of recursion.
+        cls = self.__class__
+        if cls.anchor_node == Serializer.anchor_node    \
+                and cls.serialize_node == Serializer.serialize_node:
+            self.anchor_nodes(node)
+            self.serialize_nodes(node, None, None)
+        else:
+            self.anchor_node(node)
+            self.serialize_node(node, None, None)
         self.emit(DocumentEndEvent(explicit=self.use_explicit_end))
         self.serialized_nodes = {}
         self.anchors = {}
@@ -71,6 +79,30 @@ class Serializer(object):
                     self.anchor_node(key)
                     self.anchor_node(value)
 
+    def anchor_nodes(self, node):
+        # Same as `anchor_node` without recursion.  The stack holds iterators
+        # over the children of the collections being visited.
+        stack = [iter([node])]
+        while stack:
+            for node in stack[-1]:
+                if node in self.anchors:
+                    if self.anchors[node] is None:
+                        self.anchors[node] = self.generate_anchor(node)
+                else:
+                    self.anchors[node] = None
+                    if isinstance(node, SequenceNode):
+                        stack.append(iter(node.value))
+                        break
+                    elif isinstance(node, MappingNode):
+                        children = []
+                        for key, value in node.value:
+                            children.append(key)
+                            children.append(value)
+                        stack.append(iter(children))
+                        break
+            else:
+                stack.pop()
+
     def generate_anchor(self, node):
         self.last_anchor_id += 1
         return self.ANCHOR_TEMPLATE % self.last_anchor_id
@@ -109,3 +141,51 @@ class Serializer(object):
                 self.emit(MappingEndEvent())
             self.ascend_resolver()
 
+    def serialize_nodes(self, node, parent, index):
+        # Same as `serialize_node` without recursion.  The stack holds
+        # iterators over the children of the collections being serialized
+        # along with the events closing them.
+        stack = [(iter([(node, parent, index)]), None)]
+        while stack:
+            for node, parent, index in stack[-1][0]:
+                alias = self.anchors[node]
+                if node in self.serialized_nodes:
+                    self.emit(AliasEvent(alias))
+                    continue
+                self.serialized_nodes[node] = True
+                self.descend_resolver(parent, index)
+                if isinstance(node, ScalarNode):
+                    detected_tag = self.resolve(ScalarNode, node.value, (True, False))
+                    default_tag = self.resolve(ScalarNode, node.value, (False, True))
+                    implicit = (node.tag == detected_tag), (node.tag == default_tag)
+                    self.emit(ScalarEvent(alias, node.tag, implicit, node.value,
+                        style=node.style))
+                elif isinstance(node, SequenceNode):
+                    implicit = (node.tag
+                                == self.resolve(SequenceNode, node.value, True))
+                    self.emit(SequenceStartEvent(alias, node.tag, implicit,
+                        flow_style=node.flow_style))
+                    children = []
+                    index = 0
+                    for item in node.value:
+                        children.append((item, node, index))
+                        index += 1
+                    stack.append((iter(children), SequenceEndEvent))
+                    break
+                elif isinstance(node, MappingNode):
+                    implicit = (node.tag
+                                == self.resolve(MappingNode, node.value, True))
+                    self.emit(MappingStartEvent(alias, node.tag, implicit,
+                        flow_style=node.flow_style))
+                    children = []
+                    for key, value in node.value:
+                        children.append((key, node, None))
+                        children.append((value, node, key))
+                    stack.append((iter(children), MappingEndEvent))
+                    break
+                self.ascend_resolver()
+            else:
+                end_event = stack.pop()[1]
+                if end_event is not None:
+                    self.emit(end_event())
+                    self.ascend_resolver()
@@ -0,0 +1,143 @@
+# This module splits a YAML stream into chunks of whole documents without
+# scanning the content of the documents.
+#
+# A document ends where the next one starts with a '---' marker at the
+# beginning of a line.  The directives of the next document start after an
+# explicit '...' marker or at the beginning of the stream, so '%' lines
+# found elsewhere are not directives and the stream is not split after
+# them.  Block scalars are indented, so their content never starts with a
+# marker.  A chunk may contain several documents, and every chunk but the
+# first one starts with the directives or the '---' marker of a document.
+
+__all__ = ['DocumentSplitter']
+
+from .reader import Reader
+
+import re
+
+class DocumentSplitter(object):
+
+    # The size of the chunks, in characters.
+    CHUNK_SIZE = 1024*1024
+
+    # A document marker or a directive at the beginning of a line.
+    MARKER = re.compile(u'(?<![^\r\n\x85\u2028\u2029\uFEFF])'
+            u'(?:(---|\\.\\.\\.)(?=[\0 \t\r\n\x85\u2028\u2029])|%)')
+
+    # The end of a line.
+    BREAK = re.compile(u'\r\n|[\0\r\n\x85\u2028\u2029]')
+
+    # Blank lines and comments.
+    BLANK = re.compile(u'\uFEFF?(?:[ \t]*(?:#[^\0\r\n\x85\u2028\u2029]*)?'
+            u'(?:\r\n|[\r\n\x85\u2028\u2029]))*\\Z')
+
+    def __init__(self, stream, size=None):
+        self.reader = Reader(stream)
+        self.name = self.reader.name
+        if size is None:
+            size = self.CHUNK_SIZE
+        self.size = size
+        # The number of documents started so far.
+        self.documents = 0
+
+    def __iter__(self):
+        # Produce the chunks as tuples of the text, the index of its first
+        # character, the line it starts on and the number of its first
+        # document.
+        reader = self.reader
+        # The positions below are relative to the current chunk: the
+        # position to continue the search for markers from, the position
+        # where the text before a directive starts (if a directive may
+        # follow), and the position of the first pending directive.
+        scan = 0
+        clean = 0
+        directives = None
+        misplaced = False
+        # Whether the text before the first marker has been checked for an
+        # implicit document, and the number of the first document of the
+        # current chunk.
+        started = False
+        first = 0
+        reader.peek()
+        while True:
+            buffer = reader.buffer
+            base = reader.pointer
+            eof = reader.raw_buffer is None
+            if eof:
+                limit = len(buffer)-1
+            else:
+                limit = len(buffer)-4
+            cut = None
+            for match in self.MARKER.finditer(buffer, base+scan):
+                position = match.start()
+                if position >= limit:
+                    break
+                if position > base and buffer[position-1] == u'\uFEFF'   \
+                        and reader.index+position-base != 1:
+                    # Only the BOM at the beginning of the stream may
+                    # precede a marker.
+                    continue
+                if not started:
+                    self.start_implicit_document(buffer, base, position)
+                    started = True
+                marker = match.group(1)
+                if marker == u'---':
+                    if directives is not None:
+                        if self.BLANK.match(buffer, base+clean, position):
+                            cut = directives
+                    elif not misplaced:
+                        cut = position-base
+                    clean = None
+                    directives = None
+                    misplaced = False
+                    if cut is not None and cut < max(self.size, 1):
+                        cut = None
+                    self.documents += 1
+                    if cut is not None:
+                        following = self.documents-1
+                        scan = match.end()-base
+                        break
+                    continue
+                end = self.BREAK.search(buffer, match.end())
+                if end is None or (not eof and end.end() >= limit):
+                    break
+                if marker == u'...':
+                    clean = end.end()-base
+                    directives = None
+                    misplaced = False
+                elif clean is not None and self.BLANK.match(buffer, base+clean, position):
+                    if directives is None:
+                        directives = position-base
+                    clean = end.end()-base
+                else:
+                    clean = None
+                    directives = None
+                    misplaced = True
+            else:
+                position = limit
+            if cut is not None:
+                chunk = buffer[base:base+cut]
+                yield chunk, reader.index, reader.line, first
+                first = following
+                reader.forward(cut)
+                scan -= cut
+                if clean is not None:
+                    clean -= cut
+                if directives is not None:
+                    directives -= cut
+            elif eof:
+                if not started:
+                    self.start_implicit_document(buffer, base, limit)
+                if limit > base:
+                    yield buffer[base:limit], reader.index, reader.line, first
+                return
+            else:
+                scan = max(position-base, scan)
+                reader.update(len(buffer)-base+reader.READ_SIZE)
+
+    def start_implicit_document(self, buffer, start, end):
+        # The stream starts with a document without the '---' marker unless
+        # the text before the first marker is blank.
+        if not self.BLANK.match(buffer, start, end):
+            self.documents += 1
+
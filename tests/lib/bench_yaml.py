@@ -0,0 +1,402 @@
+# Benchmarks for the pure-Python and LibYAML based components.
+#
+# They are not run by the test suite.  Run them with
+#
+#   PYTHONPATH=lib:tests/lib python tests/lib/bench_yaml.py [name [arguments]]
+#
+# where `name` is the name of a `bench_*` function without the prefix.
+# Without arguments every benchmark is run with its default parameters.
+
+import yaml, yaml.common
+
+import sys, os, tempfile, time
+
+MEGABYTE = 1024*1024
+
+def _timeit(function, repeat=1):
+    best = None
+    for k in range(repeat):
+        start = time.time()
+        function()
+        elapsed = time.time()-start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def _report(title, size, elapsed):
+    print("%-40s %10.3fs %10.2f MB/s" % (title, elapsed, size/(elapsed*MEGABYTE)))
+
+def _generate(size):
+    # Produce a document of roughly `size` bytes resembling a list of
+    # configuration records.
+    record = (u"- name: item-%08d\n"
+              u"  enabled: true\n"
+              u"  ratio: 0.125\n"
+              u"  tags: [alpha, beta, gamma]\n"
+              u"  description: >\n"
+              u"    Lorem ipsum dolor sit amet, consectetur adipiscing elit,\n"
+              u"    sed do eiusmod tempor incididunt ut labore.\n")
+    chunks = []
+    total = 0
+    index = 0
+    while total < size:
+        chunk = record % index
+        chunks.append(chunk)
+        total += len(chunk)
+        index += 1
+    return u''.join(chunks)
+
+def _consume(reader, step=80):
+    # Walk through the whole input the way the scanner does.
+    while True:
+        chunk = reader.prefix(step)
+        end = chunk.find(u'\0')
+        if end != -1:
+            reader.forward(end)
+            break
+        reader.forward(len(chunk))
+
+def bench_reader(*sizes):
+    """Reader throughput for file and string input (sizes in MB)."""
+    sizes = [int(size) for size in sizes] or [1, 100]
+    for size in sizes:
+        data = _generate(size*MEGABYTE)
+        handle, filename = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            with open(filename, 'wb') as file:
+                file.write(data.encode('utf-8'))
+            length = len(data)
+            elapsed = _timeit(lambda: _consume(yaml.reader.Reader(data)))
+            _report("reader: %d MB string" % size, length, elapsed)
+            def consume_file():
+                with open(filename, 'rb') as file:
+                    _consume(yaml.reader.Reader(file))
+            elapsed = _timeit(consume_file)
+            _report("reader: %d MB file" % size, length, elapsed)
+        finally:
+            os.unlink(filename)
+
+def _data_files(extensions=('.data', '.canonical')):
+    # The valid documents of the test suite.
+    directory = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+            os.pardir, 'data')
+    contents = []
+    for filename in sorted(os.listdir(directory)):
+        base, ext = os.path.splitext(filename)
+        if ext in extensions and not os.path.exists(os.path.join(directory, base+'.skip-ext'))    \
+                and not os.path.exists(os.path.join(directory, base+'.loader-error')):
+            with open(os.path.join(directory, filename), 'rb') as file:
+                contents.append(file.read())
+    return contents
+
+def bench_scan(size=1, repeat=3):
+    """Token throughput of yaml.scan (size of the generated input in MB)."""
+    data = _generate(float(size)*MEGABYTE)
+    tokens = []
+    def scan():
+        tokens[:] = [len(list(yaml.scan(data, Loader=yaml.loader.BaseLoader)))]
+    elapsed = _timeit(scan, int(repeat))
+    _report("scan: generated records", len(data), elapsed)
+    print("%-40s %10d tokens %10.0f tokens/s" % ("", tokens[0], tokens[0]/elapsed))
+    encoded = data.encode('utf-8')
+    def scan_stream():
+        tokens[:] = [len(list(yaml.scan(yaml.common.BytesIO(encoded),
+                Loader=yaml.loader.BaseLoader)))]
+    elapsed = _timeit(scan_stream, int(repeat))
+    _report("scan: generated records, stream", len(data), elapsed)
+    # A single scalar spanning the whole input is refilled from the
+    # stream many times while it is matched.
+    length = int(float(size)*MEGABYTE)
+    for title, scalar in [("plain", b"a"*length+b"\n"),
+            ("single-quoted", b"'"+b"a"*length+b"'\n"),
+            ("double-quoted", b'"'+b"a"*length+b'"\n'),
+            ("literal block", b"|\n"+(b"  "+b"a"*76+b"\n")*(length//79))]:
+        elapsed = _timeit(lambda: list(yaml.scan(yaml.common.BytesIO(scalar),
+                Loader=yaml.loader.BaseLoader)), int(repeat))
+        _report("scan: long %s scalar, stream" % title, len(scalar), elapsed)
+    corpus = []
+    for content in _data_files():
+        try:
+            list(yaml.scan(content, Loader=yaml.loader.BaseLoader))
+        except yaml.YAMLError:
+            continue
+        corpus.append(content)
+    def scan_corpus():
+        count = 0
+        for content in corpus:
+            count += len(list(yaml.scan(content, Loader=yaml.loader.BaseLoader)))
+        tokens[:] = [count]
+    elapsed = _timeit(scan_corpus, int(repeat))
+    _report("scan: tests/data corpus", sum(len(content) for content in corpus), elapsed)
+    print("%-40s %10d tokens %10.0f tokens/s" % ("", tokens[0], tokens[0]/elapsed))
+
+def _without_slots(function):
+    # Call `function` while the reader, the scanner, the parser and the
+    # composer create tokens, events, nodes and marks of copies of their
+    # classes that have no __slots__, as they were before.
+    modules = [yaml.reader, yaml.scanner, yaml.parser, yaml.composer]
+    bases = (yaml.tokens.Token, yaml.events.Event, yaml.nodes.Node, yaml.error.Mark)
+    classes = {object: object}
+    def copy_class(cls):
+        if cls not in classes:
+            slots = cls.__dict__.get('__slots__', ())
+            namespace = dict((key, value) for key, value in vars(cls).items()
+                    if key not in slots and key not in ('__slots__', '__dict__', '__weakref__'))
+            classes[cls] = type(cls.__name__,
+                    tuple(copy_class(base) for base in cls.__bases__), namespace)
+        return classes[cls]
+    replaced = []
+    for module in modules:
+        for name, value in list(vars(module).items()):
+            if isinstance(value, type) and issubclass(value, bases):
+                replaced.append((module, name, value))
+                setattr(module, name, copy_class(value))
+    try:
+        return function()
+    finally:
+        for module, name, value in replaced:
+            setattr(module, name, value)
+
+def bench_compose(size=10):
+    """Memory held by the node tree of yaml.compose with and without __slots__ (input size in MB)."""
+    try:
+        import tracemalloc
+    except ImportError:
+        print("compose: tracemalloc is not available")
+        return
+    data = _generate(float(size)*MEGABYTE)
+    encoded = data.encode('utf-8')
+    for title, stream in [("string", data), ("file", encoded)]:
+        for kind, call in [("without slots", _without_slots), ("slots", lambda function: function())]:
+            if isinstance(stream, bytes):
+                source = yaml.common.BytesIO(stream)
+            else:
+                source = stream
+            tracemalloc.start()
+            start = time.time()
+            node = call(lambda: yaml.compose(source, Loader=yaml.loader.SafeLoader))
+            elapsed = time.time()-start
+            memory, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            _report("compose: %s, %s" % (title, kind), len(data), elapsed)
+            print("%-40s %10.1f MB held %7.1f MB peak %6.1fx input"
+                    % ("", memory/float(MEGABYTE), peak/float(MEGABYTE), memory/float(len(data))))
+            del node
+
+def bench_load(size=10, repeat=3):
+    """Time and peak memory of yaml.load with SafeLoader and CSafeLoader (input size in MB)."""
+    data = _generate(float(size)*MEGABYTE)
+    loaders = [("events", yaml.loader.SafeLoader)]
+    if yaml.__with_libyaml__:
+        loaders.append(("libyaml events", yaml.cyaml.CSafeLoader))
+    for title, base in loaders[:]:
+        class NodeLoader(base):
+            # Forces the construction through the node tree.
+            def construct_document(self, node, base=base):
+                return base.construct_document(self, node)
+        loaders.append((title.replace("events", "nodes"), NodeLoader))
+    for title, loader in loaders:
+        elapsed = _timeit(lambda: yaml.load(data, Loader=loader), int(repeat))
+        _report("load: %s" % title, len(data), elapsed)
+        try:
+            import tracemalloc
+        except ImportError:
+            continue
+        tracemalloc.start()
+        yaml.load(data, Loader=loader)
+        memory, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("%-40s %10.1f MB peak" % ("", peak/float(MEGABYTE)))
+
+def bench_dump(size=10, repeat=3):
+    """Time of yaml.dump with SafeDumper and CSafeDumper (input size in MB)."""
+    data = yaml.load(_generate(float(size)*MEGABYTE), Loader=yaml.loader.SafeLoader)
+    dumpers = [("objects", yaml.dumper.SafeDumper)]
+    if yaml.__with_libyaml__:
+        dumpers.append(("libyaml objects", yaml.cyaml.CSafeDumper))
+        class NodeDumper(yaml.cyaml.CSafeDumper):
+            # Forces the representation through the node tree.
+            def represent_data(self, data):
+                return yaml.cyaml.CSafeDumper.represent_data(self, data)
+        dumpers.append(("libyaml nodes", NodeDumper))
+    for title, dumper in dumpers:
+        output = []
+        def dump():
+            output[:] = [yaml.dump(data, Dumper=dumper)]
+        elapsed = _timeit(dump, int(repeat))
+        _report("dump: %s" % title, len(output[0]), elapsed)
+
+def bench_lazy(size=10, repeat=3):
+    """Time of loading a document and reading one record with LazyLoader (input size in MB)."""
+    import hashlib
+    data = _generate(float(size)*MEGABYTE)
+    # Records with a value of an expensive custom constructor, the case
+    # where constructing only the children that are read pays off.
+    record = u"- name: item-%08d\n  key: !digest secret-%08d\n"
+    count = int(float(size)*MEGABYTE/len(record % (0, 0))/20)
+    digests = u"".join(record % (index, index) for index in range(count))
+    def construct_digest(loader, node):
+        value = loader.construct_scalar(node).encode('utf-8')
+        return hashlib.pbkdf2_hmac('sha256', value, b'salt', 1000)
+    loaders = [("safe", yaml.loader.SafeLoader), ("lazy", yaml.loader.LazyLoader)]
+    if yaml.__with_libyaml__:
+        loaders.append(("libyaml safe", yaml.cyaml.CSafeLoader))
+        loaders.append(("libyaml lazy", yaml.cyaml.CLazyLoader))
+    for title, base in loaders:
+        elapsed = _timeit(lambda: yaml.load(data, Loader=base)[100]['name'], int(repeat))
+        _report("lazy: %s" % title, len(data), elapsed)
+        class DigestLoader(base):
+            pass
+        DigestLoader.add_constructor(u'!digest', construct_digest)
+        elapsed = _timeit(lambda: yaml.load(digests, Loader=DigestLoader)[100]['name'],
+                int(repeat))
+        _report("lazy: %s, expensive values" % title, len(digests), elapsed)
+
+def bench_select(size=10, repeat=3):
+    """Time of yaml.select picking a field of the records against yaml.load (input size in MB)."""
+    data = _generate(float(size)*MEGABYTE)
+    loaders = [("", yaml.loader.SafeLoader)]
+    if yaml.__with_libyaml__:
+        loaders.append(("libyaml ", yaml.cyaml.CSafeLoader))
+    for title, loader in loaders:
+        elapsed = _timeit(lambda: yaml.load(data, Loader=loader), int(repeat))
+        _report("select: %sload" % title, len(data), elapsed)
+        for path in ['[0].name', '[*].name']:
+            elapsed = _timeit(lambda: list(yaml.select(data, [path], Loader=loader)),
+                    int(repeat))
+            _report("select: %s%s" % (title, path), len(data), elapsed)
+
+def bench_handler(size=10, repeat=3):
+    """Time of counting the scalars with yaml.parse and yaml.handle_events (input size in MB)."""
+    data = _generate(float(size)*MEGABYTE)
+    class Counter(yaml.EventHandler):
+        count = 0
+        def scalar(self, value, tag, anchor, style, implicit):
+            self.count += 1
+    loaders = [("", yaml.loader.SafeLoader)]
+    if yaml.__with_libyaml__:
+        loaders.append(("libyaml ", yaml.cyaml.CSafeLoader))
+    for title, loader in loaders:
+        def parse():
+            count = 0
+            for event in yaml.parse(data, Loader=loader):
+                if isinstance(event, yaml.ScalarEvent):
+                    count += 1
+        elapsed = _timeit(parse, int(repeat))
+        _report("handler: %sparse" % title, len(data), elapsed)
+        elapsed = _timeit(lambda: yaml.handle_events(data, Counter(), Loader=loader), int(repeat))
+        _report("handler: %shandle_events" % title, len(data), elapsed)
+
+def bench_multi_constructors(count=50, size=1, repeat=3):
+    """Time of loading tagged scalars with many multi-constructor prefixes (input size in MB)."""
+    count = int(count)
+    line = u"- !ns/%d/item value\n" % (count-1)
+    data = line*int(float(size)*MEGABYTE/len(line))
+    def construct_item(loader, suffix, node):
+        return loader.construct_scalar(node)
+    bases = [("", yaml.loader.SafeLoader)]
+    if yaml.__with_libyaml__:
+        bases.append(("libyaml ", yaml.cyaml.CSafeLoader))
+    for title, base in bases:
+        class CachedLoader(base):
+            pass
+        class ScanningLoader(CachedLoader):
+            # Looks up the prefixes the way it is done without the cache.
+            def get_multi_constructor(cls, tag):
+                for tag_prefix in cls.yaml_multi_constructors:
+                    if tag_prefix is not None and tag.startswith(tag_prefix):
+                        return cls.yaml_multi_constructors[tag_prefix], tag[len(tag_prefix):]
+                return None, None
+            get_multi_constructor = classmethod(get_multi_constructor)
+        for index in range(count):
+            CachedLoader.add_multi_constructor(u"!ns/%d/" % index, construct_item)
+        for name, loader in [("scan", ScanningLoader), ("cache", CachedLoader)]:
+            elapsed = _timeit(lambda: yaml.load(data, Loader=loader), int(repeat))
+            _report("multi constructors: %s%d, %s" % (title, count, name), len(data), elapsed)
+
+def bench_merge(keys=500, count=2000, repeat=3):
+    """Time of loading mappings merging the same anchored mapping (its keys, the mappings)."""
+    keys = int(keys)
+    count = int(count)
+    data = u"defaults: &defaults\n%sitems:\n%s" % (
+            u"".join(u"  key%d: value%d\n" % (index, index) for index in range(keys)),
+            u"".join(u"- {<<: *defaults, name: item%d}\n" % index for index in range(count)))
+    loaders = [("", yaml.loader.SafeLoader)]
+    if yaml.__with_libyaml__:
+        loaders.append(("libyaml ", yaml.cyaml.CSafeLoader))
+    for title, loader in loaders:
+        elapsed = _timeit(lambda: yaml.load(data, Loader=loader), int(repeat))
+        _report("merge: %s%d keys, %d mappings" % (title, keys, count), len(data), elapsed)
+
+def bench_numbers(size=1, repeat=3):
+    """Time of loading rows of decimal integers and floats (input size in MB)."""
+    import re
+    line = u"- [1234567, -42, 0, 3.25, -0.0078125, 6.02e+23, 17, -987654321]\n"
+    data = line*int(float(size)*MEGABYTE/len(line))
+    class GeneralLoader(yaml.loader.SafeLoader):
+        # Converts every number with the general routines.
+        decimal_int_regexp = decimal_float_regexp = re.compile(u'(?!)')
+    loaders = [("general", GeneralLoader), ("decimal", yaml.loader.SafeLoader)]
+    if yaml.__with_libyaml__:
+        loaders.append(("libyaml decimal", yaml.cyaml.CSafeLoader))
+    for title, loader in loaders:
+        elapsed = _timeit(lambda: yaml.load(data, Loader=loader), int(repeat))
+        _report("numbers: %s" % title, len(data), elapsed)
+
+def bench_timestamps(size=1, repeat=3):
+    """Time of loading records with ISO 8601 timestamps (input size in MB)."""
+    import re
+    line = u"- {at: 2021-03-04T05:06:07.123456+02:00, seen: 2021-03-04T05:06:07Z}\n"
+    data = line*int(float(size)*MEGABYTE/len(line))
+    bases = [("", yaml.loader.SafeLoader)]
+    if yaml.__with_libyaml__:
+        bases.append(("libyaml ", yaml.cyaml.CSafeLoader))
+    for title, base in bases:
+        class GeneralLoader(base):
+            # Converts every timestamp with the general routine.
+            iso_timestamp_regexp = re.compile(u'(?!)')
+        for name, loader in [("general", GeneralLoader), ("iso", base)]:
+            elapsed = _timeit(lambda: yaml.load(data, Loader=loader), int(repeat))
+            _report("timestamps: %s%s" % (title, name), len(data), elapsed)
+
+def bench_binary(size=50, repeat=1):
+    """Time and peak memory of loading a large !!binary scalar (decoded size in MB)."""
+    import base64
+    payload = os.urandom(int(float(size)*MEGABYTE))
+    data = b"!!binary |\n" + b"".join(b"  "+line+b"\n"
+            for line in base64.encodebytes(payload).splitlines())
+    bases = [("", yaml.loader.SafeLoader)]
+    if yaml.__with_libyaml__:
+        bases.append(("libyaml ", yaml.cyaml.CSafeLoader))
+    for title, base in bases:
+        class WholeLoader(base):
+            # Decodes the scalar at once.
+            binary_chunk_size = len(data)
+        for name, loader in [("whole", WholeLoader), ("chunks", base)]:
+            elapsed = _timeit(lambda: yaml.load(data, Loader=loader), int(repeat))
+            _report("binary: %s%s" % (title, name), len(payload), elapsed)
+            try:
+                import tracemalloc
+            except ImportError:
+                continue
+            tracemalloc.start()
+            yaml.load(data, Loader=loader)
+            memory, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print("%-40s %10.1f MB peak %6.1fx decoded"
+                    % ("", peak/float(MEGABYTE), peak/float(len(payload))))
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if args:
+        names = [args.pop(0)]
+    else:
+        names = sorted(name[6:] for name in globals() if name.startswith('bench_'))
+    for name in names:
+        globals()['bench_'+name](*args)
+
+if __name__ == '__main__':
+    main()
+
@@ -1,5 +1,5 @@
 import yaml
-import pprint
+import pprint, sys
 
 import datetime
 try:
@@ -302,6 +302,294 @@ def test_constructor_types(data_filename, code_filename, verbose=False):
 
 test_constructor_types.unittest = ['.data', '.code']
 
+def test_direct_construction(data_filename, code_filename, verbose=False):
+    _make_objects()
+    class MyNodeLoader(MyLoader):
+        def construct_document(self, node):
+            return MyLoader.construct_document(self, node)
+    assert not MyNodeLoader(u'').check_direct_construction()
+    native1 = None
+    native2 = None
+    try:
+        with open(data_filename, 'rb') as file:
+            data = file.read()
+        native1 = list(yaml.load_all(data, Loader=MyLoader))
+        native2 = list(yaml.load_all(data, Loader=MyNodeLoader))
+        if len(native1) == 1:
+            native1 = yaml.load(data, Loader=MyLoader)
+            native2 = native2[0]
+        try:
+            if native1 == native2:
+                return
+        except TypeError:
+            pass
+        assert _serialize_value(native1) == _serialize_value(native2), (native1, native2)
+    finally:
+        if verbose:
+            print("NATIVE1:")
+            pprint.pprint(native1)
+            print("NATIVE2:")
+            pprint.pprint(native2)
+
+test_direct_construction.unittest = ['.data', '.code']
+
+def _make_override_loaders(base):
+    class NoneFreeLoader(base):
+        def construct_sequence(self, node, deep=False):
+            return [item for item in base.construct_sequence(self, node, deep=deep)
+                    if item is not None]
+    class DropLoader(base):
+        def flatten_mapping(self, node):
+            base.flatten_mapping(self, node)
+            node.value = [(key_node, value_node) for key_node, value_node in node.value
+                    if getattr(key_node, 'value', None) != u'drop']
+    class StripLoader(base):
+        def construct_scalar(self, node):
+            return base.construct_scalar(self, node).strip()
+    return [
+        (NoneFreeLoader, u"[1, ~, 2, [~, 3]]", [1, 2, [3]]),
+        (DropLoader, u"{a: 1, drop: 2, b: {drop: 3, c: 4}}", {'a': 1, 'b': {'c': 4}}),
+        (StripLoader, u"- '  a  '\n", ['a']),
+    ]
+
+def test_direct_construction_overrides(verbose=False):
+    cases = _make_override_loaders(yaml.loader.SafeLoader)
+    if yaml.__with_libyaml__:
+        cases.extend(_make_override_loaders(yaml.cyaml.CSafeLoader))
+    for loader, data, value in cases:
+        assert not loader(u'').check_direct_construction(), loader
+        result = yaml.load(data, Loader=loader)
+        if verbose:
+            print(loader.__name__, result)
+        assert result == value, (loader, result, value)
+
+test_direct_construction_overrides.unittest = []
+
+def test_lazy_construction(data_filename, code_filename, verbose=False):
+    native1 = None
+    native2 = None
+    try:
+        with open(data_filename, 'rb') as file:
+            data = file.read()
+        try:
+            native1 = list(yaml.load_all(data, Loader=yaml.SafeLoader))
+        except yaml.YAMLError:
+            return
+        lazy = list(yaml.load_all(data, Loader=yaml.LazyLoader))
+        native2 = [yaml.constructor.materialize(document) for document in lazy]
+        for value in native2:
+            assert not isinstance(value, (yaml.constructor.LazyMapping, yaml.constructor.LazySequence)), value
+        try:
+            if native1 == native2 and native1 == lazy:
+                return
+        except TypeError:
+            pass
+        assert _serialize_value(native1) == _serialize_value(native2), (native1, native2)
+    finally:
+        if verbose:
+            print("NATIVE1:")
+            pprint.pprint(native1)
+            print("NATIVE2:")
+            pprint.pprint(native2)
+
+test_lazy_construction.unittest = ['.data', '.code']
+
+def test_lazy_collections(verbose=False):
+    data = yaml.load(u"base: &base {name: base, size: 1}\n"
+            u"items: &items [a, !!omap bad, [1, 2], *base]\n"
+            u"merged: {<<: *base, size: 2}\n"
+            u"again: *items\n"
+            u"recursive: &recursive [*recursive]\n", Loader=yaml.LazyLoader)
+    assert isinstance(data, yaml.constructor.LazyMapping), data
+    assert len(data) == 5 and sorted(data) == ['again', 'base', 'items', 'merged', 'recursive']
+    items = data['items']
+    assert isinstance(items, yaml.constructor.LazySequence) and len(items) == 4, items
+    assert items is data['again']
+    assert items[0] == 'a' and items[-2] == [1, 2] and items[2:] == [[1, 2], {'name': 'base', 'size': 1}]
+    assert items[3] is data['base']
+    for index in [4, -5]:
+        try:
+            items[index]
+        except IndexError:
+            pass
+        else:
+            raise AssertionError("expected an exception for %d" % index)
+    try:
+        items[1]
+    except yaml.constructor.ConstructorError as exc:
+        if verbose:
+            print(exc)
+    else:
+        raise AssertionError("expected an exception")
+    assert data['merged'] == {'name': 'base', 'size': 2}, data['merged']
+    recursive = data['recursive']
+    assert recursive[0] is recursive
+    plain = data['merged'].materialize()
+    assert type(plain) is dict and plain == {'name': 'base', 'size': 2}, plain
+    plain = recursive.materialize()
+    assert type(plain) is list and plain[0] is plain, plain
+    try:
+        data.materialize()
+    except yaml.constructor.ConstructorError as exc:
+        if verbose:
+            print(exc)
+    else:
+        raise AssertionError("expected an exception")
+
+test_lazy_collections.unittest = []
+
+def test_merge_sharing(verbose=False):
+    data = (u"base: &base {a: 1, b: [x], c: 3}\n"
+            u"extra: &extra {c: 4, d: 5, <<: *base}\n"
+            u"items:\n"
+            u"- {<<: *base, a: 2}\n"
+            u"- {<<: [*extra, *base], e: 6}\n"
+            u"- {<<: *extra, <<: {d: 7}, f: !!str 8}\n"
+            u"- {a: 9, <<: *base}\n")
+    class NodeLoader(yaml.SafeLoader):
+        # Constructs the merged mappings from the flattened nodes.
+        def construct_document(self, node):
+            return yaml.SafeLoader.construct_document(self, node)
+    expected = {
+        'base': {'a': 1, 'b': ['x'], 'c': 3},
+        'extra': {'a': 1, 'b': ['x'], 'c': 4, 'd': 5},
+        'items': [
+            {'a': 2, 'b': ['x'], 'c': 3},
+            {'a': 1, 'b': ['x'], 'c': 4, 'd': 5, 'e': 6},
+            {'a': 1, 'b': ['x'], 'c': 4, 'd': 7, 'f': '8'},
+            {'a': 9, 'b': ['x'], 'c': 3},
+        ],
+    }
+    for loader in [yaml.SafeLoader, NodeLoader]:
+        value = yaml.load(data, Loader=loader)
+        if verbose:
+            print(value)
+        assert value == expected, (loader, value)
+        if sys.version_info >= (3, 7):
+            assert list(value['items'][1]) == ['a', 'b', 'c', 'd', 'e'], value
+        # The merged values are shared like the values of aliases.
+        for item in value['items']:
+            assert item['b'] is value['base']['b'], value
+    try:
+        yaml.load(u"- &a [x]\n- {<<: [*a]}\n", Loader=yaml.SafeLoader)
+    except yaml.constructor.ConstructorError as exc:
+        if verbose:
+            print(exc)
+    else:
+        raise AssertionError("expected an exception")
+
+test_merge_sharing.unittest = []
+
+def test_recursive_merge(verbose=False):
+    class NodeLoader(yaml.SafeLoader):
+        # Constructs the merged mappings from the flattened nodes.
+        def construct_document(self, node):
+            return yaml.SafeLoader.construct_document(self, node)
+    loaders = [yaml.SafeLoader, NodeLoader]
+    if yaml.__with_libyaml__:
+        loaders.append(yaml.cyaml.CSafeLoader)
+    for data, expected in [
+            (u"&a {x: 1, <<: *a}", {'x': 1}),
+            (u"&a [ {<<: *a} ]", [{}]),
+            (u"- &a {x: 1}\n- &b {<<: [*a, *b]}\n", [{'x': 1}, {'x': 1}]),
+            (u"&a {x: 1, <<: [&b {y: 2, <<: *a}]}", {'x': 1, 'y': 2})]:
+        for loader in loaders:
+            value = yaml.load(data, Loader=loader)
+            if verbose:
+                print(loader.__name__, value)
+            assert value == expected, (data, loader, value)
+    for loader in loaders:
+        value = yaml.load(u"&a {x: 1, b: &b {<<: *a, y: 2}}", Loader=loader)
+        assert sorted(value['b']) == ['b', 'x', 'y'] and value['b']['b'] is value['b'], value
+
+test_recursive_merge.unittest = []
+
+def test_numeric_fast_paths(verbose=False):
+    import re
+    class GeneralConstructor(yaml.constructor.SafeConstructor):
+        # Converts every number with the general routines.
+        decimal_int_regexp = decimal_float_regexp = re.compile(u'(?!)')
+    ints = [u'0', u'7', u'-0', u'+12', u'-1234567890123456789012', u'012', u'-012',
+            u'0b101', u'-0x1F', u'1_000', u'190:20:30', u'-1:00']
+    ints = ints+[u'-+1']
+    floats = [u'0.0', u'-1.5', u'+.5', u'1.', u'1e3', u'6.8523015e+5', u'-1E-3', u'3',
+            u'1_0.5', u'190:20:30.15', u'-.inf', u'.Inf', u'-+1', u'+-1.5']
+    loaders = [yaml.loader.SafeLoader]
+    if yaml.__with_libyaml__:
+        loaders.append(yaml.cyaml.CSafeLoader)
+    for tag, values in [(u'tag:yaml.org,2002:int', ints),
+            (u'tag:yaml.org,2002:float', floats)]:
+        for value in values:
+            node = yaml.ScalarNode(tag, value)
+            data1 = yaml.constructor.SafeConstructor().construct_object(node)
+            data2 = GeneralConstructor().construct_object(node)
+            if verbose:
+                print(value, data1, data2)
+            assert type(data1) is type(data2) and data1 == data2, (value, data1, data2)
+            for loader in loaders:
+                data3 = yaml.load(u'!!%s "%s"' % (tag.split(u':')[-1], value), Loader=loader)
+                assert type(data1) is type(data3) and data1 == data3, (value, loader, data1, data3)
+
+test_numeric_fast_paths.unittest = []
+
+def test_timestamp_fast_path(verbose=False):
+    import re
+    class GeneralConstructor(yaml.constructor.SafeConstructor):
+        # Converts every timestamp with the general routine.
+        iso_timestamp_regexp = re.compile(u'(?!)')
+    values = [u'2001-12-14', u'2002-1-2', u'2001-12-14T21:59:43', u'2001-12-14T21:59:43.100',
+            u'2001-12-14T21:59:43.123456Z', u'2001-12-14T21:59:43.12-05:00',
+            u'2001-12-14T21:59:43+05:30', u'2001-12-14T21:59:43.1234567-00:00',
+            u'2001-12-14 21:59:43.10 -5', u'2001-12-14t21:59:43Z']
+    for value in values:
+        node = yaml.ScalarNode(u'tag:yaml.org,2002:timestamp', value)
+        data1 = yaml.constructor.SafeConstructor().construct_object(node)
+        data2 = GeneralConstructor().construct_object(node)
+        if verbose:
+            print(value, repr(data1), repr(data2))
+        assert type(data1) is type(data2) and data1 == data2, (value, data1, data2)
+        if isinstance(data1, datetime.datetime):
+            assert repr(data1.tzinfo) == repr(data2.tzinfo), (value, data1, data2)
+    for value in [u'2001-13-14', u'2001-12-14T25:59:43Z']:
+        node = yaml.ScalarNode(u'tag:yaml.org,2002:timestamp', value)
+        try:
+            yaml.constructor.SafeConstructor().construct_object(node)
+        except ValueError as exc:
+            if verbose:
+                print(exc)
+        else:
+            raise AssertionError("expected an exception for %r" % value)
+
+test_timestamp_fast_path.unittest = []
+
+def test_binary_chunks(verbose=False):
+    if not yaml.common.PY3:
+        return
+    import base64
+    class ChunkConstructor(yaml.constructor.SafeConstructor):
+        binary_chunk_size = 7
+    data = bytes(bytearray(range(256)))*3
+    encoded = base64.encodebytes(data).decode('ascii')
+    values = [encoded, encoded.replace(u'\n', u' '), u'YWFh\nYQ==\n', u'YWFhYQ==YWFh',
+            u'Y=WFh YQ=', u'YWFh*YWFh\u00e9YWFh', u'', u' \n ', u'YWFhY', u'YWFhYQ']
+    for value in values:
+        node = yaml.ScalarNode(u'tag:yaml.org,2002:binary', value)
+        results = []
+        for constructor in [yaml.constructor.SafeConstructor, ChunkConstructor]:
+            try:
+                results.append(constructor().construct_object(node))
+            except yaml.constructor.ConstructorError as exc:
+                if verbose:
+                    print(exc)
+                results.append(None)
+        if verbose:
+            print(repr(value), results)
+        assert results[0] == results[1], (value, results)
+    assert yaml.load(u"!!binary |\n" + u"".join(u"  "+line+u"\n" for line in encoded.splitlines()),
+            Loader=yaml.SafeLoader) == data
+
+test_binary_chunks.unittest = []
+
 def test_subclass_blacklist_types(data_filename, verbose=False):
     _make_objects()
     try:
@@ -326,6 +614,44 @@ def test_timezone_copy(verbose=False):
 
 test_timezone_copy.unittest = []
 
+def test_multi_constructor_cache(verbose=False):
+    class ParentLoader(yaml.SafeLoader):
+        pass
+    class ChildLoader(ParentLoader):
+        pass
+    def construct_ns(loader, suffix, node):
+        return ('ns', suffix, loader.construct_scalar(node))
+    def construct_other(loader, suffix, node):
+        return ('other', suffix, loader.construct_scalar(node))
+    ParentLoader.add_multi_constructor(u'!ns/', construct_ns)
+    data = u"[!ns/a x, !ns/a y, !other/b z]"
+    try:
+        yaml.load(data, Loader=ChildLoader)
+    except yaml.constructor.ConstructorError as exc:
+        if verbose:
+            print(exc)
+    else:
+        raise AssertionError("expected an exception")
+    # The prefix registered after the lookup is found by the subclass.
+    ParentLoader.add_multi_constructor(u'!other/', construct_other)
+    value = yaml.load(data, Loader=ChildLoader)
+    assert value == [('ns', u'a', u'x'), ('ns', u'a', u'y'), ('other', u'b', u'z')], value
+    # The subclass keeps its own prefixes apart from its parent.
+    ChildLoader.add_multi_constructor(u'!c/', construct_other)
+    value = yaml.load(u"[!ns/a x, !c/d y]", Loader=ChildLoader)
+    assert value == [('ns', u'a', u'x'), ('other', u'd', u'y')], value
+    try:
+        yaml.load(u"!c/d y", Loader=ParentLoader)
+    except yaml.constructor.ConstructorError as exc:
+        if verbose:
+            print(exc)
+    else:
+        raise AssertionError("expected an exception")
+    assert ChildLoader.get_multi_constructor(u'!ns/a') == (construct_ns, u'a')
+    assert ParentLoader.get_multi_constructor(u'!c/d') == (None, None)
+
+test_multi_constructor_cache.unittest = []
+
 if __name__ == '__main__':
     import sys, test_constructor
     sys.modules['test_constructor'] = sys.modules['__main__']
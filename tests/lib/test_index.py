@@ -0,0 +1,114 @@
+import yaml, yaml.index
+import os, shutil, tempfile
+
+def _load_all(stream):
+    documents = []
+    try:
+        for data in yaml.load_all(stream, Loader=yaml.loader.SafeLoader):
+            documents.append(data)
+    except yaml.YAMLError as exc:
+        return documents, exc
+    return documents, None
+
+def _compare_documents(data_filename, verbose):
+    with open(data_filename, 'rb') as file:
+        data = file.read()
+    documents, error = _load_all(data)
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, 'stream.yaml')
+        shutil.copyfile(data_filename, filename)
+        try:
+            index = yaml.build_index(filename)
+        except yaml.YAMLError as exc:
+            assert error is not None, exc
+            return
+        if verbose:
+            print("DOCUMENTS:", index.documents)
+            print("OFFSETS:", index.offsets)
+            print("NUMBERS:", index.numbers)
+        if error is None:
+            assert index.documents == len(documents), (index.documents, documents)
+        for number, data in enumerate(documents):
+            value = yaml.load_document(filename, number, yaml.loader.SafeLoader)
+            assert value == data or (value != value and data != data), (number, value, data)
+        if error is not None and hasattr(error, 'problem_mark') and index.documents > len(documents):
+            try:
+                yaml.load_document(filename, len(documents), yaml.loader.SafeLoader, index)
+            except yaml.YAMLError as exc:
+                if verbose:
+                    print(exc)
+                assert exc.problem_mark.line == error.problem_mark.line, (exc, error)
+            else:
+                raise AssertionError("expected an exception")
+    finally:
+        shutil.rmtree(directory)
+
+def test_document_index(data_filename, verbose=False):
+    _compare_documents(data_filename, verbose)
+
+test_document_index.unittest = ['.data']
+
+def test_document_index_errors(error_filename, verbose=False):
+    _compare_documents(error_filename, verbose)
+
+test_document_index_errors.unittest = ['.loader-error']
+
+def test_document_index_file(verbose=False):
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, 'stream.yaml')
+        data = u''.join(u"--- |\n  # %d\n  --- text\n...\n%%YAML 1.1\n--- [%d]\n" % (index, index)
+                for index in range(50))
+        with open(filename, 'wb') as file:
+            file.write((u'\ufeff'+data).encode('utf-16-le'))
+        assert not os.path.exists(filename+'.idx')
+        assert yaml.load_document(filename, 11, yaml.loader.SafeLoader) == [5]
+        assert os.path.exists(filename+'.idx')
+        index = yaml.index.DocumentIndex.load(filename+'.idx')
+        if verbose:
+            print("OFFSETS:", index.offsets)
+        assert index.documents == 100, index.documents
+        assert index.encoding == 'utf-16-le', index.encoding
+        assert index.lines[:4] == [0, 0, 4, 6], index.lines
+        assert index.offsets[:4] == [0, 2, 56, 92], index.offsets
+        assert yaml.load_document(filename, 98, yaml.loader.SafeLoader, filename+'.idx')   \
+                == u"# 49\n--- text\n"
+        try:
+            yaml.load_document(filename, 100, yaml.loader.SafeLoader, index)
+        except yaml.index.DocumentIndexError as exc:
+            if verbose:
+                print(exc)
+        else:
+            raise AssertionError("expected an exception")
+        with open(filename, 'ab') as file:
+            file.write(u"--- [50]\n".encode('utf-16-le'))
+        try:
+            yaml.load_document(filename, 100, yaml.loader.SafeLoader, index)
+        except yaml.index.DocumentIndexError as exc:
+            if verbose:
+                print(exc)
+        else:
+            raise AssertionError("expected an exception")
+        assert yaml.load_document(filename, 100, yaml.loader.SafeLoader) == [50]
+        # A rewrite within the same second is noticed.
+        stat = os.stat(filename)
+        if hasattr(stat, 'st_mtime_ns'):
+            second = stat.st_mtime_ns//1000000000*1000000000
+            os.utime(filename, ns=(stat.st_atime_ns, second+10000000))
+            index = yaml.index.build_index(filename)
+            assert index.check(filename)
+            os.utime(filename, ns=(stat.st_atime_ns, second+20000000))
+            assert not index.check(filename)
+        # An index of an older format is rebuilt.
+        with open(filename+'.idx', 'w') as file:
+            file.write('yaml-index 1 utf-16-le 0 0 0\n')
+        assert yaml.load_document(filename, 100, yaml.loader.SafeLoader) == [50]
+    finally:
+        shutil.rmtree(directory)
+
+test_document_index_file.unittest = []
+
+if __name__ == '__main__':
+    import test_appliance
+    test_appliance.run(globals())
@@ -43,6 +43,37 @@ def test_unicode_input(unicode_filename, verbose=False):
 
 test_unicode_input.unittest = ['.unicode']
 
+def test_mapped_input(unicode_filename, verbose=False):
+    import mmap
+    data = open(unicode_filename, 'rb').read().decode('utf-8')
+    value = ' '.join(data.split())
+    for input in [data.encode('utf-8'),
+            codecs.BOM_UTF8+data.encode('utf-8'),
+            codecs.BOM_UTF16_BE+data.encode('utf-16-be'),
+            codecs.BOM_UTF16_LE+data.encode('utf-16-le')]:
+        output = yaml.load(memoryview(input), Loader=yaml.loader.FullLoader)
+        assert output == value, (output, value)
+        handle, filename = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            with open(filename, 'wb') as file:
+                file.write(input)
+            with open(filename, 'rb') as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                output = yaml.load(mapping, Loader=yaml.loader.FullLoader)
+                assert output == value, (output, value)
+            finally:
+                mapping.close()
+            if yaml.reader.PathLike is not None:
+                import pathlib
+                output = yaml.load(pathlib.Path(filename), Loader=yaml.loader.FullLoader)
+                assert output == value, (output, value)
+        finally:
+            os.unlink(filename)
+
+test_mapped_input.unittest = ['.unicode']
+
 def test_unicode_input_errors(unicode_filename, verbose=False):
     data = open(unicode_filename, 'rb').read().decode('utf-8')
     for input in [data.encode('utf-16-be'),
@@ -26,6 +26,80 @@ def test_marks(marks_filename, verbose=False):
 
 test_marks.unittest = ['.marks']
 
+def test_lazy_marks(marks_filename, verbose=False):
+    with open(marks_filename, 'r') as file:
+        inputs = file.read().split('---\n')[1:]
+    for input in inputs:
+        reader = yaml.reader.Reader(input)
+        while reader.peek() != '*':
+            reader.forward()
+        mark = reader.get_mark()
+        assert isinstance(mark, yaml.error.LazyMark), type(mark)
+        eager = yaml.Mark(reader.name, reader.index, reader.line, reader.column,
+                reader.buffer, reader.pointer)
+        if verbose:
+            print(mark)
+        assert (mark.index, mark.line, mark.column) == (eager.index, eager.line, eager.column),  \
+                ((mark.index, mark.line, mark.column), (eager.index, eager.line, eager.column))
+        assert str(mark) == str(eager), (str(mark), str(eager))
+
+test_lazy_marks.unittest = ['.marks']
+
+def test_mark_copy(verbose=False):
+    import copy, pickle
+    try:
+        yaml.load(u"a: 1\nb: [2\n", Loader=yaml.loader.SafeLoader)
+    except yaml.MarkedYAMLError as exc:
+        error = exc
+    else:
+        raise AssertionError("expected an exception")
+    mark = error.problem_mark
+    assert isinstance(mark, yaml.error.LazyMark), type(mark)
+    copies = [copy.copy(mark), copy.deepcopy(mark)]
+    for protocol in range(pickle.HIGHEST_PROTOCOL+1):
+        copies.append(pickle.loads(pickle.dumps(mark, protocol)))
+        copies.append(pickle.loads(pickle.dumps(error, protocol)).problem_mark)
+    for value in copies:
+        if verbose:
+            print(value)
+        assert type(value) is yaml.Mark, type(value)
+        assert (value.name, value.index, value.line, value.column, value.pointer)    \
+                == (mark.name, mark.index, mark.line, mark.column, mark.pointer)
+        assert str(value) == str(mark), (str(value), str(mark))
+
+test_mark_copy.unittest = []
+
+def _compare_unmarked(node1, node2):
+    assert node2.start_mark is None and node2.end_mark is None, node2
+    assert (node1.tag, type(node1)) == (node2.tag, type(node2)), (node1, node2)
+    if isinstance(node1, yaml.ScalarNode):
+        assert node1.value == node2.value, (node1, node2)
+    else:
+        assert len(node1.value) == len(node2.value), (node1, node2)
+        for item1, item2 in zip(node1.value, node2.value):
+            if isinstance(item1, tuple):
+                _compare_unmarked(item1[0], item2[0])
+                _compare_unmarked(item1[1], item2[1])
+            else:
+                _compare_unmarked(item1, item2)
+
+def test_unmarked_nodes(data_filename, canonical_filename, verbose=False):
+    with open(data_filename, 'rb') as file:
+        data = file.read()
+    nodes1 = list(yaml.compose_all(data, Loader=yaml.loader.SafeLoader))
+    loader = yaml.loader.SafeLoader(data, marks=False)
+    try:
+        nodes2 = []
+        while loader.check_node():
+            nodes2.append(loader.get_node())
+    finally:
+        loader.dispose()
+    assert len(nodes1) == len(nodes2), (len(nodes1), len(nodes2))
+    for node1, node2 in zip(nodes1, nodes2):
+        _compare_unmarked(node1, node2)
+
+test_unmarked_nodes.unittest = ['.data', '.canonical']
+
 if __name__ == '__main__':
     import test_appliance
     test_appliance.run(globals())
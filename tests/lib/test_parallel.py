@@ -0,0 +1,81 @@
+import yaml, yaml.parallel, yaml.splitter
+import pprint
+
+def _load_all(stream, Loader):
+    documents = []
+    try:
+        for data in yaml.load_all(stream, Loader=Loader):
+            documents.append(data)
+    except yaml.YAMLError as exc:
+        documents.append((exc.__class__, getattr(exc, 'problem_mark', None) and exc.problem_mark.line))
+    return documents
+
+def _compare_chunks(data_filename, verbose):
+    with open(data_filename, 'rb') as file:
+        data = file.read()
+    documents1 = _load_all(data, yaml.loader.SafeLoader)
+    documents2 = []
+    chunks = []
+    try:
+        try:
+            splitter = yaml.splitter.DocumentSplitter(data, 0)
+            chunks = list(splitter)
+        except yaml.YAMLError as exc:
+            documents2.append((exc.__class__, None))
+        else:
+            text = yaml.splitter.DocumentSplitter(data).reader.buffer[:-1]
+            assert u''.join(chunk for chunk, index, line, number in chunks) == text, chunks
+        for chunk, index, line, number in chunks:
+            documents, error = yaml.parallel.load_chunk(yaml.loader.SafeLoader,
+                    splitter.name, chunk, index, line)
+            documents2.extend(documents)
+            if error is not None:
+                documents2.append((error.__class__,
+                        getattr(error, 'problem_mark', None) and error.problem_mark.line))
+                break
+        assert documents1 == documents2, (documents1, documents2)
+    finally:
+        if verbose:
+            print("CHUNKS:")
+            pprint.pprint(chunks)
+            print("DOCUMENTS1:")
+            pprint.pprint(documents1)
+            print("DOCUMENTS2:")
+            pprint.pprint(documents2)
+
+def test_document_splitter(data_filename, verbose=False):
+    _compare_chunks(data_filename, verbose)
+
+test_document_splitter.unittest = ['.data']
+
+def test_document_splitter_errors(error_filename, verbose=False):
+    _compare_chunks(error_filename, verbose)
+
+test_document_splitter_errors.unittest = ['.loader-error']
+
+def test_parallel_load_all(verbose=False):
+    try:
+        import concurrent.futures
+    except ImportError:
+        return
+    data = u''.join(u"--- # %d\nkey: [a, %d]\n...\n%%YAML 1.1\n--- |\n  text\n" % (index, index)
+            for index in range(100))
+    documents = list(yaml.parallel_load_all(data, yaml.loader.SafeLoader,
+            workers=2, chunk_size=100))
+    assert documents == list(yaml.load_all(data, Loader=yaml.loader.SafeLoader)), documents
+    data += u"--- {unclosed: mapping\n--- ok\n"
+    try:
+        for data in yaml.parallel_load_all(data, yaml.loader.SafeLoader, workers=2, chunk_size=100):
+            pass
+    except yaml.YAMLError as exc:
+        if verbose:
+            print(exc)
+        assert exc.problem_mark.line == 601, exc
+    else:
+        raise AssertionError("expected an exception")
+
+test_parallel_load_all.unittest = []
+
+if __name__ == '__main__':
+    import test_appliance
+    test_appliance.run(globals())
@@ -36,6 +36,28 @@ def test_representer_types(code_filename, verbose=False):
 
 test_representer_types.unittest = ['.code']
 
+def test_direct_representation(code_filename, verbose=False):
+    test_constructor._make_objects()
+    class MyNodeDumper(test_constructor.MyDumper):
+        def represent_data(self, data):
+            return test_constructor.MyDumper.represent_data(self, data)
+    native = test_constructor._load_code(open(code_filename, 'rb').read())
+    output1 = None
+    output2 = None
+    try:
+        for options in [{}, {'default_flow_style': None}, {'default_style': '"'}]:
+            output1 = yaml.dump([native, native], Dumper=test_constructor.MyDumper, **options)
+            output2 = yaml.dump([native, native], Dumper=MyNodeDumper, **options)
+            assert output1 == output2, (output1, output2)
+    finally:
+        if verbose:
+            print("OUTPUT1:")
+            print(output1)
+            print("OUTPUT2:")
+            print(output2)
+
+test_direct_representation.unittest = ['.code']
+
 if __name__ == '__main__':
     import test_appliance
     test_appliance.run(globals())
@@ -1,5 +1,6 @@
 import yaml
 import pprint
+import re
 
 def test_implicit_resolver(data_filename, detect_filename, verbose=False):
     correct_tag = None
@@ -22,6 +23,69 @@ def test_implicit_resolver(data_filename, detect_filename, verbose=False):
 
 test_implicit_resolver.unittest = ['.data', '.detect']
 
+def test_implicit_resolver_cache(verbose=False):
+    class MyLoader(yaml.loader.SafeLoader):
+        pass
+    data = u"- 0x1F\n- ~\n- foo\n- foo\n"
+    assert yaml.load(data, Loader=MyLoader) == [31, None, 'foo', 'foo']
+    MyLoader.add_implicit_resolver(u'!foo', re.compile(u'^foo$'), [u'f'])
+    assert [node.tag for node in yaml.compose(data, Loader=MyLoader).value]    \
+            == [u'tag:yaml.org,2002:int', u'tag:yaml.org,2002:null', u'!foo', u'!foo']
+    assert yaml.compose(u"foo", Loader=yaml.loader.SafeLoader).tag == u'tag:yaml.org,2002:str'
+    MyLoader.IMPLICIT_CACHE_SIZE = 2
+    values = [str(index) for index in range(10)]
+    assert yaml.load(u"[%s]" % u", ".join(values), Loader=MyLoader) == list(range(10))
+    assert len(MyLoader.get_implicit_cache()) <= 2
+    # Long values are not remembered.
+    MyLoader.IMPLICIT_CACHE_SIZE = 10000
+    MyLoader.clear_implicit_cache()
+    long_value = u"1"*(MyLoader.IMPLICIT_CACHE_VALUE_LENGTH+1)
+    assert yaml.load(long_value, Loader=MyLoader) == int(long_value)
+    assert long_value not in MyLoader.get_implicit_cache()
+    # Resolvers changed in place are seen after the cache is cleared.
+    assert yaml.load(u"bar", Loader=MyLoader) == 'bar'
+    MyLoader.yaml_implicit_resolvers[u'b'] = [(u'!bar', re.compile(u'^bar$'))]
+    MyLoader.clear_implicit_cache()
+    assert yaml.compose(u"bar", Loader=MyLoader).tag == u'!bar'
+
+test_implicit_resolver_cache.unittest = []
+
+def test_implicit_resolver_combined(verbose=False):
+    class MyLoader(yaml.loader.SafeLoader):
+        pass
+    MyLoader.add_implicit_resolver(u'!first', re.compile(u'''^(?:1 | 2)  # one or two
+            $''', re.X), list(u'12'))
+    MyLoader.add_implicit_resolver(u'!second', re.compile(u'^[0-9]+$'), list(u'0123456789'))
+    MyLoader.add_implicit_resolver(u'!any', re.compile(u'^-.*$', re.S), None)
+    data = u"[1, 2, 3, 12, -1, -x, foo]"
+    tags = [u'tag:yaml.org,2002:int', u'tag:yaml.org,2002:int', u'tag:yaml.org,2002:int',
+            u'tag:yaml.org,2002:int', u'tag:yaml.org,2002:int', u'!any', u'tag:yaml.org,2002:str']
+    assert [node.tag for node in yaml.compose(data, Loader=MyLoader).value] == tags
+    class MyOtherLoader(yaml.loader.BaseLoader):
+        pass
+    MyOtherLoader.add_implicit_resolver(u'!first', re.compile(u'''^(?:1 | 2)  # one or two
+            $''', re.X), list(u'12'))
+    MyOtherLoader.add_implicit_resolver(u'!second', re.compile(u'^([0-9])\\1*$'), list(u'0123456789'))
+    MyOtherLoader.add_implicit_resolver(u'!any', re.compile(u'^-.*$', re.S), None)
+    tags = [u'!first', u'!first', u'!second', u'tag:yaml.org,2002:str', u'!any', u'!any',
+            u'tag:yaml.org,2002:str']
+    assert [node.tag for node in yaml.compose(data, Loader=MyOtherLoader).value] == tags
+    assert MyOtherLoader.compile_implicit_resolvers(u'1')[0] is None
+    if yaml.common.PY2:
+        assert MyOtherLoader.compile_implicit_resolvers(u'-')[0] is None
+    else:
+        assert MyOtherLoader.compile_implicit_resolvers(u'-')[0] is not None
+    class MyFlagLoader(yaml.loader.BaseLoader):
+        pass
+    MyFlagLoader.add_implicit_resolver(u'!yes', re.compile(u'(?i)^yes$'), list(u'yY'))
+    MyFlagLoader.add_implicit_resolver(u'!y', re.compile(u'^y$'), list(u'yY'))
+    data = u"[yes, YES, y, Y]"
+    tags = [u'!yes', u'!yes', u'!y', u'tag:yaml.org,2002:str']
+    assert [node.tag for node in yaml.compose(data, Loader=MyFlagLoader).value] == tags
+    assert MyFlagLoader.compile_implicit_resolvers(u'y')[0] is None
+
+test_implicit_resolver_combined.unittest = []
+
 def _make_path_loader_and_dumper():
     global MyLoader, MyDumper
 
@@ -0,0 +1,106 @@
+import yaml, yaml.selector
+import pprint
+
+def test_select_documents(data_filename, verbose=False):
+    documents = None
+    found = None
+    try:
+        with open(data_filename, 'rb') as file:
+            data = file.read()
+        try:
+            documents = list(yaml.load_all(data, Loader=yaml.SafeLoader))
+        except yaml.YAMLError:
+            return
+        found = list(yaml.select(data, ['', '[*]', '[0]'], Loader=yaml.SafeLoader))
+        assert len(found) == len(documents), (found, documents)
+        for document, values in zip(documents, found):
+            assert values[''] == [document], (values, document)
+            if isinstance(document, list):
+                # An ordered map is a sequence of mappings.
+                assert len(values['[*]']) == len(document), (values, document)
+                assert len(values['[0]']) == len(document[:1]), (values, document)
+                if not [item for item in document if isinstance(item, tuple)]:
+                    assert values['[*]'] == document, (values, document)
+            else:
+                assert values['[*]'] == values['[0]'] == [], (values, document)
+    finally:
+        if verbose:
+            print("DOCUMENTS:")
+            pprint.pprint(documents)
+            print("FOUND:")
+            pprint.pprint(found)
+
+test_select_documents.unittest = ['.data']
+
+def test_select_paths(verbose=False):
+    data = (u"kind: Pod\n"
+            u"metadata: {name: web, labels: &labels {app: web}}\n"
+            u"spec:\n"
+            u"  containers:\n"
+            u"  - {name: a, image: nginx, ports: [80, 443]}\n"
+            u"  - name: b\n"
+            u"    image: &image redis\n"
+            u"  - *labels\n"
+            u"  other: *image\n"
+            u"  1: one\n"
+            u"---\n"
+            u"metadata: {name: second}\n"
+            u"spec: {containers: []}\n"
+            u"--- [a, [b, c], {d: e}]\n")
+    paths = ['spec.containers[*].image', 'metadata.name', 'spec.containers[0].ports[1]',
+            'spec.other', 'metadata.*', 'spec.containers[2].app', 'spec.1',
+            ['spec', 'containers', 1, 'name'], [(dict, True)], '[1][*]', '[*].d']
+    found = list(yaml.select(data, paths, Loader=yaml.SafeLoader))
+    if verbose:
+        pprint.pprint(found)
+    assert found == [{
+        'spec.containers[*].image': ['nginx', 'redis'],
+        'metadata.name': ['web'],
+        'spec.containers[0].ports[1]': [443],
+        'spec.other': ['redis'],
+        'metadata.*': ['web', {'app': 'web'}],
+        'spec.containers[2].app': ['web'],
+        'spec.1': ['one'],
+        ('spec', 'containers', 1, 'name'): ['b'],
+        ((dict, True),): ['kind', 'metadata', 'spec'],
+        '[1][*]': [],
+        '[*].d': [],
+    }, {
+        'spec.containers[*].image': [],
+        'metadata.name': ['second'],
+        'spec.containers[0].ports[1]': [],
+        'spec.other': [],
+        'metadata.*': ['second'],
+        'spec.containers[2].app': [],
+        'spec.1': [],
+        ('spec', 'containers', 1, 'name'): [],
+        ((dict, True),): ['metadata', 'spec'],
+        '[1][*]': [],
+        '[*].d': [],
+    }, {
+        'spec.containers[*].image': [],
+        'metadata.name': [],
+        'spec.containers[0].ports[1]': [],
+        'spec.other': [],
+        'metadata.*': [],
+        'spec.containers[2].app': [],
+        'spec.1': [],
+        ('spec', 'containers', 1, 'name'): [],
+        ((dict, True),): [],
+        '[1][*]': ['b', 'c'],
+        '[*].d': ['e'],
+    }], found
+    for path in ['.name', 'name.', 'a..b', 'a[b]', 'a.[0]', '[0]b', 'a[']:
+        try:
+            list(yaml.select(data, [path], Loader=yaml.SafeLoader))
+        except yaml.selector.SelectorError as exc:
+            if verbose:
+                print(exc)
+        else:
+            raise AssertionError("expected an exception for %r" % path)
+
+test_select_paths.unittest = []
+
+if __name__ == '__main__':
+    import test_appliance
+    test_appliance.run(globals())
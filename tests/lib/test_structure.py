@@ -82,6 +82,66 @@ def test_parser(data_filename, canonical_filename, verbose=False):
 
 test_parser.unittest = ['.data', '.canonical']
 
+class _EventRecorder(yaml.EventHandler):
+    # Rebuilds the events from the calls of `handle_events`.
+    def __init__(self):
+        self.events = []
+    def start_stream(self, encoding):
+        self.events.append(yaml.StreamStartEvent(encoding=encoding))
+    def end_stream(self):
+        self.events.append(yaml.StreamEndEvent())
+    def start_document(self, explicit, version, tags):
+        self.events.append(yaml.DocumentStartEvent(explicit=explicit, version=version, tags=tags))
+    def end_document(self, explicit):
+        self.events.append(yaml.DocumentEndEvent(explicit=explicit))
+    def alias(self, anchor):
+        self.events.append(yaml.AliasEvent(anchor))
+    def scalar(self, value, tag, anchor, style, implicit):
+        self.events.append(yaml.ScalarEvent(anchor, tag, implicit, value, style=style))
+    def start_sequence(self, tag, anchor, flow_style, implicit):
+        self.events.append(yaml.SequenceStartEvent(anchor, tag, implicit, flow_style=flow_style))
+    def end_sequence(self):
+        self.events.append(yaml.SequenceEndEvent())
+    def start_mapping(self, tag, anchor, flow_style, implicit):
+        self.events.append(yaml.MappingStartEvent(anchor, tag, implicit, flow_style=flow_style))
+    def end_mapping(self):
+        self.events.append(yaml.MappingEndEvent())
+
+class _ScalarCounter(yaml.EventHandler):
+    def __init__(self):
+        self.count = 0
+    def scalar(self, value, tag, anchor, style, implicit):
+        self.count += 1
+
+def test_event_handler(data_filename, canonical_filename, verbose=False):
+    events1 = None
+    events2 = None
+    try:
+        with open(data_filename, 'rb') as file:
+            data = file.read()
+        events1 = list(yaml.parse(data, Loader=yaml.Loader))
+        recorder = _EventRecorder()
+        yaml.handle_events(data, recorder, Loader=yaml.Loader)
+        events2 = recorder.events
+        assert len(events1) == len(events2), (len(events1), len(events2))
+        for event1, event2 in zip(events1, events2):
+            assert event1.__class__ == event2.__class__, (event1, event2)
+            for key in ['anchor', 'tag', 'implicit', 'value', 'style', 'flow_style',
+                    'explicit', 'version', 'tags', 'encoding']:
+                assert getattr(event1, key, None) == getattr(event2, key, None), (key, event1, event2)
+        counter = _ScalarCounter()
+        yaml.handle_events(data, counter, Loader=yaml.Loader)
+        assert counter.count == len([event for event in events1
+                if isinstance(event, yaml.ScalarEvent)]), counter.count
+    finally:
+        if verbose:
+            print("EVENTS1:")
+            pprint.pprint(events1)
+            print("EVENTS2:")
+            pprint.pprint(events2)
+
+test_event_handler.unittest = ['.data', '.canonical']
+
 def test_parser_on_canonical(canonical_filename, verbose=False):
     events1 = None
     events2 = None
@@ -180,6 +240,71 @@ def test_constructor(data_filename, canonical_filename, verbose=False):
 
 test_constructor.unittest = ['.data', '.canonical']
 
+def test_deep_nesting(verbose=False):
+    import sys
+    depth = sys.getrecursionlimit()*2
+    data = u"["*depth + u"{a: &x [1], b: *x}" + u"]"*depth
+    def unwrap(value):
+        for level in range(depth):
+            if isinstance(value, yaml.SequenceNode):
+                value = value.value
+            assert len(value) == 1, value
+            value = value[0]
+        return value
+    node = unwrap(yaml.compose(data, Loader=yaml.loader.SafeLoader))
+    assert node.value[0][1] is node.value[1][1]
+    for loader in [yaml.loader.SafeLoader, yaml.loader.UnsafeLoader]:
+        value = unwrap(yaml.load(data, Loader=loader))
+        assert value == {'a': [1], 'b': [1]} and value['a'] is value['b'], value
+    block = u"- "*depth + u"{a: &x [1], b: *x}\n"
+    loaders = [yaml.loader.BaseLoader]
+    if yaml.__with_libyaml__:
+        loaders.append(yaml.cyaml.CBaseLoader)
+    for loader in loaders:
+        for text in [data, block]:
+            value = unwrap(yaml.load(text, Loader=loader))
+            assert value == {'a': ['1'], 'b': ['1']} and value['a'] is value['b'], value
+    value = unwrap(yaml.load(u"!!python/object/apply:list [%s]" % data,
+            Loader=yaml.loader.UnsafeLoader))
+    assert value == {'a': [1], 'b': [1]} and value['a'] is value['b'], value
+    output = yaml.serialize(yaml.compose(data, Loader=yaml.loader.SafeLoader), None,
+            Dumper=yaml.dumper.Dumper)
+    if verbose:
+        print(output[-100:])
+    value = unwrap(yaml.load(output, Loader=yaml.loader.SafeLoader))
+    assert value == {'a': [1], 'b': [1]} and value['a'] is value['b'], value
+
+test_deep_nesting.unittest = []
+
+def test_base_constructor_children(verbose=False):
+    # Constructors get complete children from `construct_sequence` and
+    # `construct_mapping`.
+    class MyLoader(yaml.loader.BaseLoader):
+        pass
+    def construct_tuples(loader, node):
+        return [tuple(item) for item in loader.construct_sequence(node)]
+    def construct_items(loader, node):
+        return sorted((key, sorted(value.items()))
+                for key, value in loader.construct_mapping(node).items())
+    MyLoader.add_constructor(u'!t', construct_tuples)
+    MyLoader.add_constructor(u'!i', construct_items)
+    loaders = [MyLoader]
+    if yaml.__with_libyaml__:
+        class MyCLoader(yaml.cyaml.CBaseLoader):
+            pass
+        MyCLoader.add_constructor(u'!t', construct_tuples)
+        MyCLoader.add_constructor(u'!i', construct_items)
+        loaders.append(MyCLoader)
+    for loader in loaders:
+        value = yaml.load(u"!t [[1, 2], [3]]", Loader=loader)
+        assert value == [('1', '2'), ('3',)], value
+        value = yaml.load(u"[a, {b: !t [[1, 2], [3]]}]", Loader=loader)
+        assert value == ['a', {'b': [('1', '2'), ('3',)]}], value
+        value = yaml.load(u"!i {a: {b: 1}, c: {d: 2}}", Loader=loader)
+        assert value == [('a', [('b', '1')]), ('c', [('d', '2')])], value
+
+test_base_constructor_children.unittest = []
+
 if __name__ == '__main__':
     import test_appliance
     test_appliance.run(globals())
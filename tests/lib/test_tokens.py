@@ -73,6 +73,34 @@ def test_scanner(data_filename, canonical_filename, verbose=False):
 
 test_scanner.unittest = ['.data', '.canonical']
 
+def test_scanner_release(verbose=False):
+    import gc, weakref
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        loader = yaml.loader.SafeLoader(u"a: [1, 2]\n")
+        assert loader.get_single_data() == {'a': [1, 2]}
+        loader.dispose()
+        reference = weakref.ref(loader)
+        del loader
+        # The loader is freed without the garbage collector.
+        assert reference() is None
+    finally:
+        if enabled:
+            gc.enable()
+
+test_scanner_release.unittest = []
+
+def test_block_scalar_regions(verbose=False):
+    size = yaml.scanner.Scanner.BLOCK_SCALAR_REGIONS_SIZE
+    data = u"".join(u"- |\n%stext %d\n" % (u" "*indent, indent)
+            for indent in range(1, 2*size))
+    values = yaml.load(data, Loader=yaml.loader.SafeLoader)
+    assert values == [u"text %d\n" % indent for indent in range(1, 2*size)], values
+    assert len(yaml.scanner.Scanner.BLOCK_SCALAR_REGIONS) <= size
+
+test_block_scalar_regions.unittest = []
+
 if __name__ == '__main__':
     import test_appliance
     test_appliance.run(globals())
@@ -12,6 +12,9 @@ from test_recursive import *
 from test_input_output import *
 from test_sort_keys import *
 from test_multi_constructor import *
+from test_parallel import *
+from test_index import *
+from test_selector import *
 
 if __name__ == '__main__':
     import test_appliance
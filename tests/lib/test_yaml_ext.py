@@ -3,6 +3,7 @@ import types, pprint, tempfile, sys, os
 
 yaml.PyBaseLoader = yaml.BaseLoader
 yaml.PySafeLoader = yaml.SafeLoader
+yaml.PyLazyLoader = yaml.LazyLoader
 yaml.PyLoader = yaml.Loader
 yaml.PyBaseDumper = yaml.BaseDumper
 yaml.PySafeDumper = yaml.SafeDumper
@@ -71,6 +72,7 @@ def new_safe_dump_all(documents, stream=None, **kwds):
 def _set_up():
     yaml.BaseLoader = yaml.CBaseLoader
     yaml.SafeLoader = yaml.CSafeLoader
+    yaml.LazyLoader = yaml.CLazyLoader
     yaml.Loader = yaml.CLoader
     yaml.BaseDumper = yaml.CBaseDumper
     yaml.SafeDumper = yaml.CSafeDumper
@@ -94,6 +96,7 @@ def _set_up():
 def _tear_down():
     yaml.BaseLoader = yaml.PyBaseLoader
     yaml.SafeLoader = yaml.PySafeLoader
+    yaml.LazyLoader = yaml.PyLazyLoader
     yaml.Loader = yaml.PyLoader
     yaml.BaseDumper = yaml.PyBaseDumper
     yaml.SafeDumper = yaml.PySafeDumper
@@ -292,9 +295,9 @@ def wrap_ext(collections):
             globals()[function.unittest_name] = function
 
 import test_tokens, test_structure, test_errors, test_resolver, test_constructor,   \
-        test_emitter, test_representer, test_recursive, test_input_output
+        test_emitter, test_representer, test_recursive, test_input_output, test_selector
 wrap_ext([test_tokens, test_structure, test_errors, test_resolver, test_constructor,
-        test_emitter, test_representer, test_recursive, test_input_output])
+        test_emitter, test_representer, test_recursive, test_input_output, test_selector])
 
 if __name__ == '__main__':
     import test_appliance
@@ -1,6 +1,9 @@
 
 import yaml
 
+import datetime, itertools
+from types import GeneratorType
+
 def get_version_string():
     cdef char *value
     value = yaml_get_version_string()
@@ -56,11 +59,38 @@ SequenceStartEvent = yaml.events.SequenceStartEvent
 SequenceEndEvent = yaml.events.SequenceEndEvent
 MappingStartEvent = yaml.events.MappingStartEvent
 MappingEndEvent = yaml.events.MappingEndEvent
+EventHandler = yaml.events.EventHandler
 
 ScalarNode = yaml.nodes.ScalarNode
 SequenceNode = yaml.nodes.SequenceNode
 MappingNode = yaml.nodes.MappingNode
 
+SafeConstructor = yaml.constructor.SafeConstructor
+SafeRepresenter = yaml.representer.SafeRepresenter
+
+# Kinds of the collections being built by `CParser._build_nodes`.
+DEF LIST_KIND = 0
+DEF DICT_KIND = 1
+DEF SET_KIND = 2
+DEF OMAP_KIND = 3
+DEF PAIR_KIND = 4
+
+# Kinds of the objects emitted by `CEmitter._represent_object`.
+DEF OTHER_OBJECT = 0
+DEF NULL_OBJECT = 1
+DEF BOOL_OBJECT = 2
+DEF INT_OBJECT = 3
+DEF FLOAT_OBJECT = 4
+DEF STR_OBJECT = 5
+DEF DATE_OBJECT = 6
+DEF DATETIME_OBJECT = 7
+DEF LIST_OBJECT = 8
+DEF TUPLE_OBJECT = 9
+DEF DICT_OBJECT = 10
+
+# Marks the end of the items of a collection.
+_end_of_items = object()
+
 cdef class Mark:
     cdef readonly object name
     cdef readonly size_t index
@@ -244,6 +274,9 @@ cdef class Mark:
 #        self.end_mark = end_mark
 #        self.style = style
 
+# The `implicit` flags of scalar events by `plain_implicit*2+quoted_implicit`.
+_implicit_flags = [(False, False), (False, True), (True, False), (True, True)]
+
 cdef class CParser:
 
     cdef yaml_parser_t parser
@@ -253,17 +286,21 @@ cdef class CParser:
     cdef object stream_name
     cdef object current_token
     cdef object current_event
-    cdef object anchors
+    cdef public object anchors
     cdef object stream_cache
     cdef int stream_cache_len
     cdef int stream_cache_pos
     cdef int unicode_source
+    cdef int use_marks
 
-    def __init__(self, stream):
+    def __init__(self, stream, marks=True):
         cdef is_readable
         if yaml_parser_initialize(&self.parser) == 0:
             raise MemoryError
         self.parsed_event.type = YAML_NO_EVENT
+        self.use_marks = 0
+        if marks:
+            self.use_marks = 1
         is_readable = 1
         try:
             stream.read
@@ -374,6 +411,12 @@ cdef class CParser:
             yaml_token_delete(&token)
         return count
 
+    cdef object _make_mark(self, yaml_mark_t *mark):
+        if self.use_marks == 0:
+            return None
+        return Mark(self.stream_name, mark.index, mark.line, mark.column,
+                None, None)
+
     cdef object _scan(self):
         cdef yaml_token_t token
         if yaml_parser_scan(&self.parser, &token) == 0:
@@ -384,16 +427,8 @@ cdef class CParser:
         return token_object
 
     cdef object _token_to_object(self, yaml_token_t *token):
-        start_mark = Mark(self.stream_name,
-                token.start_mark.index,
-                token.start_mark.line,
-                token.start_mark.column,
-                None, None)
-        end_mark = Mark(self.stream_name,
-                token.end_mark.index,
-                token.end_mark.line,
-                token.end_mark.column,
-                None, None)
+        start_mark = self._make_mark(&token.start_mark)
+        end_mark = self._make_mark(&token.end_mark)
         if token.type == YAML_NO_TOKEN:
             return None
         elif token.type == YAML_STREAM_START_TOKEN:
@@ -524,26 +559,15 @@ cdef class CParser:
         return count
 
     cdef object _parse(self):
-        cdef yaml_event_t event
-        if yaml_parser_parse(&self.parser, &event) == 0:
-            error = self._parser_error()
-            raise error
-        event_object = self._event_to_object(&event)
-        yaml_event_delete(&event)
-        return event_object
+        # The event is kept in `parsed_event` until `get_event` drops it, so
+        # a peeked event is picked up by the methods composing nodes.
+        self._parse_next_event()
+        return self._event_to_object(&self.parsed_event)
 
     cdef object _event_to_object(self, yaml_event_t *event):
         cdef yaml_tag_directive_t *tag_directive
-        start_mark = Mark(self.stream_name,
-                event.start_mark.index,
-                event.start_mark.line,
-                event.start_mark.column,
-                None, None)
-        end_mark = Mark(self.stream_name,
-                event.end_mark.index,
-                event.end_mark.line,
-                event.end_mark.column,
-                None, None)
+        start_mark = self._make_mark(&event.start_mark)
+        end_mark = self._make_mark(&event.end_mark)
         if event.type == YAML_NO_EVENT:
             return None
         elif event.type == YAML_STREAM_START_EVENT:
@@ -664,8 +688,143 @@ cdef class CParser:
             self.current_event = None
         else:
             value = self._parse()
+        yaml_event_delete(&self.parsed_event)
         return value
 
+    def handle_events(self, handler):
+        # Same as `Parser.handle_events`, but the handler is called straight
+        # from the LibYAML events and the values of the dropped events are
+        # not converted.
+        cdef yaml_tag_directive_t *tag_directive
+        cdef int event_type
+        (start_stream, end_stream, start_document, end_document, alias, scalar,
+                start_sequence, end_sequence, start_mapping, end_mapping)  \
+                        = EventHandler.get_methods(handler)
+        self.current_event = None
+        while True:
+            self._parse_next_event()
+            event_type = self.parsed_event.type
+            if event_type == YAML_NO_EVENT:
+                return
+            elif event_type == YAML_SCALAR_EVENT:
+                if scalar is None:
+                    yaml_event_delete(&self.parsed_event)
+                    continue
+                value = PyUnicode_DecodeUTF8(self.parsed_event.data.scalar.value,
+                        self.parsed_event.data.scalar.length, 'strict')
+                tag = None
+                if self.parsed_event.data.scalar.tag != NULL:
+                    tag = PyUnicode_FromString(self.parsed_event.data.scalar.tag)
+                anchor = None
+                if self.parsed_event.data.scalar.anchor != NULL:
+                    anchor = PyUnicode_FromString(self.parsed_event.data.scalar.anchor)
+                style = None
+                if self.parsed_event.data.scalar.style == YAML_PLAIN_SCALAR_STYLE:
+                    style = u''
+                elif self.parsed_event.data.scalar.style == YAML_SINGLE_QUOTED_SCALAR_STYLE:
+                    style = u'\''
+                elif self.parsed_event.data.scalar.style == YAML_DOUBLE_QUOTED_SCALAR_STYLE:
+                    style = u'"'
+                elif self.parsed_event.data.scalar.style == YAML_LITERAL_SCALAR_STYLE:
+                    style = u'|'
+                elif self.parsed_event.data.scalar.style == YAML_FOLDED_SCALAR_STYLE:
+                    style = u'>'
+                implicit = _implicit_flags[self.parsed_event.data.scalar.plain_implicit*2
+                        + self.parsed_event.data.scalar.quoted_implicit]
+                yaml_event_delete(&self.parsed_event)
+                scalar(value, tag, anchor, style, implicit)
+            elif event_type == YAML_MAPPING_START_EVENT     \
+                    or event_type == YAML_SEQUENCE_START_EVENT:
+                if event_type == YAML_MAPPING_START_EVENT:
+                    method = start_mapping
+                else:
+                    method = start_sequence
+                if method is None:
+                    yaml_event_delete(&self.parsed_event)
+                    continue
+                tag = None
+                anchor = None
+                flow_style = None
+                if event_type == YAML_MAPPING_START_EVENT:
+                    if self.parsed_event.data.mapping_start.tag != NULL:
+                        tag = PyUnicode_FromString(self.parsed_event.data.mapping_start.tag)
+                    if self.parsed_event.data.mapping_start.anchor != NULL:
+                        anchor = PyUnicode_FromString(self.parsed_event.data.mapping_start.anchor)
+                    if self.parsed_event.data.mapping_start.style == YAML_FLOW_MAPPING_STYLE:
+                        flow_style = True
+                    elif self.parsed_event.data.mapping_start.style == YAML_BLOCK_MAPPING_STYLE:
+                        flow_style = False
+                    implicit = self.parsed_event.data.mapping_start.implicit == 1
+                else:
+                    if self.parsed_event.data.sequence_start.tag != NULL:
+                        tag = PyUnicode_FromString(self.parsed_event.data.sequence_start.tag)
+                    if self.parsed_event.data.sequence_start.anchor != NULL:
+                        anchor = PyUnicode_FromString(self.parsed_event.data.sequence_start.anchor)
+                    if self.parsed_event.data.sequence_start.style == YAML_FLOW_SEQUENCE_STYLE:
+                        flow_style = True
+                    elif self.parsed_event.data.sequence_start.style == YAML_BLOCK_SEQUENCE_STYLE:
+                        flow_style = False
+                    implicit = self.parsed_event.data.sequence_start.implicit == 1
+                yaml_event_delete(&self.parsed_event)
+                method(tag, anchor, flow_style, implicit)
+            elif event_type == YAML_MAPPING_END_EVENT:
+                yaml_event_delete(&self.parsed_event)
+                if end_mapping is not None:
+                    end_mapping()
+            elif event_type == YAML_SEQUENCE_END_EVENT:
+                yaml_event_delete(&self.parsed_event)
+                if end_sequence is not None:
+                    end_sequence()
+            elif event_type == YAML_ALIAS_EVENT:
+                if alias is None:
+                    yaml_event_delete(&self.parsed_event)
+                    continue
+                anchor = PyUnicode_FromString(self.parsed_event.data.alias.anchor)
+                yaml_event_delete(&self.parsed_event)
+                alias(anchor)
+            elif event_type == YAML_DOCUMENT_START_EVENT:
+                if start_document is None:
+                    yaml_event_delete(&self.parsed_event)
+                    continue
+                explicit = self.parsed_event.data.document_start.implicit == 0
+                version = None
+                if self.parsed_event.data.document_start.version_directive != NULL:
+                    version = (self.parsed_event.data.document_start.version_directive.major,
+                            self.parsed_event.data.document_start.version_directive.minor)
+                tags = None
+                if self.parsed_event.data.document_start.tag_directives.start != NULL:
+                    tags = {}
+                    tag_directive = self.parsed_event.data.document_start.tag_directives.start
+                    while tag_directive != self.parsed_event.data.document_start.tag_directives.end:
+                        handle = PyUnicode_FromString(tag_directive.handle)
+                        prefix = PyUnicode_FromString(tag_directive.prefix)
+                        tags[handle] = prefix
+                        tag_directive = tag_directive+1
+                yaml_event_delete(&self.parsed_event)
+                start_document(explicit, version, tags)
+            elif event_type == YAML_DOCUMENT_END_EVENT:
+                explicit = self.parsed_event.data.document_end.implicit == 0
+                yaml_event_delete(&self.parsed_event)
+                if end_document is not None:
+                    end_document(explicit)
+            elif event_type == YAML_STREAM_START_EVENT:
+                encoding = None
+                if self.parsed_event.data.stream_start.encoding == YAML_UTF8_ENCODING:
+                    if self.unicode_source == 0:
+                        encoding = u"utf-8"
+                elif self.parsed_event.data.stream_start.encoding == YAML_UTF16LE_ENCODING:
+                    encoding = u"utf-16-le"
+                elif self.parsed_event.data.stream_start.encoding == YAML_UTF16BE_ENCODING:
+                    encoding = u"utf-16-be"
+                yaml_event_delete(&self.parsed_event)
+                if start_stream is not None:
+                    start_stream(encoding)
+            elif event_type == YAML_STREAM_END_EVENT:
+                yaml_event_delete(&self.parsed_event)
+                if end_stream is not None:
+                    end_stream()
+                return
+
     def peek_event(self):
         if self.current_event is None:
             self.current_event = self._parse()
@@ -707,19 +866,389 @@ cdef class CParser:
             document = self._compose_document()
         self._parse_next_event()
         if self.parsed_event.type != YAML_STREAM_END_EVENT:
-            mark = Mark(self.stream_name,
-                    self.parsed_event.start_mark.index,
-                    self.parsed_event.start_mark.line,
-                    self.parsed_event.start_mark.column,
-                    None, None)
-            if PY_MAJOR_VERSION < 3:
-                raise ComposerError("expected a single document in the stream",
-                        document.start_mark, "but found another document", mark)
-            else:
-                raise ComposerError(u"expected a single document in the stream",
-                        document.start_mark, u"but found another document", mark)
+            raise self._single_document_error(document.start_mark)
         return document
 
+    cdef object _single_document_error(self, object start_mark):
+        mark = Mark(self.stream_name,
+                self.parsed_event.start_mark.index,
+                self.parsed_event.start_mark.line,
+                self.parsed_event.start_mark.column,
+                None, None)
+        if PY_MAJOR_VERSION < 3:
+            return ComposerError("expected a single document in the stream",
+                    start_mark, "but found another document", mark)
+        else:
+            return ComposerError(u"expected a single document in the stream",
+                    start_mark, u"but found another document", mark)
+
+    def check_direct_construction(self):
+        # Documents may be built straight from the LibYAML events for
+        # `SafeConstructor` and its subclasses unless the loader composes
+        # nodes differently, uses path resolvers, or constructs scalars or
+        # plain collections in its own way.
+        cls = self.__class__
+        if not isinstance(self, SafeConstructor):
+            return False
+        for name in ['get_node', 'get_single_node']:
+            if getattr(cls, name) != getattr(CParser, name):
+                return False
+        for name in SafeConstructor.direct_construction_methods:
+            if getattr(cls, name) != getattr(SafeConstructor, name):
+                return False
+        return not getattr(cls, 'yaml_path_resolvers', None)    \
+                and cls.yaml_constructors.get(u'tag:yaml.org,2002:seq')   \
+                        == SafeConstructor.construct_yaml_seq  \
+                and cls.yaml_constructors.get(u'tag:yaml.org,2002:map')   \
+                        == SafeConstructor.construct_yaml_map
+
+    def get_data(self):
+        # Construct and return the next document.
+        if not self.check_direct_construction():
+            return super(CParser, self).get_data()
+        if self.check_node():
+            return self._build_document(0)[0]
+
+    def get_single_data(self):
+        # Ensure that the stream contains a single document and construct it.
+        if not self.check_direct_construction():
+            return super(CParser, self).get_single_data()
+        self._parse_next_event()
+        yaml_event_delete(&self.parsed_event)
+        self._parse_next_event()
+        data = start_mark = None
+        if self.parsed_event.type != YAML_STREAM_END_EVENT:
+            data, start_mark = self._build_document(1)
+        self._parse_next_event()
+        if self.parsed_event.type != YAML_STREAM_END_EVENT:
+            raise self._single_document_error(start_mark)
+        return data
+
+    cdef object _build_document(self, int single):
+        # Build the next document and return it with the start mark of its
+        # root.  See `SafeConstructor.build_document` for the pure Python
+        # version of the same algorithm.
+        yaml_event_delete(&self.parsed_event)
+        self._parse_next_event()
+        start_mark = self._make_mark(&self.parsed_event.start_mark)
+        stack = []
+        try:
+            data = self._build_nodes(stack)
+        except ConstructorError as exc:
+            # A composed document is only constructed once it is complete,
+            # so errors found in the rest of the document take precedence,
+            # and so does an unhashable key of an enclosing mapping.
+            error = exc
+            for entry in stack:
+                if entry[5] is not None:
+                    error = entry[5]
+                    break
+            while stack:
+                self._parse_next_event()
+                if self.parsed_event.type == YAML_SEQUENCE_END_EVENT    \
+                        or self.parsed_event.type == YAML_MAPPING_END_EVENT:
+                    yaml_event_delete(&self.parsed_event)
+                    stack.pop()
+                else:
+                    self._compose_node(None, None)
+            self._parse_next_event()
+            yaml_event_delete(&self.parsed_event)
+            if single:
+                self._parse_next_event()
+                if self.parsed_event.type != YAML_STREAM_END_EVENT:
+                    raise self._single_document_error(start_mark)
+            raise error
+        self._parse_next_event()
+        yaml_event_delete(&self.parsed_event)
+        self.run_state_generators()
+        self.constructed_objects = {}
+        self.recursive_objects = {}
+        self.anchors = {}
+        return data, start_mark
+
+    cdef object _build_nodes(self, list stack):
+        # Build the root of the document.  Scalars with the standard safe
+        # tags and untagged sequences, mappings, sets, ordered maps and pairs
+        # are constructed here.  Other scalars are passed to their
+        # constructors, and anchored or tagged collections are composed and
+        # constructed as usual.  A stack entry is a list holding the kind of
+        # the collection, the container being filled, its start mark, the key
+        # waiting for its value, the dicts of merged pairs, the error for an
+        # unhashable key, the object returned for the collection and, for an
+        # ordered map, its description in error messages.
+        cdef int kind
+        cdef int is_key
+        constructors = self.yaml_constructors
+        native_str = PY_MAJOR_VERSION >= 3 and constructors.get(u'tag:yaml.org,2002:str')  \
+                == SafeConstructor.construct_yaml_str
+        native_null = constructors.get(u'tag:yaml.org,2002:null')   \
+                == SafeConstructor.construct_yaml_null
+        native_bool = constructors.get(u'tag:yaml.org,2002:bool')   \
+                == SafeConstructor.construct_yaml_bool
+        native_int = constructors.get(u'tag:yaml.org,2002:int')    \
+                == SafeConstructor.construct_yaml_int
+        native_float = constructors.get(u'tag:yaml.org,2002:float')    \
+                == SafeConstructor.construct_yaml_float
+        native_set = constructors.get(u'tag:yaml.org,2002:set')    \
+                == SafeConstructor.construct_yaml_set
+        native_omap = constructors.get(u'tag:yaml.org,2002:omap')  \
+                == SafeConstructor.construct_yaml_omap
+        native_pairs = constructors.get(u'tag:yaml.org,2002:pairs')    \
+                == SafeConstructor.construct_yaml_pairs
+        while True:
+            self._parse_next_event()
+            entry = None
+            check_key = False
+            if stack:
+                parent = stack[-1]
+                kind = parent[0]
+            else:
+                parent = None
+                kind = -1
+            is_key = (kind == DICT_KIND or kind == SET_KIND) and parent[3] is None
+            if self.parsed_event.type == YAML_SEQUENCE_END_EVENT   \
+                    or self.parsed_event.type == YAML_MAPPING_END_EVENT:
+                yaml_event_delete(&self.parsed_event)
+                stack.pop()
+                if parent[5] is not None:
+                    raise parent[5]
+                if parent[4]:
+                    merged = {}
+                    for pairs in parent[4]:
+                        merged.update(pairs)
+                    merged.update(parent[1])
+                    parent[1].clear()
+                    parent[1].update(merged)
+                if kind == SET_KIND:
+                    parent[6].update(parent[1])
+                if kind != PAIR_KIND:
+                    if not stack:
+                        return parent[6]
+                    continue
+                # A pair of an ordered map is added when it is complete.
+                if len(parent[1]) != 1:
+                    raise ConstructorError("while constructing %s" % stack[-1][7],
+                            stack[-1][2],
+                            "expected a single mapping item, but found %d items"
+                            % len(parent[1]), parent[2])
+                data = parent[1][0]
+                parent = stack[-1]
+                kind = parent[0]
+            elif kind == OMAP_KIND:
+                if self.parsed_event.type == YAML_MAPPING_START_EVENT    \
+                        and self.parsed_event.data.mapping_start.anchor == NULL:
+                    mark = self._make_mark(&self.parsed_event.start_mark)
+                    yaml_event_delete(&self.parsed_event)
+                    stack.append([PAIR_KIND, [], mark, None, None, None, None, None])
+                    continue
+                if self.parsed_event.type == YAML_SCALAR_EVENT  \
+                        and self.parsed_event.data.scalar.anchor == NULL:
+                    raise ConstructorError("while constructing %s" % parent[7], parent[2],
+                            "expected a mapping of length 1, but found scalar",
+                            self._make_mark(&self.parsed_event.start_mark))
+                if self.parsed_event.type == YAML_SEQUENCE_START_EVENT  \
+                        and self.parsed_event.data.sequence_start.anchor == NULL:
+                    raise ConstructorError("while constructing %s" % parent[7], parent[2],
+                            "expected a mapping of length 1, but found sequence",
+                            self._make_mark(&self.parsed_event.start_mark))
+                node = self._compose_node(None, None)
+                if not isinstance(node, MappingNode):
+                    raise ConstructorError("while constructing %s" % parent[7], parent[2],
+                            "expected a mapping of length 1, but found %s" % node.id,
+                            node.start_mark)
+                if len(node.value) != 1:
+                    raise ConstructorError("while constructing %s" % parent[7], parent[2],
+                            "expected a single mapping item, but found %d items"
+                            % len(node.value), node.start_mark)
+                key_node, value_node = node.value[0]
+                data = (self.construct_object(key_node), self.construct_object(value_node))
+                self.run_state_generators()
+            elif self.parsed_event.type == YAML_ALIAS_EVENT:
+                anchor = PyUnicode_FromString(self.parsed_event.data.alias.anchor)
+                if anchor not in self.anchors:
+                    self._compose_node(None, None)
+                yaml_event_delete(&self.parsed_event)
+                node = self.anchors[anchor]
+                if is_key and node.tag == u'tag:yaml.org,2002:merge':
+                    self._build_merge(parent, node)
+                    continue
+                data = self.construct_object(node)
+                mark = node.start_mark
+                check_key = True
+            elif self.parsed_event.type == YAML_SCALAR_EVENT    \
+                    and self.parsed_event.data.scalar.anchor == NULL:
+                value = PyUnicode_DecodeUTF8(self.parsed_event.data.scalar.value,
+                        self.parsed_event.data.scalar.length, 'strict')
+                if self.parsed_event.data.scalar.tag == NULL    \
+                        or (self.parsed_event.data.scalar.tag[0] == c'!'
+                                and self.parsed_event.data.scalar.tag[1] == c'\0'):
+                    tag = self.resolve(ScalarNode, value,
+                            (self.parsed_event.data.scalar.plain_implicit == 1,
+                                self.parsed_event.data.scalar.quoted_implicit == 1))
+                else:
+                    tag = PyUnicode_FromString(self.parsed_event.data.scalar.tag)
+                if is_key and tag == u'tag:yaml.org,2002:value':
+                    tag = u'tag:yaml.org,2002:str'
+                if tag == u'tag:yaml.org,2002:str' and native_str:
+                    yaml_event_delete(&self.parsed_event)
+                    data = value
+                elif tag == u'tag:yaml.org,2002:null' and native_null:
+                    yaml_event_delete(&self.parsed_event)
+                    data = None
+                elif tag == u'tag:yaml.org,2002:bool' and native_bool:
+                    yaml_event_delete(&self.parsed_event)
+                    data = self.bool_values[value.lower()]
+                elif tag == u'tag:yaml.org,2002:int' and native_int and _is_decimal(value):
+                    yaml_event_delete(&self.parsed_event)
+                    data = int(value)
+                elif tag == u'tag:yaml.org,2002:float' and native_float and _is_float(value):
+                    yaml_event_delete(&self.parsed_event)
+                    data = float(value)
+                else:
+                    node = self._make_scalar_node(tag, value)
+                    yaml_event_delete(&self.parsed_event)
+                    if is_key and tag == u'tag:yaml.org,2002:merge':
+                        self._build_merge(parent, node)
+                        continue
+                    constructor = constructors.get(tag)
+                    if constructor is None:
+                        data = self.construct_object(node)
+                        self.run_state_generators()
+                    else:
+                        data = constructor(self, node)
+                        if isinstance(data, GeneratorType):
+                            generator = data
+                            data = next(generator)
+                            self.state_generators.append(generator)
+                    mark = node.start_mark
+                    check_key = True
+            else:
+                if self.parsed_event.type == YAML_SEQUENCE_START_EVENT  \
+                        and self.parsed_event.data.sequence_start.anchor == NULL:
+                    if self.parsed_event.data.sequence_start.tag == NULL    \
+                            or (self.parsed_event.data.sequence_start.tag[0] == c'!'
+                                    and self.parsed_event.data.sequence_start.tag[1] == c'\0'):
+                        tag = self.resolve(SequenceNode, None,
+                                self.parsed_event.data.sequence_start.implicit == 1)
+                    else:
+                        tag = PyUnicode_FromString(self.parsed_event.data.sequence_start.tag)
+                    if tag == u'tag:yaml.org,2002:seq':
+                        data = []
+                        entry = [LIST_KIND, data, None, None, None, None, data, None]
+                    elif tag == u'tag:yaml.org,2002:omap' and native_omap:
+                        data = []
+                        entry = [OMAP_KIND, data, None, None, None, None, data, "an ordered map"]
+                    elif tag == u'tag:yaml.org,2002:pairs' and native_pairs:
+                        data = []
+                        entry = [OMAP_KIND, data, None, None, None, None, data, "pairs"]
+                elif self.parsed_event.type == YAML_MAPPING_START_EVENT  \
+                        and self.parsed_event.data.mapping_start.anchor == NULL:
+                    if self.parsed_event.data.mapping_start.tag == NULL    \
+                            or (self.parsed_event.data.mapping_start.tag[0] == c'!'
+                                    and self.parsed_event.data.mapping_start.tag[1] == c'\0'):
+                        tag = self.resolve(MappingNode, None,
+                                self.parsed_event.data.mapping_start.implicit == 1)
+                    else:
+                        tag = PyUnicode_FromString(self.parsed_event.data.mapping_start.tag)
+                    if tag == u'tag:yaml.org,2002:map':
+                        data = {}
+                        entry = [DICT_KIND, data, None, None, [], None, data, None]
+                    elif tag == u'tag:yaml.org,2002:set' and native_set:
+                        data = set()
+                        entry = [SET_KIND, {}, None, None, [], None, data, None]
+                if entry is not None:
+                    mark = self._make_mark(&self.parsed_event.start_mark)
+                    entry[2] = mark
+                    yaml_event_delete(&self.parsed_event)
+                else:
+                    node = self._compose_node(None, None)
+                    if is_key and node.tag == u'tag:yaml.org,2002:merge':
+                        self._build_merge(parent, node)
+                        continue
+                    data = self.construct_object(node)
+                    self.run_state_generators()
+                    mark = node.start_mark
+                    check_key = True
+            if entry is not None:
+                stack.append(entry)
+            if parent is None:
+                if not stack:
+                    return data
+            elif kind == LIST_KIND or kind == OMAP_KIND:
+                parent[1].append(data)
+            elif kind == PAIR_KIND:
+                if parent[3] is None:
+                    parent[3] = (data,)
+                else:
+                    parent[1].append((parent[3][0], data))
+                    parent[3] = None
+            elif parent[3] is None:
+                if check_key or entry is not None:
+                    try:
+                        self.check_mapping_key(data, parent[2], mark)
+                    except ConstructorError as exc:
+                        if parent[5] is None:
+                            parent[5] = exc
+                parent[3] = (data,)
+            else:
+                if parent[5] is None:
+                    parent[1][parent[3][0]] = data
+                parent[3] = None
+
+    cdef object _make_scalar_node(self, object tag, object value):
+        start_mark = self._make_mark(&self.parsed_event.start_mark)
+        end_mark = self._make_mark(&self.parsed_event.end_mark)
+        style = None
+        if self.parsed_event.data.scalar.style == YAML_PLAIN_SCALAR_STYLE:
+            style = u''
+        elif self.parsed_event.data.scalar.style == YAML_SINGLE_QUOTED_SCALAR_STYLE:
+            style = u'\''
+        elif self.parsed_event.data.scalar.style == YAML_DOUBLE_QUOTED_SCALAR_STYLE:
+            style = u'"'
+        elif self.parsed_event.data.scalar.style == YAML_LITERAL_SCALAR_STYLE:
+            style = u'|'
+        elif self.parsed_event.data.scalar.style == YAML_FOLDED_SCALAR_STYLE:
+            style = u'>'
+        return ScalarNode(tag, value, start_mark, end_mark, style)
+
+    cdef object _build_merge(self, list entry, object key_node):
+        # Compose the value of a merge key in the mapping being built and add
+        # the constructed pairs of the merged mappings to the entry.
+        value_node = self._compose_node(None, None)
+        for node in self.get_merged_nodes(entry[2], value_node):
+            entry[4].append(self.construct_merged_pairs(node))
+        self.run_state_generators()
+
+    def compose_node(self, parent, index):
+        self.current_event = None
+        return self._compose_node(parent, index)
+
+    def skip_node(self):
+        # Drop the events of the next node without composing it.  Anchored
+        # nodes inside are still composed, so later aliases to them resolve.
+        cdef int depth
+        depth = 0
+        self.current_event = None
+        while True:
+            self._parse_next_event()
+            if (self.parsed_event.type == YAML_SCALAR_EVENT
+                        and self.parsed_event.data.scalar.anchor != NULL)   \
+                    or (self.parsed_event.type == YAML_SEQUENCE_START_EVENT
+                        and self.parsed_event.data.sequence_start.anchor != NULL)   \
+                    or (self.parsed_event.type == YAML_MAPPING_START_EVENT
+                        and self.parsed_event.data.mapping_start.anchor != NULL):
+                self._compose_node(None, None)
+            else:
+                if self.parsed_event.type == YAML_SEQUENCE_START_EVENT  \
+                        or self.parsed_event.type == YAML_MAPPING_START_EVENT:
+                    depth = depth+1
+                elif self.parsed_event.type == YAML_SEQUENCE_END_EVENT  \
+                        or self.parsed_event.type == YAML_MAPPING_END_EVENT:
+                    depth = depth-1
+                yaml_event_delete(&self.parsed_event)
+            if depth == 0:
+                return
+
     cdef object _compose_document(self):
         yaml_event_delete(&self.parsed_event)
         node = self._compose_node(None, None)
@@ -778,16 +1307,8 @@ cdef class CParser:
         return node
 
     cdef _compose_scalar_node(self, object anchor):
-        start_mark = Mark(self.stream_name,
-                self.parsed_event.start_mark.index,
-                self.parsed_event.start_mark.line,
-                self.parsed_event.start_mark.column,
-                None, None)
-        end_mark = Mark(self.stream_name,
-                self.parsed_event.end_mark.index,
-                self.parsed_event.end_mark.line,
-                self.parsed_event.end_mark.column,
-                None, None)
+        start_mark = self._make_mark(&self.parsed_event.start_mark)
+        end_mark = self._make_mark(&self.parsed_event.end_mark)
         value = PyUnicode_DecodeUTF8(self.parsed_event.data.scalar.value,
                 self.parsed_event.data.scalar.length, 'strict')
         plain_implicit = False
@@ -821,11 +1342,7 @@ cdef class CParser:
 
     cdef _compose_sequence_node(self, object anchor):
         cdef int index
-        start_mark = Mark(self.stream_name,
-                self.parsed_event.start_mark.index,
-                self.parsed_event.start_mark.line,
-                self.parsed_event.start_mark.column,
-                None, None)
+        start_mark = self._make_mark(&self.parsed_event.start_mark)
         implicit = False
         if self.parsed_event.data.sequence_start.implicit == 1:
             implicit = True
@@ -851,20 +1368,12 @@ cdef class CParser:
             value.append(self._compose_node(node, index))
             index = index+1
             self._parse_next_event()
-        node.end_mark = Mark(self.stream_name,
-                self.parsed_event.end_mark.index,
-                self.parsed_event.end_mark.line,
-                self.parsed_event.end_mark.column,
-                None, None)
+        node.end_mark = self._make_mark(&self.parsed_event.end_mark)
         yaml_event_delete(&self.parsed_event)
         return node
 
     cdef _compose_mapping_node(self, object anchor):
-        start_mark = Mark(self.stream_name,
-                self.parsed_event.start_mark.index,
-                self.parsed_event.start_mark.line,
-                self.parsed_event.start_mark.column,
-                None, None)
+        start_mark = self._make_mark(&self.parsed_event.start_mark)
         implicit = False
         if self.parsed_event.data.mapping_start.implicit == 1:
             implicit = True
@@ -890,11 +1399,7 @@ cdef class CParser:
             item_value = self._compose_node(node, item_key)
             value.append((item_key, item_value))
             self._parse_next_event()
-        node.end_mark = Mark(self.stream_name,
-                self.parsed_event.end_mark.index,
-                self.parsed_event.end_mark.line,
-                self.parsed_event.end_mark.column,
-                None, None)
+        node.end_mark = self._make_mark(&self.parsed_event.end_mark)
         yaml_event_delete(&self.parsed_event)
         return node
 
@@ -905,6 +1410,52 @@ cdef class CParser:
                 raise error
         return 1
 
+cdef int _is_decimal(unicode value):
+    # Check if `int(value)` gives the same result as `construct_yaml_int`.
+    cdef Py_UCS4 ch
+    cdef Py_ssize_t index
+    cdef Py_ssize_t start = 0
+    cdef Py_ssize_t length = len(value)
+    if length > 0 and (value[0] == u'-' or value[0] == u'+'):
+        start = 1
+    if length == start or (length > start+1 and value[start] == u'0'):
+        return 0
+    for index in range(start, length):
+        ch = value[index]
+        if ch < u'0' or ch > u'9':
+            return 0
+    return 1
+
+cdef int _is_float(unicode value):
+    # Check if `value` matches `SafeConstructor.decimal_float_regexp`, so
+    # `float(value)` gives the same result as `construct_yaml_float`.
+    cdef Py_ssize_t index = 0
+    cdef Py_ssize_t start
+    cdef Py_ssize_t digits = 0
+    cdef Py_ssize_t length = len(value)
+    if length > 0 and (value[0] == u'-' or value[0] == u'+'):
+        index = 1
+    while index < length and u'0' <= value[index] <= u'9':
+        index += 1
+        digits += 1
+    if index < length and value[index] == u'.':
+        index += 1
+        while index < length and u'0' <= value[index] <= u'9':
+            index += 1
+            digits += 1
+    if digits == 0:
+        return 0
+    if index < length and (value[index] == u'e' or value[index] == u'E'):
+        index += 1
+        if index < length and (value[index] == u'-' or value[index] == u'+'):
+            index += 1
+        start = index
+        while index < length and u'0' <= value[index] <= u'9':
+            index += 1
+        if index == start:
+            return 0
+    return index == length
+
 cdef int input_handler(void *data, char *buffer, size_t size, size_t *read) except 0:
     cdef CParser parser
     parser = <CParser>data
@@ -1284,6 +1835,12 @@ cdef class CEmitter:
             self.closed = 1
 
     def serialize(self, node):
+        self._emit_document_start()
+        self._anchor_node(node)
+        self._serialize_node(node, None, None)
+        self._emit_document_end()
+
+    cdef int _emit_document_start(self) except 0:
         cdef yaml_event_t event
         cdef yaml_version_directive_t version_directive_value
         cdef yaml_version_directive_t *version_directive
@@ -1344,8 +1901,10 @@ cdef class CEmitter:
         if yaml_emitter_emit(&self.emitter, &event) == 0:
             error = self._emitter_error()
             raise error
-        self._anchor_node(node)
-        self._serialize_node(node, None, None)
+        return 1
+
+    cdef int _emit_document_end(self) except 0:
+        cdef yaml_event_t event
         yaml_document_end_event_initialize(&event, self.document_end_implicit)
         if yaml_emitter_emit(&self.emitter, &event) == 0:
             error = self._emitter_error()
@@ -1353,6 +1912,320 @@ cdef class CEmitter:
         self.serialized_nodes = {}
         self.anchors = {}
         self.last_alias_id = 0
+        return 1
+
+    def check_direct_representation(self):
+        # Plain data may be emitted straight as LibYAML events for
+        # `SafeRepresenter` and its subclasses unless the dumper represents
+        # or serializes objects in its own way, or uses path resolvers.
+        cls = self.__class__
+        if not isinstance(self, SafeRepresenter):
+            return False
+        if cls.serialize != CEmitter.serialize:
+            return False
+        for name in ['represent_data', 'represent_scalar', 'represent_sequence',
+                'represent_mapping', 'ignore_aliases']:
+            if getattr(cls, name) != getattr(SafeRepresenter, name):
+                return False
+        return not getattr(cls, 'yaml_path_resolvers', None)
+
+    def represent(self, data):
+        # Represent and serialize the next document.  Objects of the types
+        # handled by the standard safe representers are emitted without
+        # building nodes, other objects are represented as usual.
+        if not self.check_direct_representation():
+            return super(CEmitter, self).represent(data)
+        kinds = self._get_object_kinds()
+        plans = {}
+        nodes = []
+        try:
+            direct = self._anchor_object(data, kinds, plans, nodes)
+        except:
+            self.anchors = {}
+            self.last_alias_id = 0
+            raise
+        if direct:
+            self._emit_document_start()
+            self._represent_object(data, kinds, plans, nodes)
+            self._emit_document_end()
+            self.represented_objects = {}
+            self.object_keeper = []
+            self.alias_key = None
+        else:
+            # The plain data is shared with the nodes of other objects, so
+            # the whole document has to be represented as nodes.
+            self.anchors = {}
+            self.last_alias_id = 0
+            self.represented_objects = {}
+            self.object_keeper = []
+            super(CEmitter, self).represent(data)
+
+    cdef object _get_object_kinds(self):
+        # Map the types represented by the standard safe representers to
+        # their kinds.
+        representers = self.yaml_representers
+        if PY_MAJOR_VERSION < 3:
+            represent_unicode = SafeRepresenter.represent_unicode
+        else:
+            represent_unicode = SafeRepresenter.represent_str
+        kinds = {}
+        for data_type, representer, kind in [
+                (type(None), SafeRepresenter.represent_none, NULL_OBJECT),
+                (bool, SafeRepresenter.represent_bool, BOOL_OBJECT),
+                (int, SafeRepresenter.represent_int, INT_OBJECT),
+                (float, SafeRepresenter.represent_float, FLOAT_OBJECT),
+                (unicode, represent_unicode, STR_OBJECT),
+                (datetime.date, SafeRepresenter.represent_date, DATE_OBJECT),
+                (datetime.datetime, SafeRepresenter.represent_datetime, DATETIME_OBJECT),
+                (list, SafeRepresenter.represent_list, LIST_OBJECT),
+                (tuple, SafeRepresenter.represent_list, TUPLE_OBJECT),
+                (dict, SafeRepresenter.represent_dict, DICT_OBJECT)]:
+            if representers.get(data_type) == representer:
+                kinds[data_type] = kind
+        return kinds
+
+    cdef int _anchor_object(self, object data, dict kinds, dict plans,
+            list nodes) except -1:
+        # Find the objects which need anchors the same way `_anchor_node`
+        # does for their nodes.  Dicts and lists are keyed by their ids and
+        # get a plan holding the items to emit and the flow style.  Other
+        # objects are represented and their nodes are kept in `nodes`.
+        # Return 0 if the nodes refer to the plain data.
+        cdef int kind
+        cdef int scalar
+        cdef int track_style
+        default_flow_style = self.default_flow_style
+        track_style = default_flow_style is None
+        plain_style = not self.default_style
+        stack = [(iter([data]), None)]
+        while stack:
+            iterator, plan = stack[-1]
+            item = next(iterator, _end_of_items)
+            if item is _end_of_items:
+                stack.pop()
+                continue
+            kind = kinds.get(type(item), OTHER_OBJECT)
+            if kind == OTHER_OBJECT:
+                node = self.represent_data(item)
+                nodes.append(node)
+                self._anchor_node(node)
+                scalar = node.__class__ is ScalarNode and not node.style
+            elif kind <= STR_OBJECT:
+                scalar = plain_style
+            elif kind == TUPLE_OBJECT and not item:
+                scalar = 0
+            else:
+                scalar = (kind == DATE_OBJECT or kind == DATETIME_OBJECT) and plain_style
+                key = id(item)
+                if key in self.anchors:
+                    if self.anchors[key] is None:
+                        self.last_alias_id = self.last_alias_id+1
+                        self.anchors[key] = u"id%03d" % self.last_alias_id
+                else:
+                    self.anchors[key] = None
+                    if kind == DICT_OBJECT:
+                        items = list(item.items())
+                        if self.sort_keys:
+                            try:
+                                items = sorted(items)
+                            except TypeError:
+                                pass
+                        child_plan = [items, default_flow_style]
+                        plans[key] = child_plan
+                        if track_style and not scalar and plan is not None:
+                            plan[1] = False
+                        stack.append((itertools.chain.from_iterable(items), child_plan))
+                        continue
+                    elif kind == LIST_OBJECT or kind == TUPLE_OBJECT:
+                        child_plan = [None, default_flow_style]
+                        plans[key] = child_plan
+                        if track_style and not scalar and plan is not None:
+                            plan[1] = False
+                        stack.append((iter(item), child_plan))
+                        continue
+            if track_style and not scalar and plan is not None:
+                plan[1] = False
+        if track_style:
+            # Use the flow style for collections of plain scalars.
+            for plan in plans.values():
+                if plan[1] is None:
+                    plan[1] = True
+        for key in self.represented_objects:
+            if key in self.anchors:
+                return 0
+        return 1
+
+    cdef int _represent_object(self, object data, dict kinds, dict plans,
+            list nodes) except 0:
+        # Emit the events for the data as `_serialize_node` does for the
+        # nodes produced by the safe representers.
+        cdef yaml_event_t event
+        cdef int kind
+        cdef int implicit
+        cdef int node_index
+        cdef char *anchor
+        cdef yaml_scalar_style_t scalar_style
+        scalar_style = YAML_PLAIN_SCALAR_STYLE
+        style_object = self.default_style
+        if style_object == "'" or style_object == u"'":
+            scalar_style = YAML_SINGLE_QUOTED_SCALAR_STYLE
+        elif style_object == "\"" or style_object == u"\"":
+            scalar_style = YAML_DOUBLE_QUOTED_SCALAR_STYLE
+        elif style_object == "|" or style_object == u"|":
+            scalar_style = YAML_LITERAL_SCALAR_STYLE
+        elif style_object == ">" or style_object == u">":
+            scalar_style = YAML_FOLDED_SCALAR_STYLE
+        node_index = 0
+        stack = [(iter([data]), OTHER_OBJECT)]
+        while stack:
+            iterator, kind = stack[-1]
+            item = next(iterator, _end_of_items)
+            if item is _end_of_items:
+                stack.pop()
+                if kind == DICT_OBJECT:
+                    yaml_mapping_end_event_initialize(&event)
+                elif kind == LIST_OBJECT:
+                    yaml_sequence_end_event_initialize(&event)
+                else:
+                    continue
+                if yaml_emitter_emit(&self.emitter, &event) == 0:
+                    error = self._emitter_error()
+                    raise error
+                continue
+            kind = kinds.get(type(item), OTHER_OBJECT)
+            if kind == OTHER_OBJECT:
+                self._serialize_node(nodes[node_index], None, None)
+                node_index = node_index+1
+                continue
+            anchor_object = None
+            if kind == NULL_OBJECT:
+                self._emit_scalar(None, u'tag:yaml.org,2002:null', u'null', scalar_style)
+            elif kind == BOOL_OBJECT:
+                if item:
+                    value = u'true'
+                else:
+                    value = u'false'
+                self._emit_scalar(None, u'tag:yaml.org,2002:bool', value, scalar_style)
+            elif kind == INT_OBJECT:
+                self._emit_scalar(None, u'tag:yaml.org,2002:int', unicode(item),
+                        scalar_style)
+            elif kind == FLOAT_OBJECT:
+                if item != item or (item == 0.0 and item == 1.0):
+                    value = u'.nan'
+                elif item == self.inf_value:
+                    value = u'.inf'
+                elif item == -self.inf_value:
+                    value = u'-.inf'
+                else:
+                    value = unicode(repr(item)).lower()
+                    if u'.' not in value and u'e' in value:
+                        value = value.replace(u'e', u'.0e', 1)
+                self._emit_scalar(None, u'tag:yaml.org,2002:float', value, scalar_style)
+            elif kind == STR_OBJECT:
+                self._emit_scalar(None, u'tag:yaml.org,2002:str', item, scalar_style)
+            elif kind == TUPLE_OBJECT and not item:
+                flow_style = self.default_flow_style
+                if flow_style is None:
+                    flow_style = True
+                self._emit_collection_start(None, LIST_OBJECT, item, flow_style)
+                yaml_sequence_end_event_initialize(&event)
+                if yaml_emitter_emit(&self.emitter, &event) == 0:
+                    error = self._emitter_error()
+                    raise error
+            else:
+                key = id(item)
+                anchor_object = self.anchors[key]
+                if key in self.serialized_nodes:
+                    anchor_object = PyUnicode_AsUTF8String(anchor_object)
+                    anchor = PyString_AS_STRING(anchor_object)
+                    if yaml_alias_event_initialize(&event, anchor) == 0:
+                        raise MemoryError
+                    if yaml_emitter_emit(&self.emitter, &event) == 0:
+                        error = self._emitter_error()
+                        raise error
+                    continue
+                self.serialized_nodes[key] = True
+                if kind == DATE_OBJECT:
+                    self._emit_scalar(anchor_object, u'tag:yaml.org,2002:timestamp',
+                            unicode(item.isoformat()), scalar_style)
+                elif kind == DATETIME_OBJECT:
+                    self._emit_scalar(anchor_object, u'tag:yaml.org,2002:timestamp',
+                            unicode(item.isoformat(' ')), scalar_style)
+                elif kind == DICT_OBJECT:
+                    plan = plans[key]
+                    self._emit_collection_start(anchor_object, DICT_OBJECT, item, plan[1])
+                    stack.append((itertools.chain.from_iterable(plan[0]), DICT_OBJECT))
+                else:
+                    plan = plans[key]
+                    self._emit_collection_start(anchor_object, LIST_OBJECT, item, plan[1])
+                    stack.append((iter(item), LIST_OBJECT))
+        return 1
+
+    cdef int _emit_scalar(self, object anchor_object, object tag_object,
+            object value_object, yaml_scalar_style_t scalar_style) except 0:
+        cdef yaml_event_t event
+        cdef int plain_implicit
+        cdef int quoted_implicit
+        cdef char *anchor
+        plain_implicit = 0
+        quoted_implicit = 0
+        if self.resolve(ScalarNode, value_object, (True, False)) == tag_object:
+            plain_implicit = 1
+        if self.resolve(ScalarNode, value_object, (False, True)) == tag_object:
+            quoted_implicit = 1
+        anchor = NULL
+        if anchor_object is not None:
+            anchor_object = PyUnicode_AsUTF8String(anchor_object)
+            anchor = PyString_AS_STRING(anchor_object)
+        tag_object = PyUnicode_AsUTF8String(tag_object)
+        value_object = PyUnicode_AsUTF8String(value_object)
+        if yaml_scalar_event_initialize(&event, anchor, PyString_AS_STRING(tag_object),
+                PyString_AS_STRING(value_object), PyString_GET_SIZE(value_object),
+                plain_implicit, quoted_implicit, scalar_style) == 0:
+            raise MemoryError
+        if yaml_emitter_emit(&self.emitter, &event) == 0:
+            error = self._emitter_error()
+            raise error
+        return 1
+
+    cdef int _emit_collection_start(self, object anchor_object, int kind,
+            object value, object flow_style) except 0:
+        cdef yaml_event_t event
+        cdef int implicit
+        cdef char *anchor
+        cdef yaml_sequence_style_t sequence_style
+        cdef yaml_mapping_style_t mapping_style
+        anchor = NULL
+        if anchor_object is not None:
+            anchor_object = PyUnicode_AsUTF8String(anchor_object)
+            anchor = PyString_AS_STRING(anchor_object)
+        implicit = 0
+        if kind == DICT_OBJECT:
+            tag_object = u'tag:yaml.org,2002:map'
+            if self.resolve(MappingNode, value, True) == tag_object:
+                implicit = 1
+            tag_object = PyUnicode_AsUTF8String(tag_object)
+            mapping_style = YAML_BLOCK_MAPPING_STYLE
+            if flow_style:
+                mapping_style = YAML_FLOW_MAPPING_STYLE
+            if yaml_mapping_start_event_initialize(&event, anchor,
+                    PyString_AS_STRING(tag_object), implicit, mapping_style) == 0:
+                raise MemoryError
+        else:
+            tag_object = u'tag:yaml.org,2002:seq'
+            if self.resolve(SequenceNode, value, True) == tag_object:
+                implicit = 1
+            tag_object = PyUnicode_AsUTF8String(tag_object)
+            sequence_style = YAML_BLOCK_SEQUENCE_STYLE
+            if flow_style:
+                sequence_style = YAML_FLOW_SEQUENCE_STYLE
+            if yaml_sequence_start_event_initialize(&event, anchor,
+                    PyString_AS_STRING(tag_object), implicit, sequence_style) == 0:
+                raise MemoryError
+        if yaml_emitter_emit(&self.emitter, &event) == 0:
+            error = self._emitter_error()
+            raise error
+        return 1
 
     cdef int _anchor_node(self, object node) except 0:
         if node in self.anchors: